@@ -56,23 +56,23 @@ with open("all_companies_reviews.json", "w") as f:
 # =============================
 """
 import json
-from datetime import datetime
 
-with open("reviews.json", "r") as f:
-    data = json.load(f)
+# main.py writes reviews.json.summary.json next to reviews.json with per-source
+# aggregates, so there is no need to load every review
+# (python summary.py reviews.json rebuilds it for older files)
+with open("reviews.json.summary.json", "r") as f:
+    summary = json.load(f)
 
-# Calculate statistics
-for source, source_data in data['sources'].items():
-    reviews = source_data['reviews']
-    
-    if reviews:
-        ratings = [r['rating'] for r in reviews if r['rating']]
-        avg_rating = sum(ratings) / len(ratings)
-        
+for source, stats in summary['sources'].items():
+    if stats['total_reviews']:
         print(f"{source}:")
-        print(f"  Total reviews: {len(reviews)}")
-        print(f"  Average rating: {avg_rating:.2f}")
-        print(f"  Rating range: {min(ratings):.1f} - {max(ratings):.1f}")
+        print(f"  Total reviews: {stats['total_reviews']}")
+        if stats['avg_rating'] is not None:
+            print(f"  Average rating: {stats['avg_rating']:.2f}")
+            print(f"  Rating range: {stats['min_rating']:.1f} - {stats['max_rating']:.1f}")
+        print(f"  Dates: {stats['min_date']} to {stats['max_date']}")
+        print(f"  Ratings: {stats['rating_histogram']}")
+        print(f"  Reviews per month: {stats['monthly_volume']}")
 """
 
 # Example 4: Compare reviews across sources
@@ -80,84 +80,55 @@ for source, source_data in data['sources'].items():
 """
 import json
 
-with open("reviews.json", "r") as f:
-    data = json.load(f)
+with open("reviews.json.summary.json", "r") as f:
+    summary = json.load(f)
 
-company = data['company']
-
-print(f"Review Comparison for {company}")
+print(f"Review Comparison for {summary['company']}")
 print("=" * 60)
 
-sources_summary = {}
-
-for source, source_data in data['sources'].items():
-    reviews = source_data['reviews']
-    
-    if reviews:
-        ratings = [r['rating'] for r in reviews if r['rating']]
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
-        
-        sources_summary[source] = {
-            'count': len(reviews),
-            'avg_rating': avg_rating
-        }
-
-# Display comparison
-for source, summary in sources_summary.items():
-    print(f"{source:15} - Reviews: {summary['count']:3} | Avg Rating: {summary['avg_rating']:4.1f}")
+for source, stats in summary['sources'].items():
+    avg_rating = stats['avg_rating'] or 0
+    print(f"{source:15} - Reviews: {stats['total_reviews']:3} | Avg Rating: {avg_rating:4.1f}")
 """
 
-# Example 5: Export to CSV
-# ========================
+# Example 5: Export to CSV or Parquet
+# ===================================
 """
-import json
-import csv
-
-with open("reviews.json", "r") as f:
-    data = json.load(f)
+from exporters import export_file
 
-# Flatten reviews from all sources
-all_reviews = []
-
-for source, source_data in data['sources'].items():
-    for review in source_data['reviews']:
-        review['source'] = source
-        all_reviews.append(review)
+# Rows are streamed to the CSV file one review at a time
+count = export_file("reviews.json", "reviews_export.csv", "csv")
+print(f"Exported {count} reviews to reviews_export.csv")
 
-# Write to CSV
-with open("reviews_export.csv", "w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=all_reviews[0].keys())
-    writer.writeheader()
-    writer.writerows(all_reviews)
+# Columnar, compressed and typed (requires pandas and pyarrow)
+count = export_file("reviews.json", "reviews_export.parquet", "parquet")
+print(f"Exported {count} reviews to reviews_export.parquet")
 
-print(f"Exported {len(all_reviews)} reviews to reviews_export.csv")
+# Or write the export directly while scraping:
+#   python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-12-31 --format csv
 """
 
 # Example 6: Find high and low rated reviews
 # ===========================================
 """
-import json
+from query import ReviewFilter, run_query
 
-with open("reviews.json", "r") as f:
-    data = json.load(f)
+# Reviews are streamed and only the best k are kept, so this works on files of any size
+for source in ["G2", "Capterra", "Trustpilot"]:
+    review_filter = ReviewFilter(source=source)
+    _, highest = run_query(["reviews.json"], review_filter, k=2)
+    _, lowest = run_query(["reviews.json"], review_filter, k=2, lowest=True)
 
-print(f"Review Analysis for {data['company']}")
-print("=" * 60)
+    print(f"\n{source}:")
+    print("Highest Rated:")
+    for r in highest:
+        print(f"  - {r['title']} ({r['rating']} stars)")
+    print("Lowest Rated:")
+    for r in lowest:
+        print(f"  - {r['title']} ({r['rating']} stars)")
 
-for source, source_data in data['sources'].items():
-    reviews = source_data['reviews']
-    
-    if reviews:
-        sorted_reviews = sorted(reviews, key=lambda x: x['rating'], reverse=True)
-        
-        print(f"\n{source}:")
-        print(f"\\nHighest Rated:")
-        for r in sorted_reviews[:2]:
-            print(f"  - {r['title']} ({r['rating']} stars)")
-        
-        print(f"\\nLowest Rated:")
-        for r in sorted_reviews[-2:]:
-            print(f"  - {r['title']} ({r['rating']} stars)")
+# The same from the command line, across many files in parallel:
+#   python query.py output/*.json --source G2 --top 2 --lowest --workers 4
 """
 
 # Example 7: Command line batch processing
@@ -193,10 +164,12 @@ for company, start_date, end_date in companies:
 # Example 8: Sentiment Analysis Integration
 # ===========================================
 """
-# Install TextBlob first: pip install textblob
+# Scores are added while scraping with --sentiment, or to an existing file with
+#   python sentiment.py reviews.json
+# Both use the bundled lexicon, score in parallel processes and cache scores
+# by text hash, so reviews already scored on an earlier run are not rescored.
 
 import json
-from textblob import TextBlob
 
 with open("reviews.json", "r") as f:
     data = json.load(f)
@@ -205,49 +178,35 @@ print(f"Sentiment Analysis for {data['company']}")
 print("=" * 60)
 
 for source, source_data in data['sources'].items():
-    reviews = source_data['reviews']
-    
-    sentiments = []
-    for review in reviews:
-        blob = TextBlob(review['description'])
-        sentiment = blob.sentiment.polarity
-        sentiments.append(sentiment)
-    
+    sentiments = [r['sentiment'] for r in source_data['reviews'] if r.get('sentiment') is not None]
     if sentiments:
         avg_sentiment = sum(sentiments) / len(sentiments)
         print(f"{source}: Average sentiment = {avg_sentiment:.3f}")
+
+# Or score texts directly
+from sentiment import score_text
+print(score_text("Great tool, but the mobile app is slow"))
 """
 
 # Example 9: Track review trends over time
 # ========================================
 """
-import json
-from datetime import datetime
-from collections import defaultdict
+import analytics
 
-with open("reviews.json", "r") as f:
-    data = json.load(f)
+# Any mix of results JSON, NDJSON, CSV or Parquet files; Parquet loads fastest
+df = analytics.load_reviews(["output/slack_reviews.json", "output/asana_reviews.json"],
+                            analytics.REPORT_COLUMNS)
 
-# Group reviews by month
-monthly_data = defaultdict(list)
+# Monthly volume and average rating per source, with a 3-month rolling average
+trends = analytics.monthly_trends(analytics.filter_reviews(df, company="Slack"), by='source', window=3)
+print(trends.to_string())
 
-for source, source_data in data['sources'].items():
-    for review in source_data['reviews']:
-        date_obj = datetime.strptime(review['date'], '%Y-%m-%d')
-        month_key = date_obj.strftime('%Y-%m')
-        monthly_data[month_key].append({
-            'rating': review['rating'],
-            'source': source
-        })
-
-# Print trends
-print(f"Review Trends for {data['company']}")
-print("=" * 60)
+# Rating distribution per company and a side-by-side comparison
+print(analytics.rating_distribution(df, by='company').to_string())
+print(analytics.compare_companies(df).to_string())
 
-for month in sorted(monthly_data.keys()):
-    reviews = monthly_data[month]
-    avg_rating = sum(r['rating'] for r in reviews if r['rating']) / len(reviews)
-    print(f"{month}: {len(reviews)} reviews, avg rating: {avg_rating:.1f}")
+# The same reports from the command line:
+#   python analytics.py output/*.json --report trends --window 3
 """
 
 # Example 10: Filter reviews by rating
@@ -0,0 +1,255 @@
+"""
+Review analytics - Vectorized statistics over scraped reviews with pandas
+Loads one or more results files (JSON of either schema version, NDJSON, CSV or
+Parquet exports) into a single typed DataFrame and computes rating
+distributions, rolling monthly trends, top/bottom reviews and cross-company
+comparisons with grouped column operations instead of per-review loops
+
+Usage:
+    python analytics.py output/slack.json output/asana.json --report compare
+    python analytics.py output/reviews.parquet --report trends --window 3
+    python analytics.py output/*.json --report distribution --by company --output dist.csv
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+import jsonio
+import jsonstream
+import schema
+from exporters import FIELDS, rows_to_dataframe, to_dataframe
+
+
+STARS = [1, 2, 3, 4, 5]
+
+# Columns the aggregate reports need; loading only these skips the review text
+REPORT_COLUMNS = ['company', 'source', 'date', 'rating']
+TOP_COLUMNS = REPORT_COLUMNS + ['title', 'reviewer_name']
+
+# Ratings at or above / below these count as positive / negative in comparisons
+POSITIVE_RATING = 4.0
+NEGATIVE_RATING = 3.0
+
+
+def _ndjson_rows(path: str):
+    for event, name, review in jsonstream.walk(path):
+        if event == 'review':
+            yield dict(review, source=review.get('source') or name)
+
+
+def _csv_rows(path: str):
+    import csv
+    with jsonio.open_file(path, 'rt') as f:
+        yield from csv.DictReader(f)
+
+
+def load_reviews(paths: List[str], columns: List[str] = FIELDS) -> pd.DataFrame:
+    """
+    Load review files into one DataFrame
+
+    Args:
+        paths: Results JSON, NDJSON, CSV or Parquet files (JSON and CSV optionally compressed)
+        columns: exporters.FIELDS columns to load; must include company and source
+
+    Returns:
+        DataFrame with typed dates and ratings and categorical company/source columns
+    """
+    frames = []
+    for path in paths:
+        lower = path.lower()
+        if lower.endswith('.parquet'):
+            df = pd.read_parquet(path, columns=columns)
+        elif jsonstream.is_ndjson(path):
+            df = rows_to_dataframe(_ndjson_rows(path), columns)
+        elif '.csv' in lower:
+            df = rows_to_dataframe(_csv_rows(path), columns)
+        else:
+            df = to_dataframe(schema.load_results(path), columns)
+        frames.append(df)
+
+    if not frames:
+        return rows_to_dataframe([], columns)
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    # Categories differ between files, so concat falls back to object columns
+    df['company'] = df['company'].astype('category')
+    df['source'] = df['source'].astype('category')
+    return df
+
+
+def filter_reviews(df: pd.DataFrame, company: Optional[str] = None, source: Optional[str] = None,
+                   start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+    """Select reviews by company, source (both case-insensitive) and date range (YYYY-MM-DD, inclusive)"""
+    mask = np.ones(len(df), dtype=bool)
+    if company:
+        mask &= (df['company'].str.lower() == company.lower()).to_numpy()
+    if source:
+        mask &= (df['source'].str.lower() == source.lower()).to_numpy()
+    if start_date:
+        mask &= (df['date'] >= pd.Timestamp(start_date)).to_numpy()
+    if end_date:
+        mask &= (df['date'] <= pd.Timestamp(end_date)).to_numpy()
+    return df[mask]
+
+
+def rating_distribution(df: pd.DataFrame, by: str = 'source') -> pd.DataFrame:
+    """
+    Rating statistics and star histogram per group
+
+    Args:
+        df: Reviews from load_reviews
+        by: Grouping column, 'source' or 'company'
+
+    Returns:
+        One row per group with reviews, rated, mean, std, min, median, max and the
+        number of reviews per star (ratings rounded to the nearest star)
+    """
+    stats = df.groupby(by, observed=True)['rating'].agg(
+        reviews='size', rated='count', mean='mean', std='std', min='min', median='median', max='max'
+    )
+    stars = df['rating'].round().clip(STARS[0], STARS[-1])
+    histogram = pd.crosstab(df[by], stars).reindex(columns=STARS, fill_value=0)
+    histogram.columns = [f"{star}_star" for star in STARS]
+    # Groups without any rating have no histogram row
+    return stats.join(histogram.reindex(stats.index, fill_value=0))
+
+
+def monthly_trends(df: pd.DataFrame, by: str = 'source', window: int = 3) -> pd.DataFrame:
+    """
+    Monthly review volume and average rating per group, with a rolling average
+
+    The rolling average is weighted by review count: the sum of ratings over the
+    last `window` months divided by the number of rated reviews in them. Months
+    without reviews are included so the window always spans calendar months.
+
+    Returns:
+        One row per (month, group) with reviews, avg_rating and rolling_avg_rating
+    """
+    dated = df[df['date'].notna()]
+    month = dated['date'].dt.to_period('M').rename('month')
+    grouped = dated.groupby([month, dated[by]], observed=True)['rating'].agg(
+        reviews='size', rated='count', total='sum'
+    )
+    if grouped.empty:
+        return pd.DataFrame(columns=['reviews', 'avg_rating', 'rolling_avg_rating'])
+
+    wide = grouped.unstack(by, fill_value=0)
+    months = pd.period_range(wide.index.min(), wide.index.max(), freq='M', name='month')
+    wide = wide.reindex(months, fill_value=0)
+
+    rolling = wide.rolling(window, min_periods=1).sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg = wide['total'] / wide['rated']
+        rolling_avg = rolling['total'] / rolling['rated']
+
+    trends = pd.DataFrame({
+        'reviews': wide['reviews'].stack(),
+        'avg_rating': avg.stack(),
+        'rolling_avg_rating': rolling_avg.stack(),
+    })
+    return trends[trends['reviews'] > 0]
+
+
+def compare_companies(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Side-by-side comparison of companies
+
+    Returns:
+        One row per company with reviews, avg_rating, std, positive/negative share
+        (ratings >= POSITIVE_RATING / < NEGATIVE_RATING among rated reviews), first
+        and last review date and the average rating on each source
+    """
+    rated = df['rating'].notna()
+    frame = df.assign(
+        positive=(df['rating'] >= POSITIVE_RATING).astype(float).where(rated),
+        negative=(df['rating'] < NEGATIVE_RATING).astype(float).where(rated),
+    )
+    comparison = frame.groupby('company', observed=True).agg(
+        reviews=('rating', 'size'),
+        avg_rating=('rating', 'mean'),
+        std=('rating', 'std'),
+        positive_share=('positive', 'mean'),
+        negative_share=('negative', 'mean'),
+        first_review=('date', 'min'),
+        last_review=('date', 'max'),
+    )
+    by_source = df.pivot_table(index='company', columns='source', values='rating',
+                               aggfunc='mean', observed=True)
+    by_source.columns = [f"avg_{source}" for source in by_source.columns]
+    return comparison.join(by_source).sort_values('avg_rating', ascending=False)
+
+
+def top_reviews(df: pd.DataFrame, n: int = 5, by: str = 'source', lowest: bool = False) -> pd.DataFrame:
+    """
+    Highest (or lowest) rated reviews per group, most recent first among equal ratings
+
+    Returns:
+        Up to n reviews per group with company, source, date, rating, title and reviewer_name
+    """
+    ordered = df[df['rating'].notna()].sort_values(['rating', 'date'], ascending=[lowest, False],
+                                                   kind='stable')
+    top = ordered.groupby(by, observed=True, sort=False).head(n)
+    return top.sort_values([by, 'rating', 'date'], ascending=[True, lowest, False])[
+        ['company', 'source', 'date', 'rating', 'title', 'reviewer_name']
+    ].reset_index(drop=True)
+
+
+REPORTS = ['distribution', 'trends', 'compare', 'top']
+
+
+def run_report(df: pd.DataFrame, report: str, by: str = 'source', window: int = 3,
+               n: int = 5, lowest: bool = False) -> pd.DataFrame:
+    """
+    Compute one of REPORTS
+
+    Raises:
+        ValueError: If the report is unknown
+    """
+    if report == 'distribution':
+        return rating_distribution(df, by)
+    if report == 'trends':
+        return monthly_trends(df, by, window)
+    if report == 'compare':
+        return compare_companies(df)
+    if report == 'top':
+        return top_reviews(df, n, by, lowest)
+    raise ValueError(f"Unknown report '{report}'. Available reports: {', '.join(REPORTS)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze scraped reviews')
+    parser.add_argument('files', nargs='+', help='Results JSON, NDJSON, CSV or Parquet files')
+    parser.add_argument('--report', choices=REPORTS, default='distribution', help='Report to compute (default: distribution)')
+    parser.add_argument('--by', choices=['source', 'company'], default='source', help='Grouping column (default: source)')
+    parser.add_argument('--window', type=int, default=3, help='Rolling window in months for trends (default: 3)')
+    parser.add_argument('--top', type=int, default=5, help='Reviews per group for the top report (default: 5)')
+    parser.add_argument('--lowest', action='store_true', help='Lowest rated reviews for the top report')
+    parser.add_argument('--company', help='Only reviews of this company')
+    parser.add_argument('--source', help='Only reviews from this source')
+    parser.add_argument('--start-date', help='Only reviews on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', help='Only reviews on or before this date (YYYY-MM-DD)')
+    parser.add_argument('--output', help='Write the report to this CSV file instead of printing it')
+    args = parser.parse_args()
+
+    try:
+        df = load_reviews(args.files, TOP_COLUMNS if args.report == 'top' else REPORT_COLUMNS)
+        df = filter_reviews(df, args.company, args.source, args.start_date, args.end_date)
+        report = run_report(df, args.report, args.by, args.window, args.top, args.lowest)
+    except Exception as e:
+        print(f"[ERROR] Analysis failed: {str(e)}")
+        return 1
+
+    if args.output:
+        report.to_csv(args.output)
+        print(f"[SUCCESS] {args.report} report saved to {args.output}")
+    else:
+        with pd.option_context('display.max_rows', None, 'display.width', 200,
+                               'display.float_format', '{:.2f}'.format):
+            print(report.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
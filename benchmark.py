@@ -0,0 +1,423 @@
+"""
+Benchmark suite for the Review Scraper
+Measures parse, date filter, serialization and end-to-end throughput
+and writes the results as JSON so runs can be compared
+"""
+import io
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from sample_data import generate_sample_reviews, render_review_page
+from scrapers.base_scraper import Review
+from scrapers.g2_scraper import G2Scraper
+from scrapers.capterra_scraper import CapterraScraper
+from scrapers.trustpilot_scraper import TrustpilotScraper
+
+
+SCRAPER_CLASSES = {
+    'g2': G2Scraper,
+    'capterra': CapterraScraper,
+    'trustpilot': TrustpilotScraper,
+}
+
+# Date strings in the shapes the scrapers see in the wild
+DATE_SAMPLES = [
+    'June 15, 2023',
+    'Jun 15, 2023',
+    '2023-06-15',
+    '06/15/2023',
+    '3 months ago',
+    '2 weeks ago',
+    '5 days ago',
+]
+
+BENCH_START = datetime(2000, 1, 1)
+BENCH_END = datetime(2100, 1, 1)
+
+
+def _best_of(fn, repeat: int) -> float:
+    """Run fn repeat times and return the fastest wall time in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def build_corpus(count: int, page: int = 0) -> list:
+    """
+    Build a deterministic list of review dictionaries from the sample data
+
+    Args:
+        count: Number of reviews to build
+        page: Page number, used to keep titles unique across pages
+
+    Returns:
+        List of review dictionaries
+    """
+    templates = [
+        review
+        for company in generate_sample_reviews().values()
+        for source_reviews in company.values()
+        for review in source_reviews
+    ]
+    base_date = datetime(2023, 1, 1)
+
+    corpus = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        corpus.append({
+            'title': f"{template['title']} #{page}-{i}",
+            'description': template['description'],
+            'date': (base_date + timedelta(days=(page * count + i) % 365)).strftime('%B %d, %Y'),
+            'rating': template['rating'],
+            'reviewer_name': template['reviewer_name'],
+        })
+    return corpus
+
+
+def bench_parse(pages: int = 20, reviews_per_page: int = 10, repeat: int = 3) -> dict:
+    """Measure pages/sec and reviews/sec parsed by each scraper on a fixed HTML corpus"""
+    results = {}
+    for source, scraper_class in SCRAPER_CLASSES.items():
+        corpus = [
+            render_review_page(source, build_corpus(reviews_per_page, page)).encode('utf-8')
+            for page in range(pages)
+        ]
+        scraper = scraper_class('Bench', BENCH_START, BENCH_END)
+        company_url = f"{scraper.BASE_URL}/bench"
+
+        parsed = []
+
+        def run():
+            parsed.clear()
+            for content in corpus:
+                parsed.extend(scraper._parse_page(content, company_url))
+
+        elapsed = _best_of(run, repeat)
+        results[source] = {
+            'pages': pages,
+            'reviews': len(parsed),
+            'bytes': sum(len(content) for content in corpus),
+            'seconds': elapsed,
+            'pages_per_sec': pages / elapsed,
+            'reviews_per_sec': len(parsed) / elapsed,
+        }
+    return results
+
+
+def bench_filter(count: int = 100000, repeat: int = 3) -> dict:
+    """Measure reviews/sec through filter_by_date and _parse_review_date"""
+    results = {}
+
+    reviews = [
+        Review(title=f"Review {i}", description="", date=(BENCH_START + timedelta(days=i % 20000)).strftime('%Y-%m-%d'))
+        for i in range(count)
+    ]
+    scraper = G2Scraper('Bench', datetime(2020, 1, 1), datetime(2030, 12, 31))
+    elapsed = _best_of(lambda: scraper.filter_by_date(reviews), repeat)
+    results['filter_by_date'] = {
+        'reviews': count,
+        'seconds': elapsed,
+        'reviews_per_sec': count / elapsed,
+    }
+
+    date_strings = [DATE_SAMPLES[i % len(DATE_SAMPLES)] for i in range(count)]
+    for source, scraper_class in SCRAPER_CLASSES.items():
+        scraper = scraper_class('Bench', BENCH_START, BENCH_END)
+
+        def run():
+            for date_str in date_strings:
+                scraper._parse_review_date(date_str)
+
+        with redirect_stdout(io.StringIO()):
+            elapsed = _best_of(run, repeat)
+        results[f'parse_review_date.{source}'] = {
+            'dates': count,
+            'seconds': elapsed,
+            'dates_per_sec': count / elapsed,
+        }
+    return results
+
+
+def bench_serialize(count: int = 50000, repeat: int = 3) -> dict:
+    """Measure output throughput of save_results"""
+    from main import save_results
+
+    per_source = count // len(SCRAPER_CLASSES)
+    results = {
+        'company': 'Bench',
+        'start_date': '2023-01-01',
+        'end_date': '2023-12-31',
+        'sources': {}
+    }
+    for source, scraper_class in SCRAPER_CLASSES.items():
+        reviews = build_corpus(per_source)
+        for review in reviews:
+            review['source'] = source
+            review['url'] = f"{scraper_class.BASE_URL}/bench"
+        results['sources'][source] = {'total_reviews': len(reviews), 'reviews': reviews}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = os.path.join(tmp, 'bench.json')
+        with redirect_stdout(io.StringIO()):
+            elapsed = _best_of(lambda: save_results(results, output_file), repeat)
+        size = os.path.getsize(output_file)
+
+    reviews_written = per_source * len(SCRAPER_CLASSES)
+    return {
+        'save_results': {
+            'reviews': reviews_written,
+            'bytes': size,
+            'seconds': elapsed,
+            'reviews_per_sec': reviews_written / elapsed,
+            'mb_per_sec': size / elapsed / 1e6,
+        }
+    }
+
+
+class StandInServer:
+    """Local HTTP server that mimics the search and review pages of every source"""
+
+    def __init__(self, pages: int = 5, reviews_per_page: int = 10, latency: float = 0.01):
+        self.pages = pages
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._pages = {
+            (source, page): render_review_page(source, build_corpus(reviews_per_page, page)).encode('utf-8')
+            for source in SCRAPER_CLASSES
+            for page in range(1, pages + 1)
+        }
+        self._empty = {source: render_review_page(source, []).encode('utf-8') for source in SCRAPER_CLASSES}
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_url(self, source: str) -> str:
+        """Base URL to point a scraper for the given source at"""
+        return f"{self.url}/{source}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _route(self, path: str, query: dict) -> bytes:
+        parts = [part for part in path.split('/') if part]
+        if not parts or parts[0] not in SCRAPER_CLASSES:
+            return None
+        source, rest = parts[0], parts[1:]
+        page = int(query.get('page', ['1'])[0])
+
+        if source == 'g2':
+            if rest == ['products']:
+                slug = query.get('search', ['bench'])[0].lower()
+                return f'<a data-test="product-link" href="/products/{slug}">{slug}</a>'.encode('utf-8')
+            if len(rest) == 3 and rest[0] == 'products' and rest[2] == 'reviews':
+                return self._pages.get((source, page), self._empty[source])
+        elif source == 'capterra':
+            if rest == ['search']:
+                slug = query.get('q', ['bench'])[0].lower()
+                return f'<a data-test="product_result_link" href="/p/1/{slug}/">{slug}</a>'.encode('utf-8')
+            if len(rest) == 3 and rest[0] == 'p':
+                return self._pages.get((source, page), self._empty[source])
+        elif source == 'trustpilot':
+            if len(rest) == 2 and rest[0] == 'review':
+                return self._pages.get((source, page), self._empty[source])
+        return None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, send_body: bool):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parts = urlsplit(self.path)
+                body = server._route(parts.path, parse_qs(parts.query))
+                if body is None:
+                    self.send_response(404)
+                    body = b'Not Found'
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond(True)
+
+            def do_HEAD(self):
+                self._respond(False)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _run_job(server: StandInServer, company: str, source: str) -> int:
+    """Scrape one company/source from the stand-in server and return the review count"""
+    scraper = SCRAPER_CLASSES[source](company, BENCH_START, BENCH_END)
+    scraper.BASE_URL = server.base_url(source)
+    scraper.request_delay = 0
+    return len(scraper.scrape())
+
+
+def bench_end_to_end(concurrency_levels=(1, 2, 4, 8), companies: int = 8, pages: int = 5,
+                     reviews_per_page: int = 10, latency: float = 0.01) -> dict:
+    """Measure full scrape runs against a local stand-in server at varying concurrency"""
+    jobs = [(f"Company{i}", source) for i in range(companies) for source in SCRAPER_CLASSES]
+    results = {}
+
+    with StandInServer(pages, reviews_per_page, latency) as server:
+        for workers in concurrency_levels:
+            server.requests = 0
+            started = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    counts = list(pool.map(lambda job: _run_job(server, *job), jobs))
+            elapsed = time.perf_counter() - started
+
+            results[f'workers_{workers}'] = {
+                'workers': workers,
+                'jobs': len(jobs),
+                'requests': server.requests,
+                'reviews': sum(counts),
+                'seconds': elapsed,
+                'requests_per_sec': server.requests / elapsed,
+                'reviews_per_sec': sum(counts) / elapsed,
+                'jobs_per_sec': len(jobs) / elapsed,
+            }
+    return results
+
+
+STAGES = {
+    'parse': bench_parse,
+    'filter': bench_filter,
+    'serialize': bench_serialize,
+    'e2e': bench_end_to_end,
+}
+
+
+def run_benchmarks(stages: list, quick: bool = False) -> dict:
+    """
+    Run the selected benchmark stages
+
+    Args:
+        stages: Names of the stages to run (see STAGES)
+        quick: Use smaller workloads for a fast smoke run
+
+    Returns:
+        Dictionary with environment metadata and per-stage results
+    """
+    quick_kwargs = {
+        'parse': {'pages': 5, 'repeat': 1},
+        'filter': {'count': 10000, 'repeat': 1},
+        'serialize': {'count': 5000, 'repeat': 1},
+        'e2e': {'concurrency_levels': (1, 4), 'companies': 2, 'pages': 2},
+    }
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'stages': {}
+    }
+    for stage in stages:
+        print(f"[INFO] Running benchmark stage: {stage}")
+        kwargs = quick_kwargs[stage] if quick else {}
+        report['stages'][stage] = STAGES[stage](**kwargs)
+    return report
+
+
+def _rates(report: dict) -> dict:
+    """Flatten the throughput metrics of a report into {'stage.case.metric': value}"""
+    rates = {}
+    for stage, cases in report.get('stages', {}).items():
+        for case, metrics in cases.items():
+            for metric, value in metrics.items():
+                if metric.endswith('_per_sec'):
+                    rates[f"{stage}.{case}.{metric}"] = value
+    return rates
+
+
+def compare_reports(baseline: dict, current: dict) -> dict:
+    """
+    Compare the throughput metrics of two benchmark reports
+
+    Returns:
+        Dictionary mapping metric name to the relative change (0.1 = 10% faster)
+    """
+    old, new = _rates(baseline), _rates(current)
+    return {
+        name: (new[name] - old[name]) / old[name]
+        for name in sorted(old.keys() & new.keys())
+        if old[name]
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the Review Scraper stages")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Comma-separated stages to run (default: {','.join(STAGES)})")
+    parser.add_argument('--output', default='output/benchmark.json',
+                        help='Where to write the JSON report (default: output/benchmark.json)')
+    parser.add_argument('--compare', type=str, help='Baseline JSON report to compare against')
+    parser.add_argument('--quick', action='store_true', help='Use small workloads for a fast smoke run')
+
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"[ERROR] Unknown stage(s): {', '.join(unknown)}")
+        sys.exit(1)
+
+    report = run_benchmarks(stages, quick=args.quick)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for name, value in sorted(_rates(report).items()):
+        print(f"{name}: {value:,.1f}")
+    print(f"[SUCCESS] Benchmark report saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n[INFO] Change vs {args.compare}:")
+        for name, change in compare_reports(baseline, report).items():
+            print(f"{name}: {change:+.1%}")
@@ -0,0 +1,295 @@
+"""
+Seen-review filters
+A persistent Bloom filter of review identities per company and source, kept in
+a memory-mapped file. With --skip-seen, scrapers check each review against it
+before building a Review, so reviews saved by earlier runs are skipped at a
+constant cost per review however much history has been collected. A Bloom
+filter never misses a review it holds, but reports a review it does not hold
+with a small, configurable probability (the error rate): such a review is
+skipped as if it had been seen.
+
+Usage:
+    python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-12-31 --skip-seen
+    python bloom.py --rebuild output/*.json          # regenerate filters from saved results
+    python bloom.py --info                           # fill level of every filter
+"""
+import argparse
+import glob
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import jsonstream
+from config import BLOOM_CONFIG
+
+
+FILTER_EXTENSION = '.bloom'
+
+# magic, bits, hash functions, reviews added, capacity, error rate; padded to HEADER_SIZE
+_HEADER = struct.Struct('<8sQIQQd')
+_MAGIC = b'RSBLOOM1'
+HEADER_SIZE = 64
+
+
+def review_key(source: Optional[str], date: Optional[str], reviewer_name: Optional[str],
+               title: Optional[str]) -> str:
+    """
+    Identity of a review: where it was posted, when, by whom and its title
+
+    The same fields identify reviews in storage.review_identity.
+    """
+    return '|'.join(str(value or '') for value in (source, date, reviewer_name, title))
+
+
+def filter_path(company: str, source: str, directory: str = BLOOM_CONFIG['directory']) -> str:
+    """Path of the filter of one company/source: <directory>/<company>/<source>.bloom"""
+    company_dir = re.sub(r'[^a-z0-9]+', '-', company.lower()).strip('-') or 'company'
+    source_file = re.sub(r'[^a-z0-9]+', '-', source.lower()).strip('-') or 'source'
+    return os.path.join(directory, company_dir, source_file + FILTER_EXTENSION)
+
+
+def optimal_size(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """
+    Bits and hash functions for the error rate at the given number of reviews
+
+    Returns:
+        (bits, hash functions): m = -n ln p / (ln 2)^2 and k = (m / n) ln 2
+    """
+    capacity = max(1, capacity)
+    bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+    return bits, max(1, int(round(bits / capacity * math.log(2))))
+
+
+class BloomFilter:
+    """
+    Bloom filter in a memory-mapped file
+
+    Positions come from double hashing of one BLAKE2b digest (h1 + i * h2), so
+    each lookup hashes the key once. Only the pages of the file a lookup
+    touches are read, and changes reach the file when it is flushed or closed.
+
+    Args:
+        path: Filter file; created if missing
+        capacity: Reviews the filter is sized for when it is created
+        error_rate: False-positive rate at capacity when it is created; an existing
+            file keeps the size it was created with
+    """
+
+    def __init__(self, path: str, capacity: int = BLOOM_CONFIG['capacity'],
+                 error_rate: float = BLOOM_CONFIG['error_rate']):
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        self.path = path
+        if not os.path.exists(path):
+            self._create(path, capacity, error_rate)
+        self._file = open(path, 'r+b')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            magic, self.bits, self.hashes, self.count, self.capacity, self.error_rate = \
+                _HEADER.unpack_from(self._mmap)
+            if magic != _MAGIC or len(self._mmap) < HEADER_SIZE + (self.bits + 7) // 8:
+                raise ValueError(f"{path} is not a seen-review filter")
+        except Exception:
+            self._file.close()
+            raise
+
+    @staticmethod
+    def _create(path: str, capacity: int, error_rate: float):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        bits, hashes = optimal_size(capacity, error_rate)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, bits, hashes, 0, capacity, error_rate).ljust(HEADER_SIZE, b'\0'))
+            # Sparse where the file system allows it; pages are allocated as bits are set
+            f.truncate(HEADER_SIZE + (bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        data = self._mmap
+        for position in self._positions(key):
+            if not data[HEADER_SIZE + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key
+
+        Returns:
+            True if the key was new (some bit was unset), False if it was (probably) present
+        """
+        data = self._mmap
+        new = False
+        for position in self._positions(key):
+            index = HEADER_SIZE + (position >> 3)
+            mask = 1 << (position & 7)
+            if not data[index] & mask:
+                data[index] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __len__(self) -> int:
+        return self.count
+
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate at the current number of reviews"""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def flush(self):
+        """Write the review count and changed pages to the file"""
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, self.bits, self.hashes, self.count,
+                          self.capacity, self.error_rate)
+        self._mmap.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_filter(company: str, source: str, directory: str = BLOOM_CONFIG['directory']) -> BloomFilter:
+    """Open (or create) the filter of one company/source, warning when it is over capacity"""
+    seen = BloomFilter(filter_path(company, source, directory))
+    if seen.count > seen.capacity:
+        print(f"[WARNING] {seen.path} holds {seen.count} reviews, above its capacity of {seen.capacity}; "
+              f"false-positive rate is now {seen.false_positive_rate():.2%}. "
+              f"Run bloom.py --rebuild with a larger --capacity")
+    return seen
+
+
+def review_keys(reviews: Iterable[Dict], source_name: str) -> List[str]:
+    """Keys of complete review dictionaries of one source (see review_key)"""
+    return [review_key(review.get('source') or source_name, review.get('date'),
+                       review.get('reviewer_name'), review.get('title')) for review in reviews]
+
+
+def mark_seen(company: str, keys: Dict[str, List[str]], directory: str = BLOOM_CONFIG['directory']) -> int:
+    """
+    Add review keys to the filters of a company
+
+    Keys are taken from complete reviews as they are scraped (see review_keys),
+    since a --fields projection may leave out the fields that identify reviews.
+
+    Args:
+        company: Name of the company
+        keys: {source display name: review keys}
+        directory: Filter directory
+
+    Returns:
+        Number of reviews that were not in their filter yet
+    """
+    added = 0
+    for source_name, source_keys in keys.items():
+        if not source_keys:
+            continue
+        with open_filter(company, source_name, directory) as seen:
+            for key in source_keys:
+                added += seen.add(key)
+    return added
+
+
+def _stored_reviews(json_files: Iterable[str]):
+    for json_file in json_files:
+        for company, review in jsonstream.reviews(json_file):
+            if company and review.get('source'):
+                yield company, review
+
+
+def rebuild(json_files: List[str], directory: str = BLOOM_CONFIG['directory'],
+            capacity: int = BLOOM_CONFIG['capacity'],
+            error_rate: float = BLOOM_CONFIG['error_rate']) -> Dict[str, int]:
+    """
+    Regenerate the filters of every company/source found in results files
+
+    Files are streamed twice: once to count reviews, so each filter is sized
+    for at least that many, and once to fill the filters. Each filter is
+    written to a temporary file that replaces the old one when complete.
+
+    Returns:
+        {filter path: reviews added}
+    """
+    # Names differing only in case or punctuation share a filter file
+    counts = Counter(filter_path(company, review['source'], directory)
+                     for company, review in _stored_reviews(json_files))
+    filters = {}
+    try:
+        for path, count in counts.items():
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+            filters[path] = BloomFilter(path + '.tmp', max(capacity, count), error_rate)
+        for company, review in _stored_reviews(json_files):
+            filters[filter_path(company, review['source'], directory)].add(
+                review_key(review['source'], review.get('date'), review.get('reviewer_name'), review.get('title'))
+            )
+    finally:
+        for seen in filters.values():
+            seen.close()
+
+    added = {}
+    for path, seen in filters.items():
+        os.replace(seen.path, path)
+        added[path] = seen.count
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the seen-review filters used by main.py --skip-seen')
+    parser.add_argument('--rebuild', nargs='+', metavar='FILE',
+                        help='Regenerate the filters of every company/source in these results files')
+    parser.add_argument('--info', action='store_true', help='Print the fill level of every filter')
+    parser.add_argument('--directory', default=BLOOM_CONFIG['directory'],
+                        help=f"Filter directory (default: {BLOOM_CONFIG['directory']})")
+    parser.add_argument('--capacity', type=int, default=BLOOM_CONFIG['capacity'],
+                        help=f"Reviews per filter before the error rate degrades (default: {BLOOM_CONFIG['capacity']})")
+    parser.add_argument('--error-rate', type=float, default=BLOOM_CONFIG['error_rate'],
+                        help=f"False-positive rate at capacity (default: {BLOOM_CONFIG['error_rate']})")
+    args = parser.parse_args()
+    if not args.rebuild and not args.info:
+        parser.error('nothing to do: give --rebuild FILES and/or --info')
+
+    if args.rebuild:
+        try:
+            added = rebuild(args.rebuild, args.directory, args.capacity, args.error_rate)
+        except Exception as e:
+            print(f"[ERROR] Failed to rebuild filters: {str(e)}")
+            return 1
+        for path, count in sorted(added.items()):
+            print(f"[INFO] {path}: {count} reviews")
+        print(f"[SUCCESS] Rebuilt {len(added)} filters in {args.directory}")
+
+    if args.info:
+        for path in sorted(glob.glob(os.path.join(args.directory, '*', '*' + FILTER_EXTENSION))):
+            try:
+                with BloomFilter(path) as seen:
+                    size = HEADER_SIZE + (seen.bits + 7) // 8
+                    print(f"{path}: {seen.count}/{seen.capacity} reviews, {seen.hashes} hashes, "
+                          f"{size / 1024:.0f} KiB, false-positive rate {seen.false_positive_rate():.4%}")
+            except Exception as e:
+                print(f"[ERROR] {path}: {str(e)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Date-range result cache
+Keeps every review scraped for a company/source together with the date
+intervals that are fully covered: every review dated inside them has been
+collected. With --cache, a query inside covered intervals is answered from
+the cache without any request, and a query reaching past them only scrapes
+the uncovered part before merging it into the cache. A day only counts as
+covered once it is over, since reviews can still be posted on the current day.
+
+Usage:
+    python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-06-30 --cache
+    python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-12-31 --cache  # scrapes only July-December
+    python cache.py --info
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import jsonio
+from bloom import review_key
+from config import CACHE_CONFIG
+
+
+CACHE_VERSION = 1
+
+Interval = Tuple[str, str]
+
+
+def _day(value: str) -> date:
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sorted union of inclusive (start, end) date intervals, joining adjacent ones"""
+    merged: List[List[str]] = []
+    for start, end in sorted(intervals):
+        if merged and _day(start) <= _day(merged[-1][1]) + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def find_gaps(intervals: List[Interval], start: str, end: str) -> List[Interval]:
+    """
+    Parts of [start, end] not covered by the intervals
+
+    Args:
+        intervals: Covered intervals (merged)
+        start: First date (YYYY-MM-DD, inclusive)
+        end: Last date (YYYY-MM-DD, inclusive)
+    """
+    gaps = []
+    cursor = _day(start)
+    last = _day(end)
+    for covered_start, covered_end in intervals:
+        if cursor > last:
+            break
+        if _day(covered_end) < cursor:
+            continue
+        if _day(covered_start) > cursor:
+            gaps.append((cursor.isoformat(), min(_day(covered_start) - timedelta(days=1), last).isoformat()))
+        cursor = _day(covered_end) + timedelta(days=1)
+    if cursor <= last:
+        gaps.append((cursor.isoformat(), last.isoformat()))
+    return gaps
+
+
+class ResultCache:
+    """
+    One JSON file per company/source: {'version', 'company', 'source', 'intervals', 'reviews'}
+
+    Files are replaced through a temporary file, so an interrupted write leaves
+    the previous contents intact. Jobs of one run use different files, so
+    sources can be scraped concurrently.
+
+    Args:
+        directory: Cache directory
+    """
+
+    def __init__(self, directory: str = CACHE_CONFIG['directory']):
+        self.directory = directory
+
+    def path(self, company: str, source: str) -> str:
+        """<directory>/<company>/<source>.json"""
+        company_dir = re.sub(r'[^a-z0-9]+', '-', company.lower()).strip('-') or 'company'
+        source_file = re.sub(r'[^a-z0-9]+', '-', source.lower()).strip('-') or 'source'
+        return os.path.join(self.directory, company_dir, f"{source_file}.json")
+
+    def load(self, company: str, source: str) -> Dict:
+        """Cache entry of one company/source (empty if there is none or it cannot be read)"""
+        path = self.path(company, source)
+        if os.path.exists(path):
+            try:
+                entry = jsonio.load(path)
+                if entry.get('version') == CACHE_VERSION:
+                    return entry
+                print(f"[INFO] Ignoring result cache {path} written by another version")
+            except Exception as e:
+                print(f"[ERROR] Failed to read result cache {path}: {str(e)}")
+        return {'version': CACHE_VERSION, 'company': company, 'source': source, 'intervals': [], 'reviews': []}
+
+    def company_url(self, company: str, source: str) -> Optional[str]:
+        """Review page URL of a company recorded with its cached reviews, if any"""
+        for review in self.load(company, source)['reviews']:
+            if review.get('url'):
+                return review['url']
+        return None
+
+    @staticmethod
+    def coverable(start: datetime, end: datetime) -> Optional[Interval]:
+        """
+        Part of a query that can be covered: it ends yesterday at the latest
+
+        Returns:
+            (start, end) as YYYY-MM-DD, or None if the query lies entirely in the future
+        """
+        last = min(end.date(), date.today() - timedelta(days=1))
+        if last < start.date():
+            return None
+        return start.date().isoformat(), last.isoformat()
+
+    def missing_window(self, company: str, source: str, start: datetime,
+                       end: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Date window that still has to be scraped for a query
+
+        Sources paginate newest first, so several gaps are scraped in one pass
+        over the window spanning all of them.
+
+        Returns:
+            (start, end) to scrape, or None if the cache covers the whole query
+        """
+        coverable = self.coverable(start, end)
+        if coverable is None:
+            return start, end
+        intervals = [tuple(interval) for interval in self.load(company, source)['intervals']]
+        gaps = find_gaps(intervals, *coverable)
+        if coverable[1] < end.strftime('%Y-%m-%d'):
+            # Today and later are never covered
+            gaps.append(((_day(coverable[1]) + timedelta(days=1)).isoformat(), end.strftime('%Y-%m-%d')))
+        if not gaps:
+            return None
+        return datetime.strptime(gaps[0][0], '%Y-%m-%d'), datetime.strptime(gaps[-1][1], '%Y-%m-%d')
+
+    def reviews(self, company: str, source: str, start: datetime, end: datetime,
+                entry: Optional[Dict] = None) -> List[Dict]:
+        """
+        Cached reviews dated within [start, end], newest first
+
+        Reviews without a parseable date are always included, as in
+        BaseScraper.filter_by_date.
+        """
+        entry = entry if entry is not None else self.load(company, source)
+        first, last = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        selected = []
+        for review in entry['reviews']:
+            review_date = review.get('date') or ''
+            try:
+                _day(review_date)
+            except ValueError:
+                selected.append(review)
+                continue
+            if first <= review_date <= last:
+                selected.append(review)
+        return selected
+
+    def update(self, company: str, source: str, reviews: List[Dict], start: datetime, end: datetime,
+               complete: bool) -> Dict:
+        """
+        Merge freshly scraped reviews into the cache
+
+        Args:
+            reviews: Reviews scraped for [start, end]; they replace cached copies of
+                the same reviews (same source, date, reviewer and title)
+            start: First date of the scraped window
+            end: Last date of the scraped window
+            complete: Whether the scrape collected every review of the window; only
+                then is the window (up to yesterday) recorded as covered
+
+        Returns:
+            The updated cache entry
+        """
+        entry = self.load(company, source)
+        merged = {review_key(review.get('source'), review.get('date'), review.get('reviewer_name'),
+                             review.get('title')): review for review in entry['reviews']}
+        for review in reviews:
+            merged[review_key(review.get('source'), review.get('date'), review.get('reviewer_name'),
+                              review.get('title'))] = review
+        entry['reviews'] = sorted(merged.values(), key=lambda review: review.get('date') or '', reverse=True)
+
+        coverable = self.coverable(start, end)
+        if complete and coverable:
+            entry['intervals'] = [list(interval) for interval in
+                                  merge_intervals([tuple(interval) for interval in entry['intervals']] + [coverable])]
+
+        path = self.path(company, source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        jsonio.dump(entry, tmp_path, compact=True)
+        os.replace(tmp_path, path)
+        return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the date-range result cache used by main.py --cache')
+    parser.add_argument('--directory', default=CACHE_CONFIG['directory'],
+                        help=f"Cache directory (default: {CACHE_CONFIG['directory']})")
+    parser.add_argument('--info', action='store_true', help='Print the covered intervals of every cache file')
+    args = parser.parse_args()
+    if not args.info:
+        parser.error('nothing to do: give --info')
+
+    for path in sorted(glob.glob(os.path.join(args.directory, '*', '*.json'))):
+        try:
+            entry = jsonio.load(path)
+        except Exception as e:
+            print(f"[ERROR] {path}: {str(e)}")
+            continue
+        intervals = ', '.join(f"{start}..{end}" for start, end in entry.get('intervals', [])) or 'none'
+        print(f"{entry.get('company')} / {entry.get('source')}: {len(entry.get('reviews', []))} reviews, "
+              f"covered: {intervals}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
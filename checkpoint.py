@@ -0,0 +1,97 @@
+"""
+Checkpoints for long-running scrapes
+Records each company/source job's progress (resolved URL, last completed page
+and the reviews collected so far) so an interrupted run can be resumed with
+--resume instead of starting over. A job is identified by its company, source,
+date window and --fields projection, so a run with another window or
+projection never resumes from reviews collected for a different one.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class CheckpointStore:
+    """
+    JSON file of per-job progress, shared by all jobs of a run
+
+    Every save rewrites the whole file through a temporary file and
+    os.replace, so a crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path: Checkpoint file path
+            resume: Load existing progress from path instead of starting fresh
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, dict] = {}
+        if resume:
+            self._jobs = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        if not os.path.exists(self.path):
+            print(f"[INFO] No checkpoint found at {self.path}, starting fresh")
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                jobs = json.load(f).get('jobs', {})
+            print(f"[INFO] Resuming {len(jobs)} job(s) from {self.path}")
+            return jobs
+        except Exception as e:
+            print(f"[ERROR] Failed to read checkpoint, starting fresh: {str(e)}")
+            return {}
+
+    @staticmethod
+    def key(company_name: str, source_key: str, start_date: datetime, end_date: datetime,
+            fields: Optional[List[str]] = None) -> str:
+        """company|source|start|end|fields, with '*' for all fields"""
+        return '|'.join([company_name.lower(), source_key.lower(), start_date.strftime('%Y-%m-%d'),
+                         end_date.strftime('%Y-%m-%d'), ','.join(fields) if fields is not None else '*'])
+
+    def get(self, company_name: str, source_key: str, start_date: datetime, end_date: datetime,
+            fields: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        Saved progress of one job
+
+        Returns:
+            {'company_url': str, 'last_page': int, 'done': bool, 'reviews': [dict]}, or None
+        """
+        key = self.key(company_name, source_key, start_date, end_date, fields)
+        with self._lock:
+            state = self._jobs.get(key)
+            if state is None:
+                prefix = f"{company_name.lower()}|{source_key.lower()}|"
+                if any(job.startswith(prefix) for job in self._jobs):
+                    print(f"[INFO] Checkpoint of {company_name}/{source_key} is for another date range or "
+                          f"--fields, starting it fresh")
+            return state
+
+    def save(self, company_name: str, source_key: str, start_date: datetime, end_date: datetime,
+             fields: Optional[List[str]], state: dict) -> bool:
+        """Record the progress of one job and write the checkpoint file"""
+        with self._lock:
+            self._jobs[self.key(company_name, source_key, start_date, end_date, fields)] = state
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'jobs': self._jobs}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                return True
+            except Exception as e:
+                print(f"[ERROR] Failed to write checkpoint: {str(e)}")
+                return False
+
+    def remove(self):
+        """Delete the checkpoint file once the run's results are safely written"""
+        with self._lock:
+            self._jobs.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
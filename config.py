@@ -5,23 +5,28 @@ Configuration and constants for the Review Scraper
 # Supported review sources
 SUPPORTED_SOURCES = ['g2', 'capterra', 'trustpilot', 'all']
 
-# Source configurations
+# Source configurations. 'scraper' is the "module:Class" imported lazily when
+# the source is selected; third-party sources register under the
+# 'review_scraper.sources' entry point group with the same value format.
 SOURCE_CONFIG = {
     'g2': {
         'name': 'G2',
         'url': 'https://www.g2.com',
+        'scraper': 'scrapers.g2_scraper:G2Scraper',
         'enabled': True,
         'description': 'Business software reviews'
     },
     'capterra': {
         'name': 'Capterra',
         'url': 'https://www.capterra.com',
+        'scraper': 'scrapers.capterra_scraper:CapterraScraper',
         'enabled': True,
         'description': 'Software reviews and comparisons'
     },
     'trustpilot': {
         'name': 'Trustpilot',
         'url': 'https://www.trustpilot.com',
+        'scraper': 'scrapers.trustpilot_scraper:TrustpilotScraper',
         'enabled': True,
         'description': 'General consumer and business reviews'
     }
@@ -31,8 +36,75 @@ SOURCE_CONFIG = {
 SCRAPING_CONFIG = {
     'max_reviews_per_source': 100,  # Maximum reviews to scrape per source
     'request_timeout': 10,  # Timeout for HTTP requests in seconds
-    'request_delay': 2,  # Delay between requests in seconds
+    'request_delay': 2,  # Seconds between requests to a host, divided by its adaptive limit (see below)
     'max_pages': 50,  # Maximum number of pages to scrape
+    'checkpoint_interval': 5,  # Pages between progress checkpoints
+}
+
+# Adaptive (AIMD) limit on in-flight requests per host, shared by all jobs.
+# Requests to a host also start request_delay / limit seconds apart.
+# 'hosts' overrides the defaults for individual hosts, e.g. {'www.g2.com': {'maximum': 4}}
+HOST_CONCURRENCY_CONFIG = {
+    'default': {
+        'initial': 1,  # Starting in-flight limit
+        'minimum': 1,  # Never go below this many in-flight requests
+        'maximum': 8,  # Never go above this many in-flight requests
+        'decrease_factor': 0.5,  # Multiply the limit by this on 429/503/errors/latency rise
+        'latency_window': 20,  # Number of recent latencies used for p95
+        'latency_tolerance': 2.0,  # Cut when p95 exceeds the baseline p95 by this factor
+        'rebaseline_after': 3,  # Re-learn the baseline after this many consecutive latency cuts
+    },
+    'hosts': {}
+}
+
+# Retries for failed requests: exponential backoff with full jitter, capped by a
+# per-job budget so a struggling host cannot stall a job indefinitely
+RETRY_CONFIG = {
+    'max_attempts': 4,  # Attempts per request, including the first
+    'base_delay': 1.0,  # Backoff before the first retry, doubled for each further retry
+    'max_delay': 30.0,  # Upper bound on a single backoff
+    'retry_budget': 20,  # Total retries one source job may spend
+    'retry_statuses': [429, 500, 502, 503, 504],
+}
+
+# Per-host circuit breaker: after this many consecutive failures a host is
+# paused for every job, then probed with a single trial request
+CIRCUIT_BREAKER_CONFIG = {
+    'failure_threshold': 5,
+    'reset_timeout': 30.0,  # Seconds to pause a failing host before probing it
+}
+
+# Sentiment scoring (--sentiment): lexicon scores cached by a hash of the review text
+SENTIMENT_CONFIG = {
+    'cache_path': 'output/sentiment_cache.db',
+    'workers': 0,  # Worker processes; 0 uses one per CPU
+    'batch_size': 2000,  # Texts per worker task
+    'min_parallel': 5000,  # Fewer uncached texts than this are scored in-process
+}
+
+# Near-duplicate detection (--near-dedup): MinHash signatures of review
+# descriptions bucketed with LSH; bands of num_perm / bands rows each
+DEDUP_CONFIG = {
+    'threshold': 0.6,  # Estimated Jaccard similarity of duplicates; one edited word in 20 is ~0.73
+    'num_perm': 128,  # Signature length
+    'bands': 32,  # LSH bands; candidates need one fully matching band (~99% recall at 0.6)
+    'shingle_size': 3,  # Words per shingle
+    'min_tokens': 8,  # Shorter descriptions are never treated as duplicates
+}
+
+# Seen-review filters (--skip-seen): one memory-mapped Bloom filter of review
+# identities per company/source; see bloom.py
+BLOOM_CONFIG = {
+    'directory': 'output/seen',
+    'capacity': 1000000,  # Reviews per filter at which the error rate is reached (~1.7 MiB at 0.1%)
+    'error_rate': 0.001,  # Probability that an unseen review is taken for a seen one
+    'max_seen_pages': 25,  # Consecutive pages of only seen reviews after which pagination stops
+}
+
+# Date-range result cache (--cache): reviews and fully covered date intervals
+# per company/source; see cache.py
+CACHE_CONFIG = {
+    'directory': 'output/cache',
 }
 
 # HTTP headers
@@ -54,7 +126,12 @@ DATE_FORMATS = [
 OUTPUT_CONFIG = {
     'default_output_file': 'output/reviews.json',
     'output_directory': 'output',
-    'ensure_directory': True
+    'ensure_directory': True,
+    'parquet_compression': 'zstd',  # Any codec pyarrow supports: zstd, snappy, gzip, ...
+    'parquet_row_group_size': 100000,  # Rows per Parquet row group
+    'json_backend': 'auto',  # 'auto' uses orjson when installed, 'stdlib' always uses json
+    'gzip_level': 6,  # Compression level for .gz outputs
+    'zstd_level': 3,  # Compression level for .zst outputs
 }
 
 # Error messages
@@ -0,0 +1,256 @@
+"""
+Near-duplicate review detection
+The same review is often posted with small edits to several sites. Each
+review's description is reduced to a MinHash signature over word shingles,
+and signatures are bucketed by LSH banding, so only reviews sharing a band
+are compared: finding duplicates takes roughly linear time instead of
+comparing every pair. A candidate is a duplicate when the signatures
+estimate a Jaccard similarity of at least the threshold.
+
+Usage:
+    python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-12-31 --near-dedup
+    python dedup.py output/reviews.json --dry-run          # report duplicates only
+    python dedup.py output/*.json --across-files           # remove them, first occurrence wins
+"""
+import argparse
+import os
+import re
+import sys
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import jsonio
+import schema
+import summary
+from config import DEDUP_CONFIG
+
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+_LOW_32 = np.uint64(0xFFFFFFFF)
+_SHIFT_32 = np.uint64(32)
+
+
+class MinHasher:
+    """
+    MinHash signatures of texts over word shingles
+
+    Shingle hashes are combined from per-word CRC32s, and each permutation is a
+    multiply-add-shift hash ((a * x + b) mod 2^64) >> 32, computed for all
+    shingles and permutations at once.
+
+    Args:
+        num_perm: Signature length (number of hash permutations)
+        shingle_size: Words per shingle
+        min_tokens: Texts with fewer words get no signature, since short
+            texts ("Great tool!") are similar without being copies
+        seed: Seed of the permutations; signatures are only comparable with the same seed
+    """
+
+    def __init__(self, num_perm: int = DEDUP_CONFIG['num_perm'],
+                 shingle_size: int = DEDUP_CONFIG['shingle_size'],
+                 min_tokens: int = DEDUP_CONFIG['min_tokens'], seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = max(1, shingle_size)
+        self.min_tokens = max(min_tokens, self.shingle_size)
+        generator = np.random.default_rng(seed)
+        # Odd multipliers make each permutation a bijection modulo 2^64
+        self._a = generator.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+        self._positions = generator.integers(1, 1 << 63, size=self.shingle_size, dtype=np.uint64)
+
+    def shingle_hashes(self, text: str) -> Optional[np.ndarray]:
+        """32-bit hashes of the text's distinct shingles, or None if it has fewer than min_tokens words"""
+        tokens = _TOKEN.findall((text or '').lower())
+        if len(tokens) < self.min_tokens:
+            return None
+        words = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens),
+                            dtype=np.uint64, count=len(tokens))
+        count = len(tokens) - self.shingle_size + 1
+        # Integer overflow wraps around, which is what the hash wants
+        combined = np.zeros(count, dtype=np.uint64)
+        for offset, multiplier in enumerate(self._positions):
+            combined += words[offset:offset + count] * multiplier
+        return np.unique((combined ^ (combined >> _SHIFT_32)) & _LOW_32)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Returns:
+            uint32 array of num_perm minimum hashes, or None for texts that are too short
+        """
+        hashes = self.shingle_hashes(text)
+        if hashes is None:
+            return None
+        permuted = (self._a * hashes + self._b) >> _SHIFT_32
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures
+
+    With `bands` bands of num_perm / bands rows each, two reviews become
+    candidates when all rows of any band agree; candidates are then confirmed
+    by the fraction of agreeing signature values.
+
+    Args:
+        threshold: Estimated Jaccard similarity at or above which reviews are duplicates
+        num_perm: Signature length
+        bands: Number of LSH bands; must divide num_perm
+        hasher: Signature generator (default: a MinHasher with num_perm permutations)
+    """
+
+    def __init__(self, threshold: float = DEDUP_CONFIG['threshold'],
+                 num_perm: int = DEDUP_CONFIG['num_perm'], bands: int = DEDUP_CONFIG['bands'],
+                 hasher: Optional[MinHasher] = None):
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._row_weights = np.random.default_rng(0).integers(1, 1 << 63, size=self.rows, dtype=np.uint64)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[np.ndarray] = []
+        self._keys: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        # Each band's rows folded into one integer; a rare collision only adds a
+        # candidate that the similarity check then rejects
+        bands = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        return (bands * self._row_weights).sum(axis=1).tolist()
+
+    def find(self, signature: np.ndarray, band_keys: Optional[List[int]] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Most similar indexed review at or above the threshold
+
+        Returns:
+            (key, estimated similarity), or None if there is no near-duplicate
+        """
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys or self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        best = None
+        for candidate in candidates:
+            similarity = float(np.count_nonzero(self._signatures[candidate] == signature)) / len(signature)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self._keys[candidate], similarity)
+        return best
+
+    def add(self, key: Any, text: str) -> Optional[Tuple[Any, float]]:
+        """
+        Index a text unless it near-duplicates one already indexed
+
+        Args:
+            key: Identifier returned when a later text duplicates this one
+            text: Review description
+
+        Returns:
+            (key of the earlier review, estimated similarity) if the text is a
+            near-duplicate (it is then not indexed), otherwise None
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        band_keys = self._band_keys(signature)
+        match = self.find(signature, band_keys)
+        if match is not None:
+            return match
+        position = len(self._keys)
+        self._keys.append(key)
+        self._signatures.append(signature)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets.setdefault(band_key, []).append(position)
+        return None
+
+
+def remove_near_duplicates(results: Dict, index: Optional[NearDuplicateIndex] = None,
+                           label: str = '') -> List[Tuple[Any, Any, float]]:
+    """
+    Drop reviews whose description near-duplicates an earlier review, across all
+    sources; the first occurrence (in source order) is kept
+
+    Each source block that lost reviews gets a 'near_duplicates_removed' count
+    and an updated 'total_reviews'.
+
+    Args:
+        results: Results dictionary (schema version 1), modified in place
+        index: Index to check against and add to, e.g. shared across files
+        label: Prefix of the keys recorded in the index, e.g. a file name
+
+    Returns:
+        (removed review key, kept review key, similarity) for every removed review,
+        where a key is (label, source name, position in the source)
+    """
+    index = index if index is not None else NearDuplicateIndex()
+    removed = []
+    for source_name, source_data in results.get('sources', {}).items():
+        reviews = source_data.get('reviews')
+        if not reviews:
+            continue
+        kept = []
+        for position, review in enumerate(reviews):
+            key = (label, source_name, position)
+            match = index.add(key, review.get('description') or '')
+            if match is None:
+                kept.append(review)
+            else:
+                removed.append((key, match[0], match[1]))
+        if len(kept) < len(reviews):
+            source_data['near_duplicates_removed'] = (
+                source_data.get('near_duplicates_removed', 0) + len(reviews) - len(kept)
+            )
+            source_data['reviews'] = kept
+            source_data['total_reviews'] = len(kept)
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find and remove near-duplicate reviews in results files')
+    parser.add_argument('files', nargs='+', help='Results JSON files written by main.py (either schema version)')
+    parser.add_argument('--threshold', type=float, default=DEDUP_CONFIG['threshold'],
+                        help=f"Estimated Jaccard similarity of duplicates (default: {DEDUP_CONFIG['threshold']})")
+    parser.add_argument('--across-files', action='store_true',
+                        help='Also remove reviews duplicating one in an earlier file (keeps one index for all files)')
+    parser.add_argument('--dry-run', action='store_true', help='Report duplicates without rewriting the files')
+    parser.add_argument('--show', type=int, default=5, help='Duplicate pairs to print per file (default: 5)')
+    parser.add_argument('--compact', action='store_true', help='Write JSON without indentation')
+    args = parser.parse_args()
+
+    index = NearDuplicateIndex(args.threshold) if args.across_files else None
+    for json_file in args.files:
+        try:
+            data = jsonio.load(json_file)
+            version = schema.schema_version(data)
+            results = schema.denormalize(data)
+            file_index = index if index is not None else NearDuplicateIndex(args.threshold)
+            removed = remove_near_duplicates(results, file_index, label=json_file)
+        except Exception as e:
+            print(f"[ERROR] Failed to deduplicate {json_file}: {str(e)}")
+            return 1
+
+        print(f"[INFO] {json_file}: {len(removed)} near-duplicate reviews")
+        for (_, source_name, position), (kept_file, kept_source, kept_position), similarity in removed[:args.show]:
+            where = '' if kept_file == json_file else f"{kept_file} "
+            print(f"  {source_name} #{position} ~ {where}{kept_source} #{kept_position} (similarity {similarity:.2f})")
+
+        if args.dry_run or not removed:
+            continue
+        try:
+            jsonio.dump(schema.normalize(results) if version == 2 else results, json_file, compact=args.compact)
+            if os.path.exists(summary.summary_path(json_file)):
+                summary.summarize_results(results).write(json_file)
+        except Exception as e:
+            print(f"[ERROR] Failed to save {json_file}: {str(e)}")
+            return 1
+        print(f"[SUCCESS] Removed {len(removed)} reviews from {json_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
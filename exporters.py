@@ -0,0 +1,233 @@
+"""
+Exporters - Write scraped results as flat tables instead of nested JSON
+Each exporter turns a results dictionary (as produced by main.scrape_reviews)
+into one row per review with the company and source as columns
+
+Usage:
+    python exporters.py output/reviews.json --format csv
+    python exporters.py output/reviews.json --format parquet --output output/reviews.parquet
+"""
+import argparse
+import csv
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import jsonio
+import schema
+from config import OUTPUT_CONFIG
+
+
+# Column order of exported tables
+FIELDS = ['company', 'source', 'date', 'rating', 'title', 'description', 'reviewer_name', 'url']
+
+# Columns added after FIELDS when the reviews carry them (e.g. from --sentiment)
+OPTIONAL_FIELDS = ['sentiment']
+
+
+def result_fields(results: Dict) -> List[str]:
+    """
+    FIELDS (only company, source and the projected ones if the results have a
+    'fields' projection) plus the OPTIONAL_FIELDS present in the first review of any source
+    """
+    present = set()
+    for source_data in results.get('sources', {}).values():
+        reviews = source_data.get('reviews')
+        if reviews:
+            present.update(reviews[0])
+    projection = results.get('fields')
+    fields = FIELDS if projection is None else [
+        field for field in FIELDS if field in ('company', 'source') or field in projection
+    ]
+    return fields + [field for field in OPTIONAL_FIELDS if field in present]
+
+
+def iter_rows(results: Dict, fields: List[str] = FIELDS) -> Iterator[Dict]:
+    """
+    Flatten results into one dictionary per review
+
+    Args:
+        results: Results dictionary with a 'sources' mapping
+        fields: Keys of each row
+
+    Yields:
+        Review rows with the given keys
+    """
+    company_name = results.get('company')
+    for source_name, source_data in results.get('sources', {}).items():
+        for review in source_data.get('reviews', []):
+            row = {field: review.get(field) for field in fields}
+            row['company'] = company_name
+            row['source'] = review.get('source') or source_name
+            yield row
+
+
+def to_dataframe(results: Dict, fields: Optional[List[str]] = None):
+    """
+    Build a typed pandas DataFrame with one row per review (see rows_to_dataframe)
+
+    Args:
+        results: Results dictionary with a 'sources' mapping
+        fields: Columns to keep (default: result_fields(results))
+
+    Raises:
+        ImportError: If pandas is not installed
+    """
+    fields = fields or result_fields(results)
+    return rows_to_dataframe(iter_rows(results, fields), fields)
+
+
+def rows_to_dataframe(rows: Iterable[Dict], fields: List[str] = FIELDS):
+    """
+    Build a typed pandas DataFrame from review rows: dates as timestamps, ratings
+    as floats and company/source as categoricals
+
+    Args:
+        rows: Dictionaries with the FIELDS keys, e.g. from iter_rows
+        fields: Columns to keep
+
+    Raises:
+        ImportError: If pandas is not installed
+    """
+    import pandas as pd
+
+    columns = {field: [] for field in fields}
+    for row in rows:
+        for field in fields:
+            columns[field].append(row.get(field))
+
+    df = pd.DataFrame(columns, columns=fields)
+    if 'date' in columns:
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
+    for field in ('rating', 'sentiment'):
+        if field in columns:
+            df[field] = pd.to_numeric(df[field], errors='coerce').astype('float64')
+    for field in ('company', 'source'):
+        if field in columns:
+            df[field] = df[field].astype('category')
+    return df
+
+
+class CSVExporter:
+    """
+    Streams rows to a CSV file one at a time, without building a table in memory
+    (gzip or zstd compressed if the file name ends in .gz or .zst)
+    """
+
+    extension = '.csv'
+
+    def check_available(self):
+        pass
+
+    def export(self, results: Dict, output_file: str) -> int:
+        """
+        Write results to a CSV file
+
+        Returns:
+            Number of rows written
+        """
+        count = 0
+        with jsonio.open_file(output_file, 'wt') as f:
+            fields = result_fields(results)
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for row in iter_rows(results, fields):
+                writer.writerow(row)
+                count += 1
+        return count
+
+
+class ParquetExporter:
+    """
+    Writes a columnar Parquet file through pandas (requires pandas and pyarrow)
+
+    Dates are stored as timestamps, ratings as floats and company/source as
+    dictionary-encoded categoricals.
+    """
+
+    extension = '.parquet'
+
+    def __init__(self, compression: str = OUTPUT_CONFIG['parquet_compression'],
+                 row_group_size: int = OUTPUT_CONFIG['parquet_row_group_size']):
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    def check_available(self):
+        """
+        Fail early, before any scraping, if the optional dependencies are missing
+
+        Raises:
+            ImportError: If pandas or pyarrow is not installed
+        """
+        try:
+            import pandas
+            import pyarrow
+        except ImportError:
+            raise ImportError("Parquet export requires pandas and pyarrow: pip install pandas pyarrow")
+
+    def export(self, results: Dict, output_file: str) -> int:
+        """
+        Write results to a Parquet file
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ImportError: If pandas or pyarrow is not installed
+        """
+        self.check_available()
+        df = to_dataframe(results)
+        df.to_parquet(output_file, engine='pyarrow', index=False,
+                      compression=self.compression, row_group_size=self.row_group_size)
+        return len(df)
+
+
+EXPORTERS = {
+    'csv': CSVExporter,
+    'parquet': ParquetExporter,
+}
+
+
+def get_exporter(fmt: str):
+    """
+    Create the exporter for a format
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        return EXPORTERS[fmt.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown export format '{fmt}'. Available formats: {', '.join(EXPORTERS)}")
+
+
+def export_file(json_file: str, output_file: str, fmt: str) -> int:
+    """
+    Convert a results JSON file written by main.py
+
+    Returns:
+        Number of rows written
+    """
+    return get_exporter(fmt).export(schema.load_results(json_file), output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a results JSON file to CSV or Parquet')
+    parser.add_argument('json_file', help='Results JSON file written by main.py')
+    parser.add_argument('--format', choices=list(EXPORTERS), default='csv', help='Output format (default: csv)')
+    parser.add_argument('--output', help='Output file (default: the input path with the format\'s extension)')
+    args = parser.parse_args()
+
+    exporter = get_exporter(args.format)
+    output_file = args.output or os.path.splitext(args.json_file)[0] + exporter.extension
+    try:
+        count = exporter.export(schema.load_results(args.json_file), output_file)
+    except Exception as e:
+        print(f"[ERROR] Export failed: {str(e)}")
+        return 1
+    print(f"[SUCCESS] Exported {count} reviews to {output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
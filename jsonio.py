@@ -0,0 +1,122 @@
+"""
+JSON file I/O for the Review Scraper
+Reads and writes results files with transparent compression chosen by file
+extension (.gz, .zst/.zstd) and a fast JSON backend (orjson) when installed,
+falling back to the standard library
+"""
+import gzip
+import json
+from typing import Any
+
+from config import OUTPUT_CONFIG
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+GZIP_EXTENSIONS = ('.gz', '.gzip')
+ZSTD_EXTENSIONS = ('.zst', '.zstd')
+
+
+def backend() -> str:
+    """Name of the JSON backend in use: 'orjson' or 'json'"""
+    if orjson is not None and OUTPUT_CONFIG['json_backend'] != 'stdlib':
+        return 'orjson'
+    return 'json'
+
+
+def _text_options(mode: str) -> dict:
+    if 'b' in mode:
+        return {}
+    # newline='' keeps csv's line endings untouched
+    return {'encoding': 'utf-8', 'newline': '' if 'w' in mode else None}
+
+
+def _open_zstd(path: str, mode: str):
+    try:
+        # Python 3.14+
+        from compression import zstd
+        return zstd.open(path, mode, level=OUTPUT_CONFIG['zstd_level'] if 'w' in mode else None,
+                         **_text_options(mode))
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compression requires the zstandard package: pip install zstandard")
+    if 'r' in mode:
+        return zstandard.open(path, mode, **_text_options(mode))
+    cctx = zstandard.ZstdCompressor(level=OUTPUT_CONFIG['zstd_level'])
+    return zstandard.open(path, mode, cctx=cctx, **_text_options(mode))
+
+
+def check_available(path: str):
+    """
+    Fail early if writing path needs a compression library that is not installed
+
+    Raises:
+        ImportError: For zstd files when no zstd implementation is installed
+    """
+    if path.lower().endswith(ZSTD_EXTENSIONS):
+        try:
+            from compression import zstd
+        except ImportError:
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd compression requires the zstandard package: pip install zstandard")
+
+
+def open_file(path: str, mode: str = 'rb'):
+    """
+    Open a file, compressing or decompressing it according to its extension
+
+    Args:
+        path: File path; .gz/.gzip uses gzip, .zst/.zstd uses zstd, anything else is plain
+        mode: 'rb', 'wb', 'rt' or 'wt' (text modes use UTF-8)
+
+    Raises:
+        ImportError: For zstd files when no zstd implementation is installed
+    """
+    lower = path.lower()
+    if lower.endswith(GZIP_EXTENSIONS):
+        return gzip.open(path, mode, compresslevel=OUTPUT_CONFIG['gzip_level'], **_text_options(mode))
+    if lower.endswith(ZSTD_EXTENSIONS):
+        return _open_zstd(path, mode)
+    return open(path, mode, **_text_options(mode))
+
+
+def dumps(data: Any, compact: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON
+
+    Args:
+        data: JSON-serializable object
+        compact: No indentation or spaces after separators; otherwise indented by 2
+    """
+    if backend() == 'orjson':
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def loads(text) -> Any:
+    """Parse JSON from str or bytes"""
+    if backend() == 'orjson':
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dump(data: Any, path: str, compact: bool = False):
+    """Write data as JSON to path, compressed according to its extension"""
+    with open_file(path, 'wb') as f:
+        f.write(dumps(data, compact))
+
+
+def load(path: str) -> Any:
+    """Read a JSON file, decompressing it according to its extension"""
+    with open_file(path, 'rb') as f:
+        return loads(f.read())
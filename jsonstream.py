@@ -0,0 +1,220 @@
+"""
+Incremental reader for results files too large to json.load()
+
+Walks a results JSON file (either schema version, optionally .gz or .zst
+compressed) one review at a time, keeping only a small read buffer and the
+current review in memory. NDJSON files (.ndjson/.jsonl, one review per line
+with its 'source' and 'company') are read line by line.
+
+walk() yields events:
+    ('header', key, value)          top-level value other than 'sources'
+    ('source_start', name, None)    start of a source block
+    ('source_field', name, (key, value))  block value other than 'reviews'
+    ('review', name, review)        one review dictionary, as stored in the file
+    ('source_end', name, count)     end of a source block, with the number of reviews
+                                    walked (None if the block had no 'reviews' array)
+
+source_reviews() builds on walk() and yields every review in the version 1
+shape with its company and source block name; reviews() leaves out the name.
+"""
+import json
+import re
+from typing import Any, Iterator, Tuple
+
+import jsonio
+import schema
+
+
+CHUNK_SIZE = 1 << 20
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def is_ndjson(path: str) -> bool:
+    """Whether path is an NDJSON file, ignoring a compression extension"""
+    lower = path.lower()
+    for extension in jsonio.GZIP_EXTENSIONS + jsonio.ZSTD_EXTENSIONS:
+        if lower.endswith(extension):
+            lower = lower[:-len(extension)]
+    return lower.endswith(NDJSON_EXTENSIONS)
+
+
+class _Reader:
+    """Buffered text reader that decodes one JSON value at a time"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so memory stays bounded by the chunk size
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number or literal ending exactly at the buffer end may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, self.pos = _decoder.raw_decode(self.buf, self.pos)
+                return value
+
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of an object, leaving each value for the caller to consume"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def items(self) -> Iterator[Any]:
+        """Iterate over the elements of an array, decoding each one"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+def _walk_json(path: str) -> Iterator[Tuple[str, Any, Any]]:
+    with jsonio.open_file(path, 'rt') as f:
+        reader = _Reader(f)
+        for key in reader.members():
+            if key != 'sources':
+                yield 'header', key, reader.value()
+                continue
+            if reader.peek() != '{':
+                yield 'header', key, reader.value()
+                continue
+            for name in reader.members():
+                yield 'source_start', name, None
+                count = None
+                for field in reader.members():
+                    if field == 'reviews' and reader.peek() == '[':
+                        count = 0
+                        for review in reader.items():
+                            count += 1
+                            yield 'review', name, review
+                    else:
+                        yield 'source_field', name, (field, reader.value())
+                yield 'source_end', name, count
+
+
+def _walk_ndjson(path: str) -> Iterator[Tuple[str, Any, Any]]:
+    current, count = None, 0
+    with jsonio.open_file(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            review = jsonio.loads(line)
+            name = review.get('source') if isinstance(review, dict) else None
+            if name != current or not count:
+                if count:
+                    yield 'source_end', current, count
+                current, count = name, 0
+                yield 'source_start', name, None
+            count += 1
+            yield 'review', name, review
+    if count:
+        yield 'source_end', current, count
+
+
+def walk(path: str) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Stream the events of a results or NDJSON file
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    return _walk_ndjson(path) if is_ndjson(path) else _walk_json(path)
+
+
+def source_reviews(path: str) -> Iterator[Tuple[Any, Any, dict]]:
+    """
+    Stream the reviews of a results or NDJSON file as version 1 review dictionaries
+
+    Version 2 reviews are rehydrated from their source block, whose hoisted
+    fields and dictionaries precede the reviews in files written by schema.normalize.
+
+    Yields:
+        (company, source name, review); the source name is the block's (an NDJSON
+        review's 'source'), so it is known even when a --fields projection left
+        'source' out of the reviews
+    """
+    company, version, block, fields = None, 1, {}, None
+    for event, name, value in walk(path):
+        if event == 'review':
+            if version == 2:
+                value = schema.denormalize_review(value, block, fields)
+            yield company if company is not None else value.get('company'), name, value
+        elif event == 'header':
+            if name == 'company':
+                company = value
+            elif name == 'schema_version':
+                version = value
+            elif name == 'fields':
+                fields = value
+        elif event == 'source_start':
+            block = {}
+        elif event == 'source_field':
+            block[value[0]] = value[1]
+
+
+def reviews(path: str) -> Iterator[Tuple[Any, dict]]:
+    """
+    Stream the reviews of a results or NDJSON file (see source_reviews)
+
+    Yields:
+        (company, review) pairs
+    """
+    for company, _, review in source_reviews(path):
+        yield company, review
@@ -5,12 +5,24 @@ Scrapes product reviews from G2, Capterra, and Trustpilot
 import argparse
 import os
 import sys
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from scrapers.g2_scraper import G2Scraper
-from scrapers.capterra_scraper import CapterraScraper
-from scrapers.trustpilot_scraper import TrustpilotScraper
+from typing import TYPE_CHECKING, Dict, List, Optional
+from scrapers.registry import available_sources, is_valid_source, resolve_sources, \
+    source_display_name, get_scraper_class
+from metrics import METRICS, PrometheusExporter
+from checkpoint import CheckpointStore
+from config import BLOOM_CONFIG, CACHE_CONFIG, SENTIMENT_CONFIG
+import jsonio
+import profiling
+import schema
+import summary
+import tracing
+
+if TYPE_CHECKING:
+    from cache import ResultCache
 
 
 def validate_inputs(company_name: str, start_date: str, end_date: str, source: str) -> tuple:
@@ -21,7 +33,7 @@ def validate_inputs(company_name: str, start_date: str, end_date: str, source: s
         company_name: Name of the company
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
-        source: Source (G2, Capterra, Trustpilot, or all)
+        source: Source key (g2, capterra, trustpilot, a registered source, or all)
     
     Returns:
         Tuple of (company_name, start_date_obj, end_date_obj, source)
@@ -46,15 +58,163 @@ def validate_inputs(company_name: str, start_date: str, end_date: str, source: s
         raise ValueError("Start date must be before end date")
     
     # Validate source
-    valid_sources = ['g2', 'capterra', 'trustpilot', 'all']
-    if source.lower() not in valid_sources:
+    if not is_valid_source(source):
+        valid_sources = available_sources() + ['all']
         raise ValueError(f"Source must be one of: {', '.join(valid_sources)}")
     
     return company_name, start, end, source.lower()
 
 
+def validate_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a --fields projection
+    
+    Args:
+        fields: Comma-separated review fields, or None for all fields
+    
+    Returns:
+        The fields in output order, always including the date (reviews are
+        filtered by it), or None for all fields
+    
+    Raises:
+        ValueError: If a field is unknown
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested - set(schema.REVIEW_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}. "
+                         f"Fields must be among: {', '.join(schema.REVIEW_KEYS)}")
+    requested.add('date')
+    return [field for field in schema.REVIEW_KEYS if field in requested]
+
+
+def scrape_source(company_name: str, start_date: datetime, end_date: datetime,
+                  source_key: str, checkpoints: Optional[CheckpointStore] = None,
+                  seen_dir: Optional[str] = None, result_cache: Optional['ResultCache'] = None,
+                  fields: Optional[List[str]] = None,
+                  seen_keys: Optional[Dict[str, List[str]]] = None) -> tuple:
+    """
+    Scrape reviews from a single source
+    
+    Args:
+        company_name: Name of the company
+        start_date: Start date object
+        end_date: End date object
+        source_key: Source key (e.g. g2)
+        checkpoints: Store to resume from and record progress in
+        seen_dir: Directory of seen-review filters; reviews saved by earlier runs are
+            skipped (see bloom.py)
+        result_cache: Cache to serve covered dates from; only the rest is scraped
+            and then merged into it (see cache.py)
+        fields: Review fields to extract and output (see validate_fields); None for all
+        seen_keys: Receives the identity keys of the output reviews under the source
+            name, taken before projecting them to `fields` (see bloom.mark_seen)
+    
+    Returns:
+        Tuple of (source display name, source results dictionary)
+    """
+    source_name = source_display_name(source_key)
+    print(f"\n[INFO] Scraping {source_name} for '{company_name}'...")
+    try:
+        scrape_start, scrape_end = start_date, end_date
+        if result_cache:
+            window = result_cache.missing_window(company_name, source_name, start_date, end_date)
+            if window is None:
+                reviews = result_cache.reviews(company_name, source_name, start_date, end_date)
+                seen_skipped = 0
+                if seen_dir:
+                    from bloom import open_filter, review_keys
+                    keys = review_keys(reviews, source_name)
+                    with open_filter(company_name, source_name, seen_dir) as seen:
+                        fresh = [(key, review) for key, review in zip(keys, reviews) if key not in seen]
+                    seen_skipped = len(reviews) - len(fresh)
+                    METRICS.inc('scraper_reviews_seen_total', seen_skipped, source=source_name)
+                    reviews = [review for _, review in fresh]
+                    if seen_keys is not None:
+                        seen_keys[source_name] = [key for key, _ in fresh]
+                if fields is not None:
+                    reviews = [{field: review.get(field) for field in fields} for review in reviews]
+                print(f"[SUCCESS] Served {len(reviews)} {source_name} reviews from the result cache")
+                METRICS.inc('scraper_cache_hits_total', source=source_name)
+                METRICS.inc('scraper_jobs_total', source=source_name, status='cached')
+                block = {'total_reviews': len(reviews), 'reviews': reviews, 'from_cache': len(reviews)}
+                if seen_skipped:
+                    print(f"[INFO] Skipped {seen_skipped} {source_name} reviews saved by earlier runs")
+                    block['seen_skipped'] = seen_skipped
+                return source_name, block
+            if fields is not None:
+                # The cache only holds complete reviews, so a projected job scrapes the
+                # whole range and leaves the cache as it is
+                result_cache = None
+            else:
+                scrape_start, scrape_end = window
+            if result_cache and window != (start_date, end_date):
+                print(f"[INFO] Cache covers part of the range; scraping {scrape_start.strftime('%Y-%m-%d')} "
+                      f"to {scrape_end.strftime('%Y-%m-%d')}")
+        
+        scraper_class = get_scraper_class(source_key)
+        scraper = scraper_class(company_name, scrape_start, scrape_end)
+        scraper.fields = fields
+        if checkpoints:
+            job = (company_name, source_key, scrape_start, scrape_end, fields)
+            state = checkpoints.get(*job)
+            if state:
+                scraper.resume(state)
+            scraper.checkpoint = lambda state: checkpoints.save(*job, state)
+        if seen_dir:
+            from bloom import open_filter
+            scraper.seen_filter = open_filter(company_name, source_name, seen_dir)
+        try:
+            reviews = scraper.scrape()
+        finally:
+            if scraper.seen_filter is not None:
+                scraper.seen_filter.close()
+        print(f"[SUCCESS] Found {len(reviews)} reviews from {source_name}")
+        review_dicts = [r.to_dict() for r in reviews]
+        from_cache = 0
+        if result_cache:
+            # Reviews skipped as seen are missing from the results, so the window is not covered
+            entry = result_cache.update(company_name, source_name, review_dicts, scrape_start, scrape_end,
+                                        scraper.complete and not scraper.seen_skipped)
+            scraped = len(review_dicts)
+            review_dicts = result_cache.reviews(company_name, source_name, start_date, end_date, entry)
+            from_cache = max(0, len(review_dicts) - scraped)
+        if seen_keys is not None:
+            from bloom import review_keys
+            seen_keys[source_name] = review_keys(review_dicts, source_name)
+        if fields is not None:
+            review_dicts = [{field: review.get(field) for field in fields} for review in review_dicts]
+        block = {
+            'total_reviews': len(review_dicts),
+            'reviews': review_dicts
+        }
+        if from_cache:
+            print(f"[INFO] Added {from_cache} {source_name} reviews from the result cache")
+            block['from_cache'] = from_cache
+        if scraper.seen_skipped:
+            print(f"[INFO] Skipped {scraper.seen_skipped} {source_name} reviews saved by earlier runs")
+            block['seen_skipped'] = scraper.seen_skipped
+        if scraper.truncated_at_page is not None:
+            # Keep what was collected, but make the gap visible in the output
+            block['truncated_at_page'] = scraper.truncated_at_page
+            block['error'] = scraper.last_error
+        METRICS.inc('scraper_jobs_total', source=source_name,
+                    status='ok' if scraper.truncated_at_page is None else 'truncated')
+        return source_name, block
+    except Exception as e:
+        print(f"[ERROR] {source_name} scraping failed: {str(e)}")
+        METRICS.inc('scraper_jobs_total', source=source_name, status='error')
+        return source_name, {'error': str(e), 'total_reviews': 0}
+
+
 def scrape_reviews(company_name: str, start_date: datetime, end_date: datetime, 
-                   source: str) -> dict:
+                   source: str, workers: int = 1,
+                   checkpoints: Optional[CheckpointStore] = None,
+                   near_dedup: bool = False, seen_dir: Optional[str] = None,
+                   result_cache: Optional['ResultCache'] = None, fields: Optional[List[str]] = None,
+                   seen_keys: Optional[Dict[str, List[str]]] = None) -> dict:
     """
     Scrape reviews from specified source(s)
     
@@ -63,6 +223,16 @@ def scrape_reviews(company_name: str, start_date: datetime, end_date: datetime,
         start_date: Start date object
         end_date: End date object
         source: Source to scrape from
+        workers: Number of sources to scrape concurrently
+        checkpoints: Store to resume from and record progress in
+        near_dedup: Drop reviews whose description near-duplicates an earlier one,
+            across sources (see dedup.py)
+        seen_dir: Directory of seen-review filters; reviews saved by earlier runs are
+            skipped (see bloom.py)
+        result_cache: Cache to serve covered dates from (see cache.py)
+        fields: Review fields to extract and output; recorded in the results as
+            'fields' (None for all)
+        seen_keys: Receives the identity keys of the output reviews per source
     
     Returns:
         Dictionary containing reviews from all sources
@@ -71,81 +241,93 @@ def scrape_reviews(company_name: str, start_date: datetime, end_date: datetime,
         'company': company_name,
         'start_date': start_date.strftime('%Y-%m-%d'),
         'end_date': end_date.strftime('%Y-%m-%d'),
-        'sources': {}
     }
+    if fields is not None:
+        # Ahead of 'sources', so streaming readers know the fields before any review
+        results['fields'] = fields
+    results['sources'] = {}
     
-    sources_to_scrape = []
-    if source == 'all':
-        sources_to_scrape = ['g2', 'capterra', 'trustpilot']
+    source_keys = resolve_sources(source)
+    if workers > 1 and len(source_keys) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape') as pool:
+            outcomes = list(pool.map(
+                lambda key: scrape_source(company_name, start_date, end_date, key, checkpoints, seen_dir,
+                                          result_cache, fields, seen_keys),
+                source_keys
+            ))
     else:
-        sources_to_scrape = [source]
+        outcomes = [scrape_source(company_name, start_date, end_date, key, checkpoints, seen_dir,
+                                  result_cache, fields, seen_keys)
+                    for key in source_keys]
     
-    # Scrape from G2
-    if 'g2' in sources_to_scrape:
-        print(f"\n[INFO] Scraping G2 for '{company_name}'...")
-        try:
-            g2_scraper = G2Scraper(company_name, start_date, end_date)
-            reviews = g2_scraper.scrape()
-            results['sources']['G2'] = {
-                'total_reviews': len(reviews),
-                'reviews': [r.to_dict() for r in reviews]
-            }
-            print(f"[SUCCESS] Found {len(reviews)} reviews from G2")
-        except Exception as e:
-            print(f"[ERROR] G2 scraping failed: {str(e)}")
-            results['sources']['G2'] = {'error': str(e), 'total_reviews': 0}
-    
-    # Scrape from Capterra
-    if 'capterra' in sources_to_scrape:
-        print(f"\n[INFO] Scraping Capterra for '{company_name}'...")
-        try:
-            capterra_scraper = CapterraScraper(company_name, start_date, end_date)
-            reviews = capterra_scraper.scrape()
-            results['sources']['Capterra'] = {
-                'total_reviews': len(reviews),
-                'reviews': [r.to_dict() for r in reviews]
-            }
-            print(f"[SUCCESS] Found {len(reviews)} reviews from Capterra")
-        except Exception as e:
-            print(f"[ERROR] Capterra scraping failed: {str(e)}")
-            results['sources']['Capterra'] = {'error': str(e), 'total_reviews': 0}
-    
-    # Scrape from Trustpilot
-    if 'trustpilot' in sources_to_scrape:
-        print(f"\n[INFO] Scraping Trustpilot for '{company_name}'...")
-        try:
-            trustpilot_scraper = TrustpilotScraper(company_name, start_date, end_date)
-            reviews = trustpilot_scraper.scrape()
-            results['sources']['Trustpilot'] = {
-                'total_reviews': len(reviews),
-                'reviews': [r.to_dict() for r in reviews]
-            }
-            print(f"[SUCCESS] Found {len(reviews)} reviews from Trustpilot")
-        except Exception as e:
-            print(f"[ERROR] Trustpilot scraping failed: {str(e)}")
-            results['sources']['Trustpilot'] = {'error': str(e), 'total_reviews': 0}
+    for source_name, source_results in outcomes:
+        results['sources'][source_name] = source_results
+    
+    if near_dedup:
+        from dedup import remove_near_duplicates
+        with tracing.span('near_dedup', cat='Analysis'), profiling.stage('Analysis', 'near_dedup'):
+            removed = remove_near_duplicates(results)
+        for (_, source_name, _), _, _ in removed:
+            METRICS.inc('scraper_reviews_near_duplicates_total', source=source_name)
+        if removed:
+            print(f"[INFO] Removed {len(removed)} near-duplicate reviews")
     
     return results
 
 
-def save_results(results: dict, output_file: str) -> bool:
+def score_sentiment(results: dict, cache_path: Optional[str]) -> None:
     """
-    Save results to JSON file
+    Add a sentiment score to every review (see sentiment.py)
+    
+    Args:
+        results: Dictionary containing scraped reviews, modified in place
+        cache_path: Score cache database, or None to score without caching
+    """
+    from sentiment import add_sentiment
+    
+    started = time.perf_counter()
+    with tracing.span('sentiment', cat='Analysis'), profiling.stage('Analysis', 'sentiment'):
+        scored, cached = add_sentiment(results, cache_path)
+    METRICS.inc('scraper_sentiment_scored_total', scored)
+    METRICS.inc('scraper_sentiment_cache_hits_total', cached)
+    METRICS.inc('scraper_stage_seconds_total', time.perf_counter() - started, stage='sentiment')
+    print(f"[INFO] Scored sentiment of {scored} reviews ({cached} from cache)")
+
+
+def save_results(results: dict, output_file: str, fmt: str = 'json', compact: bool = False,
+                 normalized: bool = False) -> bool:
+    """
+    Save results to a JSON, CSV or Parquet file, with a summary sidecar next to it
+    (see summary.py), computed from results after the file is written
     
     Args:
         results: Dictionary containing scraped reviews
-        output_file: Path to output file
+        output_file: Path to output file; a .gz or .zst extension compresses JSON and CSV
+        fmt: Output format: json, or an exporter from exporters.EXPORTERS
+        compact: Write JSON without indentation
+        normalized: Write JSON in the normalized schema version 2 (see schema.py)
     
     Returns:
         True if successful, False otherwise
     """
+    started = time.perf_counter()
     try:
         output_dir = os.path.dirname(output_file)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with tracing.span('write', cat='Output', file=output_file), \
+                profiling.stage('Output', 'serialize'):
+            if fmt == 'json':
+                jsonio.dump(schema.normalize(results) if normalized else results, output_file, compact=compact)
+            else:
+                from exporters import get_exporter
+                get_exporter(fmt).export(results, output_file)
+            summary.summarize_results(results).write(output_file)
+        
+        for source_name, source_data in results['sources'].items():
+            METRICS.inc('scraper_reviews_output_total', len(source_data.get('reviews', [])), source=source_name)
+        METRICS.inc('scraper_stage_seconds_total', time.perf_counter() - started, stage='serialize')
         
         print(f"\n[SUCCESS] Results saved to {output_file}")
         return True
@@ -154,6 +336,37 @@ def save_results(results: dict, output_file: str) -> bool:
         return False
 
 
+def save_results_sqlite(results: dict, db_path: str, full_text: bool = False) -> bool:
+    """
+    Upsert results into a SQLite database (without a summary sidecar, see summary.py)
+    
+    Args:
+        results: Dictionary containing scraped reviews
+        db_path: Path to the database file
+        full_text: Create the full-text search index if the database has none
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    from storage import SQLiteStorage
+    
+    started = time.perf_counter()
+    try:
+        with tracing.span('write', cat='Output', file=db_path), \
+                profiling.stage('Output', 'serialize'), \
+                SQLiteStorage(db_path, full_text=full_text) as storage:
+            for source_name, source_data in results['sources'].items():
+                written = storage.upsert_reviews(results['company'], source_data.get('reviews', []))
+                METRICS.inc('scraper_reviews_output_total', written, source=source_name)
+        METRICS.inc('scraper_stage_seconds_total', time.perf_counter() - started, stage='serialize')
+        
+        print(f"\n[SUCCESS] Results saved to {db_path}")
+        return True
+    except Exception as e:
+        print(f"\n[ERROR] Failed to save results: {str(e)}")
+        return False
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
@@ -192,9 +405,160 @@ Examples:
         default='output/reviews.json',
         help='Output file path (default: output/reviews.json)'
     )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'csv', 'parquet'],
+        default='json',
+        help='Output file format (default: json). csv is written row by row; parquet '
+             'needs pandas and pyarrow. A .json --output gets the format\'s extension'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write JSON without indentation. Compression is chosen by the --output extension: '
+             '.gz (gzip) or .zst (zstd, needs the zstandard package)'
+    )
+    parser.add_argument(
+        '--normalize',
+        action='store_true',
+        help='Write JSON in the normalized schema (version 2): source and URL stored once per '
+             'source and reviewer names dictionary-encoded; schema.load_results() reads both'
+    )
+    parser.add_argument(
+        '--storage',
+        choices=['json', 'sqlite'],
+        default='json',
+        help='Where to store results: a JSON file (--output) or a SQLite database (--db) (default: json)'
+    )
+    parser.add_argument(
+        '--db',
+        default='output/reviews.db',
+        help='SQLite database used by --storage sqlite (default: output/reviews.db)'
+    )
+    parser.add_argument(
+        '--full-text',
+        action='store_true',
+        help='With --storage sqlite, also maintain a full-text index over review titles and '
+             'descriptions (search it with storage.py --search)'
+    )
+    parser.add_argument(
+        '--fields',
+        help=f"Comma-separated review fields to extract and output, e.g. date,rating for rating "
+             f"trends (default: all of {','.join(schema.REVIEW_KEYS)}); date is always included"
+    )
+    parser.add_argument(
+        '--near-dedup',
+        action='store_true',
+        help='Drop reviews whose description nearly matches an earlier review from any source '
+             '(MinHash/LSH; threshold in config.DEDUP_CONFIG)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Serve dates covered by earlier --cache runs from the result cache and only scrape '
+             'the rest, which is then added to the cache'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=CACHE_CONFIG['directory'],
+        help=f"Directory of the --cache result cache (default: {CACHE_CONFIG['directory']})"
+    )
+    parser.add_argument(
+        '--skip-seen',
+        action='store_true',
+        help='Skip reviews saved by earlier runs with --skip-seen, using a persistent Bloom filter '
+             'per company/source; saved reviews are added to it (rebuild with bloom.py --rebuild)'
+    )
+    parser.add_argument(
+        '--seen-dir',
+        default=BLOOM_CONFIG['directory'],
+        help=f"Directory of the --skip-seen filters (default: {BLOOM_CONFIG['directory']})"
+    )
+    parser.add_argument(
+        '--sentiment',
+        action='store_true',
+        help='Add a sentiment score in [-1, 1] to every review, computed offline with a bundled '
+             'lexicon in parallel processes'
+    )
+    parser.add_argument(
+        '--sentiment-cache',
+        default=SENTIMENT_CONFIG['cache_path'],
+        help='Database of scores keyed by review text hash, so unchanged reviews are not rescored '
+             f"(default: {SENTIMENT_CONFIG['cache_path']}; 'none' disables it)"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of sources to scrape concurrently (default: 1); requests per host '
+             'are additionally limited by the adaptive per-host concurrency controller'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help='Checkpoint file recording each job\'s progress (default: <output>.checkpoint); '
+             'removed once the results are saved'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue each company/source from its last checkpoint instead of starting over'
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Only estimate the requests, time and output size of the scrape, fetching just '
+             'the first review page of each source (see planner.py)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile each stage (CPU, wall time, peak memory) per source'
+    )
+    parser.add_argument(
+        '--profile-dir',
+        default='output/profile',
+        help='Directory for profiles written by --profile (default: output/profile)'
+    )
+    parser.add_argument(
+        '--trace',
+        help='Write a Chrome trace (Perfetto) JSON file of all spans to this path'
+    )
+    parser.add_argument(
+        '--metrics-output',
+        help='Write a JSON summary of run metrics to this file'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Serve metrics in Prometheus text format on this port while running'
+    )
+    parser.add_argument(
+        '--metrics-host',
+        default='127.0.0.1',
+        help='Address the --metrics-port endpoint listens on (default: 127.0.0.1, local only; '
+             '0.0.0.0 for all interfaces)'
+    )
+    parser.add_argument(
+        '--prometheus-file',
+        help='Periodically write metrics in Prometheus text format to this file'
+    )
     
     args = parser.parse_args()
     
+    exporter = None
+    if args.metrics_port is not None or args.prometheus_file:
+        try:
+            exporter = PrometheusExporter(METRICS, port=args.metrics_port, path=args.prometheus_file,
+                                          host=args.metrics_host).start()
+        except OSError as e:
+            print(f"[ERROR] Cannot serve metrics on {args.metrics_host}:{args.metrics_port}: {str(e)}")
+            return 1
+    
+    if args.profile:
+        profiling.enable(args.profile_dir)
+    if args.trace:
+        tracing.enable()
+    
     try:
         # Validate inputs
         company_name, start_date, end_date, source = validate_inputs(
@@ -203,14 +567,46 @@ Examples:
             args.end_date,
             args.source
         )
+        fields = validate_fields(args.fields)
+        if fields is not None:
+            if (args.near_dedup or args.sentiment) and 'description' not in fields:
+                raise ValueError("--near-dedup and --sentiment need 'description' in --fields")
+            if args.storage == 'sqlite' and not {'source', 'title', 'reviewer_name'} <= set(fields):
+                raise ValueError("--storage sqlite needs 'source', 'title' and 'reviewer_name' in --fields "
+                                 "(they identify reviews)")
+        
+        if args.storage == 'json':
+            jsonio.check_available(args.output)
+            if args.format != 'json':
+                from exporters import get_exporter
+                get_exporter(args.format).check_available()
         
         print(f"[START] Review Scraper")
         print(f"[INFO] Company: {company_name}")
         print(f"[INFO] Date Range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         print(f"[INFO] Source(s): {source.upper()}")
+        if fields is not None:
+            print(f"[INFO] Fields: {', '.join(fields)}")
+        
+        result_cache = None
+        if args.cache:
+            from cache import ResultCache
+            result_cache = ResultCache(args.cache_dir)
+        
+        if args.plan:
+            from planner import plan_scrape, print_plan
+            print_plan(plan_scrape([company_name], start_date, end_date, source, args.workers,
+                                   result_cache, fields))
+            return 0
         
         # Scrape reviews
-        results = scrape_reviews(company_name, start_date, end_date, source)
+        checkpoints = CheckpointStore(args.checkpoint or f"{args.output}.checkpoint", resume=args.resume)
+        seen_keys = {} if args.skip_seen else None
+        started = time.perf_counter()
+        results = scrape_reviews(company_name, start_date, end_date, source, args.workers, checkpoints,
+                                 args.near_dedup, args.seen_dir if args.skip_seen else None,
+                                 result_cache, fields, seen_keys)
+        METRICS.inc('scraper_stage_seconds_total', time.perf_counter() - started, stage='scrape')
         
         # Calculate total reviews
         total_reviews = sum(
@@ -220,24 +616,60 @@ Examples:
         
         print(f"\n[SUMMARY] Total reviews scraped: {total_reviews}")
         
+        if args.sentiment:
+            score_sentiment(results, None if args.sentiment_cache == 'none' else args.sentiment_cache)
+        
         # Save results
-        success = save_results(results, args.output)
+        if args.storage == 'sqlite':
+            success = save_results_sqlite(results, args.db, args.full_text)
+        else:
+            output_file = args.output
+            if args.format != 'json':
+                root, compression = output_file, ''
+                for extension in jsonio.GZIP_EXTENSIONS + jsonio.ZSTD_EXTENSIONS:
+                    if root.endswith(extension):
+                        root, compression = root[:-len(extension)], extension
+                if root.endswith('.json'):
+                    output_file = f"{root[:-len('.json')]}.{args.format}{compression}"
+            success = save_results(results, output_file, args.format, args.compact, args.normalize)
+        
+        if success and args.skip_seen:
+            from bloom import mark_seen
+            print(f"[INFO] Marked {mark_seen(company_name, seen_keys, args.seen_dir)} new reviews as seen")
         
         if success:
+            if any('truncated_at_page' in src for src in results['sources'].values()):
+                print(f"[INFO] Some sources are truncated; rerun with --resume to continue them")
+            else:
+                checkpoints.remove()
             print(f"[DONE] Scraping completed successfully!")
             return 0
         else:
             return 1
     
-    except ValueError as e:
+    except (ValueError, ImportError) as e:
         print(f"[ERROR] {str(e)}")
         return 1
     except KeyboardInterrupt:
-        print("\n[CANCELLED] Scraping cancelled by user")
+        print("\n[CANCELLED] Scraping cancelled by user; rerun with --resume to continue")
         return 1
     except Exception as e:
         print(f"[ERROR] Unexpected error: {str(e)}")
         return 1
+    finally:
+        tracer = tracing.disable()
+        if tracer and tracer.write(args.trace):
+            print(f"[INFO] Trace saved to {args.trace}")
+        profiler = profiling.disable()
+        if profiler:
+            profiler.print_report()
+            summary_path = profiler.write()
+            if summary_path:
+                print(f"[INFO] Profile saved to {args.profile_dir} (summary: {summary_path})")
+        if exporter:
+            exporter.stop()
+        if args.metrics_output and METRICS.write_json(args.metrics_output):
+            print(f"[INFO] Metrics saved to {args.metrics_output}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,278 @@
+"""
+Structured run metrics for the Review Scraper
+Counters, gauges and histograms collected by the scrapers and main.py, exported as
+a JSON summary or in the Prometheus text exposition format
+"""
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Help text for the metrics emitted by the scrapers and main.py
+METRIC_HELP = {
+    'scraper_requests_total': 'HTTP requests issued, by host and status code',
+    'scraper_request_errors_total': 'HTTP requests that raised before a response was received',
+    'scraper_request_seconds': 'HTTP request latency in seconds',
+    'scraper_bytes_downloaded_total': 'Response body bytes downloaded',
+    'scraper_parse_seconds': 'Time spent parsing and extracting one review page',
+    'scraper_pages_total': 'Review pages parsed',
+    'scraper_reviews_extracted_total': 'Reviews extracted from review pages',
+    'scraper_reviews_filtered_total': 'Reviews dropped by the date range filter',
+    'scraper_reviews_deduplicated_total': 'Reviews dropped as duplicates',
+    'scraper_rate_limit_sleep_seconds_total': 'Time spent waiting for the host limiter before requests',
+    'scraper_jobs_total': 'Source scrape jobs, by outcome',
+    'scraper_reviews_output_total': 'Reviews written to the output',
+    'scraper_stage_seconds_total': 'Wall time spent in each run stage',
+    'scraper_host_concurrency_limit': 'Current adaptive limit on in-flight requests per host',
+    'scraper_host_concurrency_decreases_total': 'Times the per-host concurrency limit was cut',
+    'scraper_retries_total': 'Requests retried after a failure',
+    'scraper_retry_sleep_seconds_total': 'Time spent backing off before retries',
+    'scraper_circuit_opened_total': 'Times a host circuit breaker opened',
+    'scraper_jobs_truncated_total': 'Source jobs that stopped early because a page could not be fetched',
+    'scraper_reviews_near_duplicates_total': 'Reviews dropped as near-duplicates of an earlier review',
+    'scraper_cache_hits_total': 'Jobs answered entirely from the date-range result cache (--cache)',
+    'scraper_reviews_seen_total': 'Reviews skipped because an earlier run saved them (--skip-seen)',
+    'scraper_sentiment_scored_total': 'Reviews given a sentiment score',
+    'scraper_sentiment_cache_hits_total': 'Sentiment scores taken from the cache instead of recomputed',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _Histogram:
+    """Cumulative histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def cumulative(self):
+        """Yield (upper bound, cumulative count) pairs ending with +Inf"""
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            yield bound, running
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters, gauges and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to a counter"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge to value"""
+        key = _labels(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, buckets: tuple = LATENCY_BUCKETS, **labels):
+        """Record one observation in a histogram"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def get(self, name: str, **labels) -> float:
+        """Current value of a counter or gauge (0 if never recorded)"""
+        with self._lock:
+            series = self._counters.get(name) or self._gauges.get(name) or {}
+            return series.get(_labels(labels), 0)
+
+    def reset(self):
+        """Drop all collected metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def summary(self) -> dict:
+        """
+        Summarize all metrics as a JSON-serializable dictionary
+
+        Returns:
+            {'counters': {name: [{'labels': {...}, 'value': v}]},
+             'gauges': {name: [{'labels': {...}, 'value': v}]},
+             'histograms': {name: [{'labels': {...}, 'count': n, 'sum': s, 'mean': m, 'buckets': {...}}]}}
+        """
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+            gauges = {
+                name: [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._gauges.items())
+            }
+            histograms = {
+                name: [
+                    {
+                        'labels': dict(key),
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                        'buckets': {
+                            ('+Inf' if bound == float('inf') else str(bound)): count
+                            for bound, count in histogram.cumulative()
+                        },
+                    }
+                    for key, histogram in sorted(series.items())
+                ]
+                for name, series in sorted(self._histograms.items())
+            }
+        return {'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        def fmt_labels(key: Labels, extra: Optional[tuple] = None) -> str:
+            pairs = list(key) + ([extra] if extra else [])
+            if not pairs:
+                return ''
+            escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+            return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{fmt_labels(key)} {value}")
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} gauge")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{fmt_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    for bound, count in histogram.cumulative():
+                        le = '+Inf' if bound == float('inf') else str(bound)
+                        lines.append(f"{name}_bucket{fmt_labels(key, ('le', le))} {count}")
+                    lines.append(f"{name}_sum{fmt_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{fmt_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str) -> bool:
+        """Write the JSON summary to path"""
+        return self._write(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path: str) -> bool:
+        """Write the Prometheus text exposition to path, replacing it atomically"""
+        return self._write(path, self.to_prometheus())
+
+    def _write(self, path: str, text: str) -> bool:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to write metrics: {str(e)}")
+            return False
+
+
+class PrometheusExporter:
+    """
+    Exposes a registry for long-running runs, either over HTTP
+    (GET /metrics) or by rewriting a text file at a fixed interval
+
+    The HTTP endpoint only listens on the loopback interface unless another
+    host address (e.g. 0.0.0.0 for all interfaces) is given.
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: Optional[int] = None,
+                 path: Optional[str] = None, interval: float = 15.0, host: str = '127.0.0.1'):
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._httpd = None
+        self._threads = []
+
+    def start(self):
+        if self.port is not None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] not in ('/', '/metrics'):
+                        self.send_error(404)
+                        return
+                    body = registry.to_prometheus().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+            self._httpd.daemon_threads = True
+            self._threads.append(threading.Thread(target=self._httpd.serve_forever, daemon=True))
+
+        if self.path:
+            self._threads.append(threading.Thread(target=self._write_loop, daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self.registry.write_prometheus(self.path)
+
+    def stop(self):
+        self._stop.set()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        if self.path:
+            self.registry.write_prometheus(self.path)
+
+
+# Process-wide registry shared by all scrapers
+METRICS = MetricsRegistry()
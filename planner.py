@@ -0,0 +1,303 @@
+"""
+Dry-run planner
+Estimates what a scrape will cost before it runs: for every company/source
+job it resolves the review page (or takes the URL from the result cache),
+fetches only the first review page, and extrapolates the review rate seen on
+that page over the requested date range. The plan reports the pages and
+requests each job will issue, its duration with requests paced by the
+request delay and the adaptive host limit, the total wall time with the given number of parallel jobs, and the output
+size.
+
+Usage:
+    python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-12-31 --source all --plan
+    python planner.py --company Slack --company Asana --start-date 2023-01-01 --end-date 2023-12-31 --workers 3
+"""
+import argparse
+import heapq
+import math
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import jsonio
+from cache import ResultCache
+from config import CACHE_CONFIG, HOST_CONCURRENCY_CONFIG, SCRAPING_CONFIG
+from scrapers.registry import available_sources, get_scraper_class, resolve_sources, source_display_name
+
+
+def _sample_dates(reviews) -> List[datetime]:
+    dates = []
+    for review in reviews:
+        try:
+            dates.append(datetime.strptime(review.date, '%Y-%m-%d'))
+        except (TypeError, ValueError):
+            continue
+    return sorted(dates)
+
+
+def estimate_reviews(sample_dates: List[datetime], per_page: int, start: datetime,
+                     end: datetime, newest_first: bool = True) -> Dict:
+    """
+    Reviews in a date range and pages to reach them, extrapolated from the first page
+
+    Reviews are assumed to arrive at the rate seen on the first page. If the
+    source lists reviews newest first, that page holds the newest reviews and
+    those newer than the range must still be paged through before the range
+    is reached. Otherwise the first page says nothing about where the range
+    starts in the listing, so no newer reviews are counted.
+
+    Args:
+        sample_dates: Sorted dates of the reviews on the first page
+        per_page: Reviews per page
+        start: First date of the range
+        end: Last date of the range
+        newest_first: Whether the source sorts reviews newest first (BaseScraper.NEWEST_FIRST)
+
+    Returns:
+        {'per_day': reviews per day, 'newer': reviews before the range is reached,
+         'in_range': reviews in the range}
+    """
+    if not sample_dates or not per_page:
+        return {'per_day': 0.0, 'newer': 0, 'in_range': 0}
+    newest, oldest = sample_dates[-1], sample_dates[0]
+    per_day = len(sample_dates) / ((newest - oldest).days + 1)
+    newer_days = max(0, (newest - end).days) if newest_first else 0
+    range_days = max(0, (min(end, newest) - start).days + 1)
+    return {
+        'per_day': per_day,
+        'newer': int(round(per_day * newer_days)),
+        'in_range': int(round(per_day * range_days)),
+    }
+
+
+def paced_seconds(requests: int, latency: float, delay: float, host: str) -> float:
+    """
+    Duration of requests issued one after another to a host
+
+    The host's limiter starts requests delay / limit apart (see
+    scrapers.fetch.AdaptiveLimiter), and its limit grows from the configured
+    initial value while that pacing, not the latency, holds requests back.
+    """
+    settings = dict(HOST_CONCURRENCY_CONFIG['default'])
+    settings.update(HOST_CONCURRENCY_CONFIG.get('hosts', {}).get(host, {}))
+    if requests <= 0:
+        return 0.0
+    limit = float(settings['initial'])
+    seconds = latency
+    for _ in range(requests - 1):
+        gap = delay / max(limit, 1.0)
+        if gap > latency:
+            seconds += gap
+            limit = min(settings['maximum'], limit + 1.0 / limit)
+        else:
+            seconds += latency
+    return seconds
+
+
+def plan_source(company_name: str, start_date: datetime, end_date: datetime, source_key: str,
+                result_cache: Optional[ResultCache] = None, fields: Optional[List[str]] = None) -> Dict:
+    """
+    Plan one company/source job by resolving it and sampling its first page
+
+    Args:
+        company_name: Name of the company
+        start_date: Start date object
+        end_date: End date object
+        source_key: Source key (e.g. g2)
+        result_cache: Cache whose covered dates the job will not scrape, and whose
+            recorded URL saves resolving the company
+        fields: --fields projection the job will output (None for all)
+
+    Returns:
+        Plan dictionary with the estimated 'reviews', 'pages', 'requests', 'seconds'
+        and 'bytes' of the job, or an 'error'
+    """
+    source_name = source_display_name(source_key)
+    plan = {'company': company_name, 'source': source_name, 'reviews': 0, 'pages': 0,
+            'requests': 0, 'seconds': 0.0, 'bytes': 0}
+
+    scrape_start, scrape_end = start_date, end_date
+    company_url = None
+    if result_cache:
+        window = result_cache.missing_window(company_name, source_name, start_date, end_date)
+        if window is None:
+            plan['cached'] = True
+            return plan
+        if fields is None:
+            scrape_start, scrape_end = window
+        company_url = result_cache.company_url(company_name, source_name)
+    plan['window'] = [scrape_start.strftime('%Y-%m-%d'), scrape_end.strftime('%Y-%m-%d')]
+
+    # A range wide enough that the sample keeps every review on the page
+    scraper = get_scraper_class(source_key)(company_name, datetime.min, datetime.max)
+    try:
+        resolve_requests = 0
+        if company_url:
+            plan['url_cached'] = True
+        else:
+            company_url = scraper._find_company_url()
+            resolve_requests = scraper.requests_made
+            if not company_url:
+                plan['error'] = f"Could not find company '{company_name}' on {source_name}"
+                return plan
+        plan['url'] = company_url
+
+        response = scraper._fetch(scraper._page_url(company_url, 1))
+        response.raise_for_status()
+        sample = scraper._parse_page(response.content, company_url)
+    except Exception as e:
+        plan['error'] = str(e)
+        return plan
+    latency = scraper.request_seconds / max(1, scraper.requests_made)
+
+    estimate = estimate_reviews(_sample_dates(sample), len(sample), scrape_start, scrape_end,
+                                scraper.NEWEST_FIRST)
+    per_page = len(sample)
+    max_reviews = scraper.max_reviews
+    reviews = min(estimate['in_range'], max_reviews)
+    if per_page:
+        pages = math.ceil((estimate['newer'] + reviews) / per_page)
+        # Pagination ends on a page older than the range (or empty) unless the review limit stops it first;
+        # unsorted sources are paged to the end of the listing, so their pages are a lower bound
+        if reviews < max_reviews:
+            pages += 1
+    else:
+        pages = 1
+    pages = max(1, pages)
+
+    sample_bytes = len(jsonio.dumps([review.to_dict(fields) for review in sample])) if sample else 0
+    plan.update({
+        'per_page': per_page,
+        'per_day': round(estimate['per_day'], 3),
+        'reviews': reviews,
+        'limited': estimate['in_range'] > max_reviews,
+        'unsorted': not scraper.NEWEST_FIRST,
+        'pages': pages,
+        'requests': resolve_requests + pages,
+        'latency': round(latency, 3),
+        'seconds': round(paced_seconds(resolve_requests + pages, latency, scraper.request_delay,
+                                       urlsplit(company_url).netloc), 1),
+        'bytes': int(reviews * sample_bytes / per_page) if per_page else 0,
+    })
+    return plan
+
+
+def wall_time(job_seconds: List[float], workers: int) -> float:
+    """Duration of jobs run on `workers` parallel slots, longest jobs first"""
+    slots = [0.0] * max(1, workers)
+    for seconds in sorted(job_seconds, reverse=True):
+        heapq.heapreplace(slots, slots[0] + seconds)
+    return max(slots)
+
+
+def plan_scrape(companies: List[str], start_date: datetime, end_date: datetime, source: str,
+                workers: int = 1, result_cache: Optional[ResultCache] = None,
+                fields: Optional[List[str]] = None) -> Dict:
+    """
+    Plan the jobs of every company and source
+
+    Returns:
+        {'jobs': [plan_source plans], 'requests', 'reviews', 'bytes', 'seconds' (the
+         wall time with `workers` parallel jobs), 'hosts': {host: requests}}
+    """
+    jobs = []
+    for company_name in companies:
+        for source_key in resolve_sources(source):
+            print(f"[INFO] Sampling {source_display_name(source_key)} for '{company_name}'...", file=sys.stderr)
+            jobs.append(plan_source(company_name, start_date, end_date, source_key, result_cache, fields))
+
+    hosts = {}
+    for job in jobs:
+        if job.get('url'):
+            host = urlsplit(job['url']).netloc
+            hosts[host] = hosts.get(host, 0) + job['requests']
+    return {
+        'jobs': jobs,
+        'workers': workers,
+        'requests': sum(job['requests'] for job in jobs),
+        'reviews': sum(job['reviews'] for job in jobs),
+        'bytes': sum(job['bytes'] for job in jobs),
+        'seconds': round(wall_time([job['seconds'] for job in jobs], workers), 1),
+        'hosts': hosts,
+    }
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _size(count: int) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if count < 1024 or unit == 'GB':
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+def print_plan(plan: Dict) -> None:
+    """Print a plan as a table with totals"""
+    print("\n" + "=" * 78)
+    print("SCRAPE PLAN (estimated from the first review page of each job)")
+    print("=" * 78)
+    print(f"{'Company':<20} {'Source':<12} {'Reviews':>8} {'Pages':>6} {'Requests':>9} {'Time':>10} {'Size':>10}")
+    print("-" * 78)
+    for job in plan['jobs']:
+        name = f"{job['company'][:20]:<20} {job['source'][:12]:<12}"
+        if job.get('error'):
+            print(f"{name} [ERROR] {job['error']}")
+            continue
+        if job.get('cached'):
+            print(f"{name} {0:>8} {0:>6} {0:>9} {'cached':>10} {'-':>10}")
+            continue
+        reviews = f"{job['reviews']}{'+' if job.get('limited') else ''}"
+        pages = f"{job['pages']}{'*' if job.get('unsorted') else ''}"
+        print(f"{name} {reviews:>8} {pages:>6} {job['requests']:>9} "
+              f"{_duration(job['seconds']):>10} {_size(job['bytes']):>10}")
+    print("-" * 78)
+    print(f"Total: {plan['reviews']} reviews, {plan['requests']} requests, {_size(plan['bytes'])} of JSON")
+    print(f"Wall time with {plan['workers']} parallel job(s): {_duration(plan['seconds'])} "
+          f"(request delay {SCRAPING_CONFIG['request_delay']}s, divided by each host's adaptive limit)")
+    for host, count in sorted(plan['hosts'].items()):
+        print(f"  {host}: {count} requests")
+    if any(job.get('limited') for job in plan['jobs']):
+        print(f"+ capped at max_reviews_per_source ({SCRAPING_CONFIG['max_reviews_per_source']})")
+    if any(job.get('unsorted') for job in plan['jobs']):
+        print("* at least: the source does not sort reviews newest first, so every page is fetched")
+    print("=" * 78 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate the requests, time and output size of a scrape')
+    parser.add_argument('--company', action='append', required=True, help='Company name (repeat for several)')
+    parser.add_argument('--start-date', required=True, help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', required=True, help='End date (YYYY-MM-DD)')
+    parser.add_argument('--source', default='all',
+                        help=f"Source to plan: {', '.join(available_sources())} or all (default: all)")
+    parser.add_argument('--workers', type=int, default=1, help='Jobs run in parallel (default: 1)')
+    parser.add_argument('--cache', action='store_true', help='Leave out dates covered by the result cache')
+    parser.add_argument('--cache-dir', default=CACHE_CONFIG['directory'],
+                        help=f"Result cache directory (default: {CACHE_CONFIG['directory']})")
+    parser.add_argument('--output', help='Also write the plan as JSON to this file')
+    args = parser.parse_args()
+
+    from main import validate_inputs
+    try:
+        inputs = [validate_inputs(company, args.start_date, args.end_date, args.source) for company in args.company]
+    except ValueError as e:
+        print(f"[ERROR] {str(e)}")
+        return 1
+    _, start_date, end_date, source = inputs[0]
+
+    plan = plan_scrape([company for company, *_ in inputs], start_date, end_date, source, args.workers,
+                       ResultCache(args.cache_dir) if args.cache else None)
+    print_plan(plan)
+    if args.output:
+        jsonio.dump(plan, args.output)
+        print(f"[SUCCESS] Plan saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Per-stage profiling for the Review Scraper
+Records cProfile statistics, wall/CPU time and tracemalloc peak memory for
+each stage of each source (resolve, fetch, parse, extract, filter, serialize)
+
+cProfile and pstats are only imported once profiling is enabled.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Tuple
+
+
+STAGES = ['resolve', 'fetch', 'parse', 'extract', 'filter', 'serialize']
+
+# Which kind of bottleneck a dominant stage points to
+STAGE_BOUNDS = {
+    'resolve': 'network-bound',
+    'fetch': 'network-bound',
+    'parse': 'parser-bound',
+    'extract': 'parser-bound',
+    'filter': 'parser-bound',
+    'serialize': 'serialization-bound',
+}
+
+
+class _Frame:
+    """A stage that is currently running on one thread"""
+
+    def __init__(self, key: Tuple[str, str], profile):
+        self.key = key
+        self.profile = profile
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.memory_start = tracemalloc.get_traced_memory()[0]
+        self.peak = self.memory_start
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+
+class StageProfiler:
+    """
+    Collects a CPU profile and resource usage per (source, stage)
+
+    Stages may nest (resolving a company URL issues a request); time is
+    attributed exclusively to the innermost stage, like cProfile's tottime.
+    Peak memory is the highest traced allocation level seen while the stage
+    was active, relative to when it started. tracemalloc only tracks one
+    process-wide peak, so once stages of two threads overlap (--workers > 1)
+    peaks can no longer be told apart and are reported as unavailable.
+    cProfile is stopped at that point too: from Python 3.12 only one profiler
+    can be active per process. Wall and CPU times stay per stage.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: Dict[Tuple[str, str, int], object] = {}
+        self._totals: Dict[Tuple[str, str], dict] = {}
+        self._started_tracemalloc = False
+        self._threads_in_stages = 0
+        # Cleared for good once stages of two threads overlap
+        self.memory_peaks = True
+        self.cpu_profiles = True
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _profile_for(self, key: Tuple[str, str]):
+        # cProfile only observes the thread that enabled it, so keep one per thread
+        import cProfile
+        thread_key = key + (threading.get_ident(),)
+        with self._lock:
+            profile = self._profiles.get(thread_key)
+            if profile is None:
+                profile = self._profiles[thread_key] = cProfile.Profile()
+        return profile
+
+    @contextmanager
+    def stage(self, source: str, stage: str):
+        stack = self._local.__dict__.setdefault('stack', [])
+        if not stack:
+            with self._lock:
+                self._threads_in_stages += 1
+                if self._threads_in_stages > 1:
+                    self.memory_peaks = False
+                    self.cpu_profiles = False
+        else:
+            outer = stack[-1]
+            outer.profile.disable()
+            outer.peak = max(outer.peak, tracemalloc.get_traced_memory()[1])
+
+        frame = _Frame((source, stage), self._profile_for((source, stage)))
+        stack.append(frame)
+        if self.memory_peaks:
+            tracemalloc.reset_peak()
+        self._enable(frame.profile)
+        try:
+            yield
+        finally:
+            frame.profile.disable()
+            stack.pop()
+            peak = tracemalloc.get_traced_memory()[1]
+            wall = time.perf_counter() - frame.wall_start
+            cpu = time.thread_time() - frame.cpu_start
+
+            with self._lock:
+                totals = self._totals.setdefault(frame.key, {
+                    'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_memory_bytes': 0
+                })
+                totals['calls'] += 1
+                totals['wall_seconds'] += wall - frame.child_wall
+                totals['cpu_seconds'] += cpu - frame.child_cpu
+                totals['peak_memory_bytes'] = max(
+                    totals['peak_memory_bytes'], max(frame.peak, peak) - frame.memory_start
+                )
+
+            if stack:
+                outer = stack[-1]
+                outer.child_wall += wall
+                outer.child_cpu += cpu
+                outer.peak = max(outer.peak, peak)
+                self._enable(outer.profile)
+            else:
+                with self._lock:
+                    self._threads_in_stages -= 1
+
+    def _enable(self, profile):
+        if not self.cpu_profiles:
+            return
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: another thread's profiler is active
+            self.cpu_profiles = False
+
+    def summary(self) -> dict:
+        """
+        Per-source, per-stage totals
+
+        Returns:
+            {source: {'stages': {stage: {...}}, 'dominant_stage': str, 'bound': str}};
+            'peak_memory_bytes' is None if stages of several threads overlapped
+        """
+        with self._lock:
+            totals = {key: dict(value) for key, value in self._totals.items()}
+        if not self.memory_peaks:
+            for values in totals.values():
+                values['peak_memory_bytes'] = None
+
+        report = {}
+        for (source, stage), values in sorted(totals.items()):
+            report.setdefault(source, {'stages': {}})['stages'][stage] = values
+        for source_report in report.values():
+            dominant = max(source_report['stages'].items(), key=lambda item: item[1]['wall_seconds'])[0]
+            source_report['dominant_stage'] = dominant
+            source_report['bound'] = STAGE_BOUNDS.get(dominant, 'unknown')
+        return report
+
+    def write(self) -> Optional[str]:
+        """
+        Write one pstats file per source and stage plus summary.json; the pstats
+        files are left out if stages of several threads overlapped
+
+        Returns:
+            Path of the summary file, or None if writing failed
+        """
+        import pstats
+
+        try:
+            with self._lock:
+                # Profiles of overlapping stages are incomplete
+                profiles = dict(self._profiles) if self.cpu_profiles else {}
+
+            merged: Dict[Tuple[str, str], pstats.Stats] = {}
+            for (source, stage, _), profile in profiles.items():
+                try:
+                    if (source, stage) in merged:
+                        merged[(source, stage)].add(profile)
+                    else:
+                        merged[(source, stage)] = pstats.Stats(profile)
+                except TypeError:
+                    # A profile that never recorded a call has no stats to merge
+                    continue
+
+            for (source, stage), stats in merged.items():
+                source_dir = os.path.join(self.output_dir, source.lower())
+                os.makedirs(source_dir, exist_ok=True)
+                stats.dump_stats(os.path.join(source_dir, f"{stage}.prof"))
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            summary_path = os.path.join(self.output_dir, 'summary.json')
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, indent=2)
+            return summary_path
+        except Exception as e:
+            print(f"[ERROR] Failed to write profile: {str(e)}")
+            return None
+
+    def print_report(self):
+        """Print a per-source stage breakdown"""
+        print("\n" + "=" * 72)
+        print("PROFILE")
+        print("=" * 72)
+        for source, source_report in self.summary().items():
+            print(f"{source}: {source_report['bound']} (dominant stage: {source_report['dominant_stage']})")
+            for stage in STAGES:
+                values = source_report['stages'].get(stage)
+                if values:
+                    peak = values['peak_memory_bytes']
+                    peak = f"{peak / 1024:10.1f} KiB" if peak is not None else f"{'n/a':>14}"
+                    print(f"  {stage:10} calls={values['calls']:5}  wall={values['wall_seconds']:8.3f}s  "
+                          f"cpu={values['cpu_seconds']:8.3f}s  peak_mem={peak}")
+        if not self.memory_peaks:
+            print("Peak memory and cProfile files are not available while sources run in parallel; "
+                  "profile with --workers 1 for them")
+        print("=" * 72 + "\n")
+
+
+_active: Optional[StageProfiler] = None
+
+
+def enable(output_dir: str) -> StageProfiler:
+    """Start profiling all subsequent stages"""
+    global _active
+    _active = StageProfiler(output_dir).start()
+    return _active
+
+
+def disable() -> Optional[StageProfiler]:
+    """Stop profiling and return the profiler that was active"""
+    global _active
+    profiler, _active = _active, None
+    if profiler:
+        profiler.stop()
+    return profiler
+
+
+def stage(source: str, name: str):
+    """Context manager around one stage; a no-op unless profiling is enabled"""
+    if _active is None:
+        return nullcontext()
+    return _active.stage(source, name)
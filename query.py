@@ -0,0 +1,208 @@
+"""
+Streaming queries over output files
+Filters reviews by company, source, date, rating and text while streaming one
+or many results/NDJSON files, and keeps only the best k matches in a bounded
+heap, so memory stays O(k) however large the files are. Files are scanned in
+parallel processes with --workers.
+
+Usage:
+    python query.py output/*.json --top 10                       # highest rated
+    python query.py output/*.json --top 10 --lowest --source G2  # lowest rated on G2
+    python query.py output/*.json.gz --sort recent --contains pricing --min-rating 4
+    python query.py output/*.ndjson --contains "mobile app" --count --workers 4
+"""
+import argparse
+import heapq
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import jsonstream
+
+
+SORT_KEYS = ['rating', 'recent']
+
+
+class ReviewFilter:
+    """
+    Predicates on a review; all given conditions must hold
+
+    Args:
+        company: Company name (case-insensitive)
+        source: Source name (case-insensitive)
+        start_date: Earliest review date (YYYY-MM-DD, inclusive)
+        end_date: Latest review date (YYYY-MM-DD, inclusive)
+        min_rating: Lowest rating to include
+        max_rating: Highest rating to include
+        contains: Terms that must all appear in the title or description (case-insensitive)
+    """
+
+    def __init__(self, company: Optional[str] = None, source: Optional[str] = None,
+                 start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 min_rating: Optional[float] = None, max_rating: Optional[float] = None,
+                 contains: Optional[List[str]] = None):
+        self.company = company.lower() if company else None
+        self.source = source.lower() if source else None
+        self.start_date = start_date
+        self.end_date = end_date
+        self.min_rating = min_rating
+        self.max_rating = max_rating
+        self.contains = [term.lower() for term in contains or []]
+
+    def matches(self, company: Optional[str], review: Dict, source: Optional[str] = None) -> bool:
+        """
+        Args:
+            company: Company the review belongs to
+            review: Review dictionary
+            source: Name of the source block holding the review; the review's own
+                'source' is used if not given
+        """
+        # Cheap comparisons first, text search last
+        if self.company and (company or '').lower() != self.company:
+            return False
+        if self.source and (source if source is not None else review.get('source') or '').lower() != self.source:
+            return False
+        date = review.get('date') or ''
+        # Dates are YYYY-MM-DD, so string order is date order
+        if self.start_date and date < self.start_date:
+            return False
+        if self.end_date and (not date or date > self.end_date):
+            return False
+        rating = review.get('rating')
+        if self.min_rating is not None and (rating is None or rating < self.min_rating):
+            return False
+        if self.max_rating is not None and (rating is None or rating > self.max_rating):
+            return False
+        if self.contains:
+            title = (review.get('title') or '').lower()
+            description = (review.get('description') or '').lower()
+            for term in self.contains:
+                if term not in title and term not in description:
+                    return False
+        return True
+
+
+def sort_key(review: Dict, sort: str = 'rating', lowest: bool = False) -> Optional[Tuple]:
+    """
+    Key under which larger is better
+
+    Returns:
+        (rating, date) for 'rating' (rating negated if lowest), (date, rating) for
+        'recent', or None if the review has no value to sort by
+    """
+    rating = review.get('rating')
+    date = review.get('date') or ''
+    if sort == 'recent':
+        return (date, rating if rating is not None else float('-inf')) if date else None
+    if rating is None:
+        return None
+    return (-rating if lowest else rating, date)
+
+
+def scan_file(json_file: str, review_filter: ReviewFilter, k: Optional[int], sort: str = 'rating',
+              lowest: bool = False) -> Tuple[int, List]:
+    """
+    Stream one file and keep its best k matches
+
+    Args:
+        json_file: Results or NDJSON file (either schema version, optionally compressed)
+        review_filter: Predicates to apply
+        k: Number of matches to keep (None to only count)
+        sort: 'rating' or 'recent'
+        lowest: With 'rating', keep the lowest rated instead of the highest
+
+    Returns:
+        (number of matches, [(key, tiebreak, review)]) with the best match first
+    """
+    matched = 0
+    heap = []
+    for position, (company, source, review) in enumerate(jsonstream.source_reviews(json_file)):
+        if not review_filter.matches(company, review, source):
+            continue
+        matched += 1
+        if not k:
+            continue
+        key = sort_key(review, sort, lowest)
+        if key is None:
+            continue
+        # Earlier reviews win ties; the tiebreak also keeps dicts out of comparisons
+        entry = (key, -position, review if 'company' in review else dict(review, company=company))
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return matched, sorted(heap, key=lambda entry: entry[:2], reverse=True)
+
+
+def run_query(json_files: List[str], review_filter: ReviewFilter, k: Optional[int] = 10,
+              sort: str = 'rating', lowest: bool = False, workers: int = 1) -> Tuple[int, List[Dict]]:
+    """
+    Query many files, in parallel processes if workers > 1
+
+    Returns:
+        (number of matches across all files, best k reviews with their 'company')
+    """
+    scan = partial(scan_file, review_filter=review_filter, k=k, sort=sort, lowest=lowest)
+    if workers > 1 and len(json_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(scan, json_files))
+    else:
+        results = [scan(json_file) for json_file in json_files]
+
+    matched = sum(count for count, _ in results)
+    # Earlier files win ties, like earlier reviews within a file
+    candidates = [(key, -index, tiebreak, review)
+                  for index, (_, entries) in enumerate(results)
+                  for key, tiebreak, review in entries]
+    best = heapq.nlargest(k or 0, candidates, key=lambda entry: entry[:3])
+    return matched, [review for *_, review in best]
+
+
+def _date(value: str) -> str:
+    datetime.strptime(value, '%Y-%m-%d')
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Filter and rank reviews across output files')
+    parser.add_argument('files', nargs='+', help='Results JSON or NDJSON files (optionally .gz/.zst)')
+    parser.add_argument('--company', help='Company name')
+    parser.add_argument('--source', help='Source name, e.g. G2')
+    parser.add_argument('--start-date', type=_date, help='Earliest review date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=_date, help='Latest review date (YYYY-MM-DD)')
+    parser.add_argument('--min-rating', type=float, help='Lowest rating to include')
+    parser.add_argument('--max-rating', type=float, help='Highest rating to include')
+    parser.add_argument('--contains', action='append', metavar='TEXT',
+                        help='Text the title or description must contain (repeat for several terms)')
+    parser.add_argument('--sort', choices=SORT_KEYS, default='rating',
+                        help='Rank by rating (ties: most recent) or by date (default: rating)')
+    parser.add_argument('--lowest', action='store_true', help='With --sort rating, lowest rated first')
+    parser.add_argument('--top', type=int, default=10, help='Number of reviews to print (default: 10)')
+    parser.add_argument('--count', action='store_true', help='Print only the number of matching reviews')
+    parser.add_argument('--workers', type=int, default=1, help='Files to scan in parallel (default: 1)')
+    args = parser.parse_args()
+
+    review_filter = ReviewFilter(args.company, args.source, args.start_date, args.end_date,
+                                 args.min_rating, args.max_rating, args.contains)
+    try:
+        matched, best = run_query(args.files, review_filter, None if args.count else args.top,
+                                  args.sort, args.lowest, args.workers)
+    except Exception as e:
+        print(f"[ERROR] Query failed: {str(e)}")
+        return 1
+
+    if args.count:
+        print(matched)
+        return 0
+    # One JSON object per line, so the output can be piped
+    for review in best:
+        sys.stdout.write(json.dumps(review, ensure_ascii=False) + '\n')
+    print(f"[INFO] {matched} matching reviews", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,14 @@ Sample Data Generator for Testing
 Generates realistic sample review data for demonstration purposes
 """
 import json
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import random
+from config import SOURCE_CONFIG
 
 
 def generate_sample_reviews():
@@ -80,6 +86,334 @@ def generate_sample_reviews():
     return companies
 
 
+def render_review_page(source: str, reviews: list) -> str:
+    """
+    Render reviews as an HTML page using the markup each scraper expects
+    
+    Args:
+        source: Source key (g2, capterra or trustpilot)
+        reviews: List of review dictionaries
+    
+    Returns:
+        HTML document as a string
+    """
+    cards = []
+    for i, review in enumerate(reviews):
+        title = html.escape(review['title'])
+        description = html.escape(review['description'])
+        reviewer = html.escape(review['reviewer_name'])
+        date = html.escape(review['date'])
+        rating = review['rating']
+        
+        if source == 'g2':
+            cards.append(
+                f'<div data-test="review-card"><h3>{title}</h3>'
+                f'<div data-test="reviewer-name">{reviewer}</div>'
+                f'<time>{date}</time>'
+                f'<span data-test="star-rating">{rating}/5</span>'
+                f'<p data-test="review-body">{description}</p></div>'
+            )
+        elif source == 'capterra':
+            cards.append(
+                f'<div data-test="ReviewCard"><h3>{title}</h3>'
+                f'<span data-test="reviewer_name">{reviewer}</span>'
+                f'<span data-test="review_date">{date}</span>'
+                f'<span data-test="star_rating">{int(rating)} out of 5</span>'
+                f'<p>Pros</p><p>{description}</p></div>'
+            )
+        elif source == 'trustpilot':
+            cards.append(
+                f'<article data-review-id="{i}">'
+                f'<span class="styles_reviewerName">{reviewer}</span>'
+                f'<span class="styles_rating">Rated {int(rating)} out of 5</span>'
+                f'<span class="styles_reviewDate">{date}</span>'
+                f'<h2 class="styles_reviewTitle">{title}</h2>'
+                f'<p class="styles_reviewBody">{description}</p></article>'
+            )
+        else:
+            raise ValueError(f"Unknown source: {source}")
+    
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Reviews</title></head>'
+        '<body><main>' + ''.join(cards) + '</main></body></html>'
+    )
+
+
+# Vocabulary for synthetic reviews
+_FIRST_NAMES = [
+    "John", "Sarah", "Mike", "Emily", "Robert", "Jennifer", "David", "Laura", "James", "Maria",
+    "Daniel", "Anna", "Chris", "Sophie", "Kevin", "Priya", "Ahmed", "Yuki", "Carlos", "Olivia",
+]
+_LAST_NAMES = [
+    "Smith", "Johnson", "Davis", "Brown", "Wilson", "Lee", "Martinez", "Garcia", "Miller", "Taylor",
+    "Anderson", "Thomas", "Moore", "Clark", "Lewis", "Walker", "Young", "King", "Wright", "Scott",
+]
+_TITLE_OPENERS = [
+    "Great", "Solid", "Reliable", "Powerful", "Decent", "Frustrating", "Excellent", "Mixed feelings about",
+    "Not bad", "Disappointing", "Essential", "Overpriced", "Intuitive", "Clunky", "Outstanding",
+]
+_TITLE_SUBJECTS = [
+    "tool for teams", "project management", "communication platform", "integration options",
+    "customer support", "value for money", "onboarding experience", "mobile app", "reporting features",
+    "automation", "collaboration", "user interface", "pricing", "performance", "workflow",
+]
+_WORDS = (
+    "the team uses it every day and the interface is clean simple fast slow buggy reliable "
+    "support responded quickly pricing is high but worth it integration with our tools works well "
+    "onboarding took some time learning curve steep features are powerful flexible limited "
+    "notifications can be noisy search works great mobile app needs improvement dashboards reports "
+    "automation saves hours each week collaboration across departments improved productivity "
+    "we switched from another vendor migration was smooth painful documentation is clear lacking "
+    "customer success manager helpful security compliance admin controls permissions templates "
+    "recommend highly overall experience positive negative updates frequent stable crashes rarely"
+).split()
+
+
+def _slugify(name: str) -> str:
+    """Lowercase, hyphen-separated form of a company name for file and URL paths"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'company'
+
+
+def generate_synthetic_reviews(company: str, source: str, count: int, start_date: datetime,
+                               end_date: datetime, rating_weights=(5, 5, 10, 35, 45),
+                               min_words: int = 20, max_words: int = 80,
+                               anonymous_ratio: float = 0.1, seed: int = 0):
+    """
+    Generate realistic synthetic reviews for one company and source
+    
+    The stream is seeded from (seed, company, source) so it is reproducible
+    regardless of how generation is split across processes.
+    
+    Args:
+        company: Company name
+        source: Source key (g2, capterra or trustpilot)
+        count: Number of reviews to generate
+        start_date: Earliest review date
+        end_date: Latest review date
+        rating_weights: Relative weights of 1 to 5 star ratings
+        min_words: Minimum number of words in a description
+        max_words: Maximum number of words in a description
+        anonymous_ratio: Fraction of reviews without a reviewer name
+        seed: Base random seed
+    
+    Yields:
+        Review dictionaries in the output format, newest first
+    """
+    rng = random.Random(f"{seed}:{company}:{source}")
+    source_name = SOURCE_CONFIG[source]['name']
+    url = f"{SOURCE_CONFIG[source]['url']}/products/{_slugify(company)}/reviews"
+    
+    span = max((end_date - start_date).days, 0)
+    dates = [(start_date + timedelta(days=day)).strftime('%Y-%m-%d') for day in range(span + 1)]
+    titles = [f"{opener} {subject}" for opener in _TITLE_OPENERS for subject in _TITLE_SUBJECTS]
+    names = ["Anonymous"] + [f"{first} {last}" for first in _FIRST_NAMES for last in _LAST_NAMES]
+    name_weights = [anonymous_ratio] + [(1 - anonymous_ratio) / (len(names) - 1)] * (len(names) - 1)
+    ratings = [1.0, 2.0, 3.0, 4.0, 5.0]
+    
+    # Descriptions are slices of one long pre-drawn word sequence; drawing every
+    # word separately is what makes naive generators too slow for large corpora
+    pool_words = rng.choices(_WORDS, k=max(100000, max_words * 10))
+    pool_text = ' '.join(pool_words)
+    word_starts = [0]
+    for word in pool_words:
+        word_starts.append(word_starts[-1] + len(word) + 1)
+    max_offset = len(pool_words) - max_words
+    length_range = max_words - min_words + 1
+    rand = rng.random
+    
+    # Draw all dates up front and sort them so pages come out newest first, like the live sites
+    day_indexes = sorted((rng.randrange(span + 1) for _ in range(count)), reverse=True)
+    
+    chunk_size = 10000
+    for chunk_start in range(0, count, chunk_size):
+        k = min(chunk_size, count - chunk_start)
+        chunk_titles = rng.choices(titles, k=k)
+        chunk_ratings = rng.choices(ratings, rating_weights, k=k)
+        chunk_names = rng.choices(names, name_weights, k=k)
+        offsets = [int(rand() * max_offset) for _ in range(k)]
+        lengths = [min_words + int(rand() * length_range) for _ in range(k)]
+        
+        for i in range(k):
+            offset = offsets[i]
+            text = pool_text[word_starts[offset]:word_starts[offset + lengths[i]] - 1]
+            yield {
+                'title': chunk_titles[i],
+                'description': text[:1].upper() + text[1:] + '.',
+                'date': dates[day_indexes[chunk_start + i]],
+                'rating': chunk_ratings[i],
+                'reviewer_name': chunk_names[i],
+                'source': source_name,
+                'url': url
+            }
+
+
+def _write_company_corpus(job: dict) -> tuple:
+    """Write the synthetic corpus of one company and return (reviews, bytes) written"""
+    company = job['company']
+    output_dir = job['output_dir']
+    fmt = job['format']
+    sources = job['sources']
+    per_source = job['per_source']
+    slug = _slugify(company)
+    batch_size = 10000
+    written = 0
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    
+    def reviews_for(source):
+        return generate_synthetic_reviews(
+            company, source, per_source[source], job['start_date'], job['end_date'],
+            rating_weights=job['rating_weights'], min_words=job['min_words'],
+            max_words=job['max_words'], seed=job['seed']
+        )
+    
+    if fmt == 'html':
+        paths = []
+        for source in sources:
+            source_dir = os.path.join(output_dir, 'html', source, slug)
+            os.makedirs(source_dir, exist_ok=True)
+            page, batch = 1, []
+            for review in reviews_for(source):
+                batch.append(review)
+                if len(batch) == job['page_size']:
+                    paths.append(os.path.join(source_dir, f"page-{page:05d}.html"))
+                    with open(paths[-1], 'w', encoding='utf-8') as f:
+                        f.write(render_review_page(source, batch))
+                    page, batch = page + 1, []
+            if batch:
+                paths.append(os.path.join(source_dir, f"page-{page:05d}.html"))
+                with open(paths[-1], 'w', encoding='utf-8') as f:
+                    f.write(render_review_page(source, batch))
+            written += per_source[source]
+        return written, sum(os.path.getsize(path) for path in paths)
+    
+    path = os.path.join(output_dir, f"{slug}.{fmt}")
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        if fmt == 'ndjson':
+            for source in sources:
+                batch = []
+                for review in reviews_for(source):
+                    review['company'] = company
+                    batch.append(encode(review))
+                    if len(batch) == batch_size:
+                        f.write('\n'.join(batch) + '\n')
+                        batch = []
+                if batch:
+                    f.write('\n'.join(batch) + '\n')
+                written += per_source[source]
+        else:
+            header = {
+                'company': company,
+                'start_date': job['start_date'].strftime('%Y-%m-%d'),
+                'end_date': job['end_date'].strftime('%Y-%m-%d'),
+            }
+            f.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "sources": {')
+            for i, source in enumerate(sources):
+                name = SOURCE_CONFIG[source]['name']
+                f.write(f'{"," if i else ""}\n"{name}": {{"total_reviews": {per_source[source]}, "reviews": [')
+                first = True
+                batch = []
+                for review in reviews_for(source):
+                    batch.append(encode(review))
+                    if len(batch) == batch_size:
+                        f.write(('\n' if first else ',\n') + ',\n'.join(batch))
+                        first, batch = False, []
+                if batch:
+                    f.write(('\n' if first else ',\n') + ',\n'.join(batch))
+                f.write('\n]}')
+                written += per_source[source]
+            f.write('\n}}\n')
+    return written, os.path.getsize(path)
+
+
+def generate_corpus(output_dir: str, total_reviews: int, companies: list = None,
+                    sources: list = None, start_date: datetime = datetime(2020, 1, 1),
+                    end_date: datetime = datetime(2023, 12, 31), rating_weights=(5, 5, 10, 35, 45),
+                    min_words: int = 20, max_words: int = 80, fmt: str = 'ndjson',
+                    page_size: int = 25, seed: int = 0, workers: int = None) -> dict:
+    """
+    Generate a large synthetic review corpus for load testing
+    
+    Reviews are split evenly across companies and sources. Each company is
+    written to its own file (or HTML directory) by a separate worker process.
+    
+    Args:
+        output_dir: Directory to write the corpus to
+        total_reviews: Total number of reviews to generate
+        companies: Company names (default: Company1..Company10)
+        sources: Source keys (default: all configured sources)
+        start_date: Earliest review date
+        end_date: Latest review date
+        rating_weights: Relative weights of 1 to 5 star ratings
+        min_words: Minimum number of words in a description
+        max_words: Maximum number of words in a description
+        fmt: Output format: json, ndjson or html
+        page_size: Reviews per rendered HTML page
+        seed: Random seed
+        workers: Number of worker processes (default: CPU count)
+    
+    Returns:
+        Dictionary with the number of reviews and bytes written and the elapsed time
+    
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    if fmt not in ('json', 'ndjson', 'html'):
+        raise ValueError("Format must be one of: json, ndjson, html")
+    if start_date > end_date:
+        raise ValueError("Start date must be before end date")
+    if total_reviews < 0:
+        raise ValueError("Number of reviews cannot be negative")
+    if not 1 <= min_words <= max_words:
+        raise ValueError("Word counts must satisfy 1 <= min_words <= max_words")
+    if len(rating_weights) != 5 or min(rating_weights) < 0 or not sum(rating_weights):
+        raise ValueError("Rating weights must be 5 non-negative numbers, not all zero")
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+    
+    companies = companies or [f"Company{i}" for i in range(1, 11)]
+    sources = sources or list(SOURCE_CONFIG)
+    unknown = [source for source in sources if source not in SOURCE_CONFIG]
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(unknown)}. Sources must be among: {', '.join(SOURCE_CONFIG)}")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    jobs = []
+    slots = len(companies) * len(sources)
+    for c, company in enumerate(companies):
+        per_source = {}
+        for s, source in enumerate(sources):
+            slot = c * len(sources) + s
+            per_source[source] = total_reviews // slots + (1 if slot < total_reviews % slots else 0)
+        jobs.append({
+            'company': company,
+            'sources': sources,
+            'per_source': per_source,
+            'output_dir': output_dir,
+            'format': fmt,
+            'start_date': start_date,
+            'end_date': end_date,
+            'rating_weights': tuple(rating_weights),
+            'min_words': min_words,
+            'max_words': max_words,
+            'page_size': page_size,
+            'seed': seed,
+        })
+    
+    started = time.perf_counter()
+    if workers == 1 or len(jobs) == 1:
+        outcomes = [_write_company_corpus(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_write_company_corpus, jobs))
+    elapsed = time.perf_counter() - started
+    
+    return {
+        'reviews': sum(reviews for reviews, _ in outcomes),
+        'bytes': sum(size for _, size in outcomes),
+        'seconds': elapsed,
+    }
+
+
 def create_sample_output():
     """Create a sample JSON output file"""
     sample_data = {
@@ -146,15 +480,80 @@ def create_sample_output():
 
 
 if __name__ == "__main__":
-    import os
-    
-    # Create sample output directory
-    os.makedirs("output", exist_ok=True)
+    import argparse
     
-    # Generate and save sample data
-    sample_output = create_sample_output()
+    parser = argparse.ArgumentParser(description="Generate sample or large synthetic review data")
+    parser.add_argument('--generate', action='store_true', help='Generate a large synthetic corpus')
+    parser.add_argument('--reviews', type=int, default=1000000, help='Total number of reviews (default: 1000000)')
+    parser.add_argument('--companies', type=str, help='Comma-separated company names (default: Company1..Company10)')
+    parser.add_argument('--sources', type=str, help='Comma-separated sources (default: all)')
+    parser.add_argument('--start-date', default='2020-01-01', help='Earliest review date (default: 2020-01-01)')
+    parser.add_argument('--end-date', default='2023-12-31', help='Latest review date (default: 2023-12-31)')
+    parser.add_argument('--rating-weights', default='5,5,10,35,45',
+                        help='Relative weights of 1-5 star ratings (default: 5,5,10,35,45)')
+    parser.add_argument('--min-words', type=int, default=20, help='Minimum words per description (default: 20)')
+    parser.add_argument('--max-words', type=int, default=80, help='Maximum words per description (default: 80)')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'html'], default='ndjson',
+                        help='Output format (default: ndjson)')
+    parser.add_argument('--page-size', type=int, default=25, help='Reviews per HTML page (default: 25)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='output/corpus', help='Output directory (default: output/corpus)')
     
-    with open("output/sample_output.json", "w", encoding="utf-8") as f:
-        json.dump(sample_output, f, indent=2, ensure_ascii=False)
+    args = parser.parse_args()
     
-    print("Sample output generated: output/sample_output.json")
+    if args.generate:
+        sources = [s.strip().lower() for s in args.sources.split(',')] if args.sources else None
+        unknown = [source for source in sources or [] if source not in SOURCE_CONFIG]
+        if unknown:
+            parser.error(f"unknown source(s): {', '.join(unknown)} (choose from {', '.join(SOURCE_CONFIG)})")
+        if args.reviews < 0:
+            parser.error('--reviews cannot be negative')
+        if not 1 <= args.min_words <= args.max_words:
+            parser.error('--min-words and --max-words must satisfy 1 <= --min-words <= --max-words')
+        if args.page_size < 1:
+            parser.error('--page-size must be at least 1')
+        if args.workers is not None and args.workers < 1:
+            parser.error('--workers must be at least 1')
+        try:
+            start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
+            end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
+        except ValueError:
+            parser.error('--start-date and --end-date must be YYYY-MM-DD')
+        if start_date > end_date:
+            parser.error('--start-date must not be after --end-date')
+        try:
+            rating_weights = [float(w) for w in args.rating_weights.split(',')]
+        except ValueError:
+            rating_weights = []
+        if len(rating_weights) != 5 or min(rating_weights) < 0 or not sum(rating_weights):
+            parser.error('--rating-weights must be 5 comma-separated non-negative numbers, not all zero')
+        
+        stats = generate_corpus(
+            args.output_dir,
+            args.reviews,
+            companies=[c.strip() for c in args.companies.split(',')] if args.companies else None,
+            sources=sources,
+            start_date=start_date,
+            end_date=end_date,
+            rating_weights=rating_weights,
+            min_words=args.min_words,
+            max_words=args.max_words,
+            fmt=args.format,
+            page_size=args.page_size,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        print(f"Generated {stats['reviews']:,} reviews ({stats['bytes'] / 1e6:,.1f} MB) "
+              f"in {stats['seconds']:.1f}s into {args.output_dir}")
+    else:
+        # Create sample output directory
+        os.makedirs("output", exist_ok=True)
+        
+        # Generate and save sample data
+        sample_output = create_sample_output()
+        
+        with open("output/sample_output.json", "w", encoding="utf-8") as f:
+            json.dump(sample_output, f, indent=2, ensure_ascii=False)
+        
+        print("Sample output generated: output/sample_output.json")
@@ -0,0 +1,167 @@
+"""
+Output schema versions for the Review Scraper
+
+Version 1 (the default) repeats every field in every review:
+    {"company": ..., "start_date": ..., "end_date": ...,
+     "sources": {"G2": {"total_reviews": n, "reviews": [{"title", "description", "date",
+                                                          "rating", "reviewer_name", "source", "url"}]}}}
+
+Version 2 (normalized) hoists values that are constant within a source to the
+source block and dictionary-encodes reviewer names:
+    {"schema_version": 2, "company": ..., "start_date": ..., "end_date": ...,
+     "sources": {"G2": {"source": "G2", "url": "https://...",
+                        "dictionaries": {"reviewer_name": ["Anonymous", "Jane D."]},
+                        "total_reviews": n,
+                        "reviews": [{"title", "description", "date", "rating", "reviewer_name": 0}]}}}
+
+A review keeps its own "source" or "url" only where it differs from the
+block's value. load_results() returns version 1 for files of either version.
+"""
+from typing import Dict, List, Optional
+
+import jsonio
+
+
+SCHEMA_VERSION = 2
+
+# Review keys in the order Review.to_dict() produces them (Review.FIELDS); kept free of
+# scraper imports so main.py can validate --fields without loading the scrapers
+REVIEW_KEYS = ['title', 'description', 'date', 'rating', 'reviewer_name', 'source', 'url']
+
+# Per-review fields that are hoisted to the source block when constant
+HOISTED_FIELDS = ['source', 'url']
+
+# Low-cardinality per-review strings stored as indexes into a per-source list
+DICTIONARY_FIELDS = ['reviewer_name']
+
+
+def schema_version(results: Dict) -> int:
+    """Schema version of a results dictionary (1 if unmarked)"""
+    return results.get('schema_version', 1)
+
+
+def _most_common(values: List) -> Optional[str]:
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+
+def normalize(results: Dict) -> Dict:
+    """
+    Convert version 1 results to the normalized version 2 shape
+
+    Args:
+        results: Results dictionary as produced by main.scrape_reviews
+
+    Returns:
+        A new results dictionary; the input is not modified
+    """
+    if schema_version(results) == SCHEMA_VERSION:
+        return results
+
+    normalized = {'schema_version': SCHEMA_VERSION}
+    normalized.update((key, value) for key, value in results.items() if key != 'sources')
+    normalized['sources'] = {}
+
+    for source_name, source_data in results.get('sources', {}).items():
+        reviews = source_data.get('reviews', [])
+        block = {}
+        for field in HOISTED_FIELDS:
+            block[field] = _most_common([review.get(field) for review in reviews])
+        if block['source'] is None:
+            block['source'] = source_name
+
+        dictionaries = {field: [] for field in DICTIONARY_FIELDS}
+        indexes = {field: {} for field in DICTIONARY_FIELDS}
+        encoded_reviews = []
+        for review in reviews:
+            encoded = {}
+            for key, value in review.items():
+                if key in HOISTED_FIELDS and value == block[key]:
+                    continue
+                if key in indexes and value is not None:
+                    index = indexes[key].get(value)
+                    if index is None:
+                        index = indexes[key][value] = len(dictionaries[key])
+                        dictionaries[key].append(value)
+                    value = index
+                encoded[key] = value
+            encoded_reviews.append(encoded)
+
+        block['dictionaries'] = dictionaries
+        block['total_reviews'] = source_data.get('total_reviews', len(reviews))
+        block['reviews'] = encoded_reviews
+        # Anything else in the block (e.g. truncation details) is kept as is
+        block.update((key, value) for key, value in source_data.items() if key not in block)
+        normalized['sources'][source_name] = block
+
+    return normalized
+
+
+def denormalize_review(encoded: Dict, block: Dict, fields: Optional[List[str]] = None) -> Dict:
+    """
+    Rehydrate one version 2 review
+
+    Args:
+        encoded: Review as stored in the file
+        block: Its source block (only the hoisted fields and 'dictionaries' are used)
+        fields: The results' --fields projection (their top-level 'fields'); None for all
+
+    Returns:
+        Review with the REVIEW_KEYS of version 1 (only the projected ones, if any),
+        followed by any extra fields (e.g. 'sentiment') the review carries
+    """
+    dictionaries = block.get('dictionaries') or {}
+    review = {}
+    for key in REVIEW_KEYS if fields is None else [key for key in REVIEW_KEYS if key in fields]:
+        value = encoded.get(key, block.get(key) if key in HOISTED_FIELDS else None)
+        if key in dictionaries and isinstance(value, int):
+            value = dictionaries[key][value]
+        review[key] = value
+    for key, value in encoded.items():
+        if key not in review:
+            review[key] = value
+    return review
+
+
+def denormalize(results: Dict) -> Dict:
+    """
+    Rehydrate version 2 results into the version 1 shape
+
+    Args:
+        results: Results dictionary of either version
+
+    Returns:
+        Version 1 results (the input itself if it already is version 1)
+    """
+    if schema_version(results) == 1:
+        return results
+
+    rehydrated = {key: value for key, value in results.items() if key not in ('schema_version', 'sources')}
+    rehydrated['sources'] = {}
+
+    for source_name, block in results.get('sources', {}).items():
+        reviews = [denormalize_review(encoded, block, results.get('fields')) for encoded in block.get('reviews', [])]
+
+        source_data = {'total_reviews': block.get('total_reviews', len(reviews)), 'reviews': reviews}
+        source_data.update(
+            (key, value) for key, value in block.items()
+            if key not in HOISTED_FIELDS and key not in ('dictionaries', 'total_reviews', 'reviews')
+        )
+        rehydrated['sources'][source_name] = source_data
+
+    return rehydrated
+
+
+def load_results(path: str) -> Dict:
+    """
+    Read a results file of either schema version as version 1
+
+    Args:
+        path: Results JSON file (optionally .gz or .zst compressed)
+
+    Returns:
+        Version 1 results dictionary
+    """
+    return denormalize(jsonio.load(path))
@@ -1,10 +1,19 @@
 """
 Scrapers module for Review Scraper
+
+Scraper classes are imported lazily on first attribute access so that
+importing this package (e.g. for the source registry) does not pull in
+requests and BeautifulSoup.
 """
-from scrapers.base_scraper import BaseScraper, Review
-from scrapers.g2_scraper import G2Scraper
-from scrapers.capterra_scraper import CapterraScraper
-from scrapers.trustpilot_scraper import TrustpilotScraper
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'BaseScraper': 'scrapers.base_scraper',
+    'Review': 'scrapers.base_scraper',
+    'G2Scraper': 'scrapers.g2_scraper',
+    'CapterraScraper': 'scrapers.capterra_scraper',
+    'TrustpilotScraper': 'scrapers.trustpilot_scraper',
+}
 
 __all__ = [
     'BaseScraper',
@@ -13,3 +22,9 @@ __all__ = [
     'CapterraScraper',
     'TrustpilotScraper'
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module 'scrapers' has no attribute {name!r}")
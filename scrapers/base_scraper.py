@@ -2,13 +2,30 @@
 Base Scraper Class - Provides abstract interface for all scrapers
 """
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
-import json
+from typing import Callable, List, Dict, Optional
+from urllib.parse import urlsplit
+import hashlib
+import time
+import requests
+from bs4 import BeautifulSoup
+from config import BLOOM_CONFIG, SCRAPING_CONFIG, RETRY_CONFIG
+from metrics import METRICS, PARSE_BUCKETS
+import jsonio
+import profiling
+from schema import REVIEW_KEYS
+from bloom import BloomFilter, review_key
+import tracing
+from scrapers.fetch import backoff_delay, get_breaker, get_limiter, parse_retry_after
 
 
 class Review:
     """Data class representing a single review"""
+    
+    # Fields of a review in output order; --fields selects a subset
+    FIELDS = REVIEW_KEYS
+    
     def __init__(self, title: str, description: str, date: str, 
                  rating: Optional[float] = None, reviewer_name: Optional[str] = None,
                  source: Optional[str] = None, url: Optional[str] = None):
@@ -20,9 +37,9 @@ class Review:
         self.source = source
         self.url = url
 
-    def to_dict(self) -> Dict:
-        """Convert review to dictionary"""
-        return {
+    def to_dict(self, fields: Optional[List[str]] = None) -> Dict:
+        """Convert review to dictionary, with only the given fields if any"""
+        data = {
             'title': self.title,
             'description': self.description,
             'date': self.date,
@@ -31,11 +48,37 @@ class Review:
             'source': self.source,
             'url': self.url
         }
+        if fields is None:
+            return data
+        return {field: data[field] for field in self.FIELDS if field in fields}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Review':
+        """Create a review from a dictionary produced by to_dict"""
+        return cls(
+            title=data.get('title'),
+            description=data.get('description'),
+            date=data.get('date'),
+            rating=data.get('rating'),
+            reviewer_name=data.get('reviewer_name'),
+            source=data.get('source'),
+            url=data.get('url')
+        )
 
 
 class BaseScraper(ABC):
     """Abstract base class for all review scrapers"""
     
+    BASE_URL = ""
+    
+    # Fields extracted even when not projected, because the scraper needs them
+    # to recognize repeated reviews
+    KEY_FIELDS: tuple = ()
+    
+    # Whether _page_url requests reviews sorted newest first; only then does a
+    # page of reviews older than the range end pagination
+    NEWEST_FIRST: bool = False
+    
     def __init__(self, company_name: str, start_date: datetime, 
                  end_date: datetime, source_name: str):
         self.company_name = company_name
@@ -43,12 +86,327 @@ class BaseScraper(ABC):
         self.end_date = end_date
         self.source_name = source_name
         self.reviews: List[Review] = []
-        
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        self.request_delay = SCRAPING_CONFIG['request_delay']
+        self.request_timeout = SCRAPING_CONFIG['request_timeout']
+        self.max_reviews = SCRAPING_CONFIG['max_reviews_per_source']
+        self.retry_budget = RETRY_CONFIG['retry_budget']
+        # Set when pagination stops early because a page could not be fetched
+        self.truncated_at_page: Optional[int] = None
+        # Set when pagination reached the last review page, so no review in range was missed
+        self.complete = False
+        self.last_error: Optional[str] = None
+        # HTTP requests issued by this scraper (retries included) and their total latency
+        self.requests_made = 0
+        self.request_seconds = 0.0
+        # Called with the job's progress every few pages and when it finishes
+        self.checkpoint: Optional[Callable[[Dict], None]] = None
+        self.checkpoint_interval = SCRAPING_CONFIG['checkpoint_interval']
+        self._resume_state: Dict = {}
+        # Reviews saved by earlier runs (see bloom.py); checked before a Review is built
+        self.seen_filter: Optional[BloomFilter] = None
+        self.seen_skipped = 0
+        # Cards skipped because their date is before start_date / after end_date (see _in_range)
+        self.skipped_older = 0
+        self.skipped_newer = 0
+        # Fields to extract (see _wants); None extracts every field
+        self.fields: Optional[List[str]] = None
+    
     @abstractmethod
-    def scrape(self) -> List[Review]:
-        """Scrape reviews from the source. Must be implemented by subclasses."""
+    def _find_company_url(self) -> Optional[str]:
+        """Find the company's review page URL. Must be implemented by subclasses."""
+        pass
+    
+    @abstractmethod
+    def _page_url(self, company_url: str, page: int) -> str:
+        """Build the URL of a review page. Must be implemented by subclasses."""
+        pass
+    
+    @abstractmethod
+    def _extract_reviews(self, soup: BeautifulSoup, company_url: str) -> List[Review]:
+        """Extract reviews from a parsed review page. Must be implemented by subclasses."""
         pass
     
+    def scrape(self) -> List[Review]:
+        """Scrape reviews from the source"""
+        with tracing.span('scrape', cat=self.source_name, company=self.company_name) as span:
+            reviews = self._scrape()
+            span['reviews'] = len(reviews)
+        return reviews
+    
+    def resume(self, state: Dict):
+        """
+        Continue from a checkpoint instead of starting at page 1
+        
+        Args:
+            state: Progress passed to the checkpoint callback by an earlier run
+        """
+        self._resume_state = state
+        self._add_reviews([Review.from_dict(data) for data in state.get('reviews', [])])
+    
+    def _scrape(self) -> List[Review]:
+        """Resolve the company URL, paginate through review pages and filter by date"""
+        try:
+            company_url = self._resume_state.get('company_url')
+            last_page = self._resume_state.get('last_page', 0)
+            done = self._resume_state.get('done', False)
+            if company_url:
+                print(f"Resuming {self.source_name} after page {last_page} with {len(self.reviews)} reviews")
+            else:
+                with self._stage('resolve', company=self.company_name) as span:
+                    company_url = self._find_company_url()
+                    span['url'] = company_url
+                if not company_url:
+                    print(f"Could not find company '{self.company_name}' on {self.source_name}")
+                    return []
+                
+                print(f"Found company URL: {company_url}")
+            
+            page = last_page + 1
+            seen_pages = 0
+            previous_digest = None
+            while not done and len(self.reviews) < self.max_reviews:  # Limit to prevent excessive scraping
+                try:
+                    with self._stage('fetch', page=page) as span:
+                        response = self._fetch(self._page_url(company_url, page))
+                        span['status'] = response.status_code
+                    response.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    print(f"Error fetching page {page}: {str(e)}")
+                    print(f"[WARNING] {self.source_name} results are truncated at page {page}")
+                    self.truncated_at_page = page
+                    self.last_error = str(e)
+                    METRICS.inc('scraper_jobs_truncated_total', source=self.source_name)
+                    break
+                
+                # Some sites keep serving their last page for any later page number
+                digest = hashlib.sha1(response.content).digest()
+                if digest == previous_digest:
+                    print(f"Page {page} repeats page {page - 1}, stopping pagination")
+                    self.complete = True
+                    break
+                previous_digest = digest
+                
+                counts = (self.seen_skipped, self.skipped_older, self.skipped_newer)
+                reviews = self._parse_page(response.content, company_url)
+                seen, older, newer = (count - before for count, before in
+                                      zip((self.seen_skipped, self.skipped_older, self.skipped_newer), counts))
+                
+                if not reviews and not (seen or older or newer):
+                    print(f"No reviews found on page {page}")
+                    self.complete = True
+                    break
+                
+                added = self._add_reviews(reviews)
+                last_page = page
+                # Sorted newest first, no later page has a review in range
+                if self.NEWEST_FIRST and older and not (reviews or seen or newer):
+                    print(f"All reviews on page {page} are older than the start date, stopping pagination")
+                    self.complete = True
+                    break
+                # A page of only seen or newer reviews does not end pagination, since
+                # the date range may reach back past them
+                if not added and not (seen or older or newer):
+                    print("No new reviews found, stopping pagination")
+                    self.complete = True
+                    break
+                seen_pages = seen_pages + 1 if seen and not added else 0
+                if seen_pages >= BLOOM_CONFIG['max_seen_pages']:
+                    print(f"No unseen reviews on the last {seen_pages} pages, stopping pagination")
+                    break
+                
+                if page % self.checkpoint_interval == 0:
+                    self._checkpoint(company_url, last_page, done=False)
+                page += 1
+            
+            self.complete = self.complete or done
+            # A truncated job is resumed from the page that failed
+            self._checkpoint(company_url, last_page, done=self.truncated_at_page is None)
+            
+            # Filter by date range
+            collected = len(self.reviews)
+            with self._stage('filter'):
+                self.reviews = self.filter_by_date(self.reviews)
+            METRICS.inc('scraper_reviews_filtered_total', collected - len(self.reviews), source=self.source_name)
+            
+            return self.reviews
+        
+        except Exception as e:
+            print(f"Error in {self.source_name} scraper: {str(e)}")
+            return []
+    
+    def _checkpoint(self, company_url: str, last_page: int, done: bool):
+        """Report progress to the checkpoint callback, if any"""
+        if self.checkpoint:
+            self.checkpoint({
+                'company_url': company_url,
+                'last_page': last_page,
+                'done': done,
+                'reviews': [review.to_dict() for review in self.reviews]
+            })
+    
+    @contextmanager
+    def _stage(self, name: str, **args):
+        """
+        Mark one stage of this scraper's work for tracing and profiling
+        
+        Yields:
+            The trace span's args dictionary
+        """
+        with tracing.span(name, cat=self.source_name, **args) as span, \
+                profiling.stage(self.source_name, name):
+            yield span
+    
+    def _fetch(self, url: str, method: str = 'GET', **kwargs) -> requests.Response:
+        """
+        Issue an HTTP request, retrying connection errors and retryable statuses
+        
+        Retries back off exponentially with full jitter (honoring Retry-After)
+        and draw on this job's retry budget. Every attempt first passes the
+        host's circuit breaker, which pauses all jobs for a host that keeps
+        failing. Once retries are exhausted the last error is raised, or the
+        last response returned for the caller to check.
+        """
+        host = urlsplit(url).netloc
+        breaker = get_breaker(host)
+        attempt = 0
+        while True:
+            breaker.before_request()
+            try:
+                response = self._request(host, method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                breaker.record(False)
+                if not self._can_retry(attempt):
+                    raise
+                reason, delay = str(e), backoff_delay(attempt)
+            else:
+                if response.status_code not in RETRY_CONFIG['retry_statuses']:
+                    breaker.record(True)
+                    return response
+                breaker.record(False)
+                if not self._can_retry(attempt):
+                    return response
+                reason = f"HTTP {response.status_code}"
+                delay = backoff_delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+            
+            attempt += 1
+            self.retry_budget -= 1
+            print(f"[INFO] {reason} from {host}, retry {attempt} in {delay:.1f}s")
+            METRICS.inc('scraper_retries_total', host=host)
+            with tracing.span('retry_wait', cat=self.source_name, attempt=attempt, seconds=delay):
+                time.sleep(delay)
+            METRICS.inc('scraper_retry_sleep_seconds_total', delay, source=self.source_name)
+    
+    def _can_retry(self, attempt: int) -> bool:
+        return attempt + 1 < RETRY_CONFIG['max_attempts'] and self.retry_budget > 0
+    
+    def _request(self, host: str, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Issue one HTTP request and record its latency, status and size
+        
+        The request waits for a slot from the host's adaptive concurrency
+        limiter, which it then informs of the outcome. The limiter also paces
+        requests to the host, request_delay apart at a limit of 1 and closer
+        as the limit grows, in place of a fixed sleep between pages.
+        """
+        kwargs.setdefault('headers', self.headers)
+        kwargs.setdefault('timeout', self.request_timeout)
+        limiter = get_limiter(host)
+        
+        waiting = time.perf_counter()
+        with tracing.span('sleep', cat=self.source_name, host=host):
+            ticket = limiter.acquire(self.request_delay)
+        started = time.perf_counter()
+        METRICS.inc('scraper_rate_limit_sleep_seconds_total', started - waiting, source=self.source_name)
+        try:
+            response = requests.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            latency = time.perf_counter() - started
+            self.requests_made += 1
+            self.request_seconds += latency
+            limiter.release(ticket, latency, error=True)
+            METRICS.observe('scraper_request_seconds', latency, host=host)
+            METRICS.inc('scraper_request_errors_total', host=host)
+            raise
+        
+        latency = time.perf_counter() - started
+        self.requests_made += 1
+        self.request_seconds += latency
+        limiter.release(ticket, latency, response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+        METRICS.observe('scraper_request_seconds', latency, host=host)
+        METRICS.inc('scraper_requests_total', host=host, status=response.status_code)
+        METRICS.inc('scraper_bytes_downloaded_total', len(response.content), host=host)
+        return response
+    
+    def _parse_page(self, content: bytes, company_url: str) -> List[Review]:
+        """Parse the HTML of one review page into Review objects"""
+        started = time.perf_counter()
+        with self._stage('parse'):
+            soup = BeautifulSoup(content, 'html.parser')
+        with self._stage('extract') as span:
+            reviews = self._extract_reviews(soup, company_url)
+            span['reviews'] = len(reviews)
+        
+        METRICS.observe('scraper_parse_seconds', time.perf_counter() - started, PARSE_BUCKETS,
+                        source=self.source_name)
+        METRICS.inc('scraper_pages_total', source=self.source_name)
+        METRICS.inc('scraper_reviews_extracted_total', len(reviews), source=self.source_name)
+        return reviews
+    
+    def _in_range(self, date: str) -> bool:
+        """
+        Whether a review date (YYYY-MM-DD) lies within [start_date, end_date]
+        
+        Scrapers call this as soon as a card's date is extracted and skip the
+        rest of the card if it returns False. Skipped cards are counted, so
+        pagination stops at a page older than start_date. Dates that cannot be
+        parsed count as in range, as in filter_by_date.
+        """
+        try:
+            review_date = datetime.strptime(date, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return True
+        if review_date < self.start_date:
+            self.skipped_older += 1
+        elif review_date > self.end_date:
+            self.skipped_newer += 1
+        else:
+            return True
+        METRICS.inc('scraper_reviews_filtered_total', source=self.source_name)
+        return False
+    
+    def _wants(self, field: str) -> bool:
+        """
+        Whether _extract_reviews should extract a field
+        
+        Fields outside the projection are left as None without searching the
+        page for them. The date is always extracted, since reviews are filtered
+        by it, and so are the fields identifying reviews for the seen filter.
+        """
+        if self.fields is None or field in self.fields or field == 'date' or field in self.KEY_FIELDS:
+            return True
+        return self.seen_filter is not None and field in ('title', 'reviewer_name')
+    
+    def _is_seen(self, title: str, date: str, reviewer_name: Optional[str]) -> bool:
+        """
+        Whether an earlier run saved this review, according to the seen filter
+        
+        Scrapers call this with the extracted fields before building a Review,
+        and skip the review if it returns True.
+        """
+        if self.seen_filter is None or review_key(self.source_name, date, reviewer_name, title) not in self.seen_filter:
+            return False
+        self.seen_skipped += 1
+        METRICS.inc('scraper_reviews_seen_total', source=self.source_name)
+        return True
+    
+    def _add_reviews(self, reviews: List[Review]) -> int:
+        """Add a page of reviews to the results and return how many were new"""
+        self.reviews.extend(reviews)
+        return len(reviews)
+    
     def filter_by_date(self, reviews: List[Review]) -> List[Review]:
         """Filter reviews by date range"""
         filtered = []
@@ -62,8 +420,8 @@ class BaseScraper(ABC):
                 filtered.append(review)
         return filtered
     
-    def save_to_json(self, filename: str) -> bool:
-        """Save reviews to JSON file"""
+    def save_to_json(self, filename: str, compact: bool = False) -> bool:
+        """Save reviews to JSON file (compressed if filename ends in .gz or .zst)"""
         try:
             data = {
                 'company': self.company_name,
@@ -74,8 +432,7 @@ class BaseScraper(ABC):
                 'reviews': [review.to_dict() for review in self.reviews]
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            jsonio.dump(data, filename, compact=compact)
             
             return True
         except Exception as e:
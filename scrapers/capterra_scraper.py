@@ -1,11 +1,9 @@
 """
 Capterra Review Scraper
 """
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from typing import List
-import time
 import re
 from scrapers.base_scraper import BaseScraper, Review
 
@@ -15,17 +13,16 @@ class CapterraScraper(BaseScraper):
     
     BASE_URL = "https://www.capterra.com"
     
+    NEWEST_FIRST = True
+    
     def __init__(self, company_name: str, start_date: datetime, end_date: datetime):
         super().__init__(company_name, start_date, end_date, "Capterra")
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
     
     def _find_company_url(self) -> str:
         """Find the company URL on Capterra"""
         try:
             search_url = f"{self.BASE_URL}/search?q={self.company_name}"
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self._fetch(search_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -47,6 +44,10 @@ class CapterraScraper(BaseScraper):
             print(f"Error finding company URL on Capterra: {str(e)}")
             return None
     
+    def _page_url(self, company_url: str, page: int) -> str:
+        """Build the URL of a Capterra review page, sorted newest first"""
+        return f"{company_url}?reviews_filter_json=%5B%5D&sort_type=most_recent&page={page}#reviews"
+    
     def _parse_review_date(self, date_str: str) -> str:
         """Parse various date formats from Capterra"""
         try:
@@ -84,100 +85,68 @@ class CapterraScraper(BaseScraper):
             print(f"Error parsing date '{date_str}': {str(e)}")
             return date_str
     
-    def scrape(self) -> List[Review]:
-        """Scrape reviews from Capterra"""
-        try:
-            company_url = self._find_company_url()
-            if not company_url:
-                print(f"Could not find company '{self.company_name}' on Capterra")
-                return []
-            
-            print(f"Found company URL: {company_url}")
-            
-            page = 1
-            while len(self.reviews) < 100:
-                reviews_url = f"{company_url}#reviews"
-                if page > 1:
-                    reviews_url = f"{company_url}?reviews_filter_json=%5B%5D&sort_type=most_recent&page={page}#reviews"
+    def _extract_reviews(self, soup: BeautifulSoup, company_url: str) -> List[Review]:
+        """Extract reviews from a parsed Capterra review page"""
+        reviews = []
+        
+        # Find review containers
+        for element in soup.find_all('div', {'data-test': 'ReviewCard'}):
+            try:
+                # Extract the date first, so out-of-range cards are skipped
+                date_elem = element.find('span', {'data-test': 'review_date'})
+                date_str = date_elem.get_text(strip=True) if date_elem else datetime.now().strftime('%Y-%m-%d')
+                date = self._parse_review_date(date_str)
+                if not self._in_range(date):
+                    continue
                 
-                try:
-                    response = requests.get(reviews_url, headers=self.headers, timeout=10)
-                    response.raise_for_status()
-                except requests.exceptions.RequestException as e:
-                    print(f"Error fetching page {page}: {str(e)}")
-                    break
+                # Extract review title
+                title = description = rating = reviewer_name = None
+                if self._wants('title'):
+                    title_elem = element.find('h3')
+                    title = title_elem.get_text(strip=True) if title_elem else "No Title"
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # Extract review description
+                if self._wants('description'):
+                    description = ""
+                    for desc_elem in element.find_all('p'):
+                        text = desc_elem.get_text(strip=True)
+                        if text and len(text) > 10:
+                            description = text
+                            break
+                    if not description:
+                        description = "No Description"
                 
-                # Find review containers
-                review_elements = soup.find_all('div', {'data-test': 'ReviewCard'})
+                # Extract rating
+                rating_elem = element.find('span', {'data-test': 'star_rating'}) if self._wants('rating') else None
+                if rating_elem:
+                    try:
+                        rating_text = rating_elem.get_text(strip=True)
+                        rating = float(re.findall(r'\d+', rating_text)[0])
+                    except:
+                        pass
                 
-                if not review_elements:
-                    print(f"No reviews found on page {page}")
-                    break
+                # Extract reviewer name
+                if self._wants('reviewer_name'):
+                    reviewer_elem = element.find('span', {'data-test': 'reviewer_name'})
+                    reviewer_name = reviewer_elem.get_text(strip=True) if reviewer_elem else "Anonymous"
                 
-                for element in review_elements:
-                    try:
-                        # Extract review title
-                        title_elem = element.find('h3')
-                        title = title_elem.get_text(strip=True) if title_elem else "No Title"
-                        
-                        # Extract review description
-                        description_elems = element.find_all('p')
-                        description = ""
-                        for desc_elem in description_elems:
-                            text = desc_elem.get_text(strip=True)
-                            if text and len(text) > 10:
-                                description = text
-                                break
-                        if not description:
-                            description = "No Description"
-                        
-                        # Extract date
-                        date_elem = element.find('span', {'data-test': 'review_date'})
-                        date_str = date_elem.get_text(strip=True) if date_elem else datetime.now().strftime('%Y-%m-%d')
-                        date = self._parse_review_date(date_str)
-                        
-                        # Extract rating
-                        rating_elem = element.find('span', {'data-test': 'star_rating'})
-                        rating = None
-                        if rating_elem:
-                            try:
-                                rating_text = rating_elem.get_text(strip=True)
-                                rating = float(re.findall(r'\d+', rating_text)[0])
-                            except:
-                                pass
-                        
-                        # Extract reviewer name
-                        reviewer_elem = element.find('span', {'data-test': 'reviewer_name'})
-                        reviewer_name = reviewer_elem.get_text(strip=True) if reviewer_elem else "Anonymous"
-                        
-                        review = Review(
-                            title=title,
-                            description=description,
-                            date=date,
-                            rating=rating,
-                            reviewer_name=reviewer_name,
-                            source="Capterra",
-                            url=company_url
-                        )
-                        
-                        self.reviews.append(review)
-                    except Exception as e:
-                        print(f"Error parsing review element: {str(e)}")
-                        continue
+                if self._is_seen(title, date, reviewer_name):
+                    continue
                 
-                page += 1
-                time.sleep(2)
-            
-            # Filter by date range
-            self.reviews = self.filter_by_date(self.reviews)
-            
-            return self.reviews
+                reviews.append(Review(
+                    title=title,
+                    description=description,
+                    date=date,
+                    rating=rating,
+                    reviewer_name=reviewer_name,
+                    source="Capterra",
+                    url=company_url
+                ))
+            except Exception as e:
+                print(f"Error parsing review element: {str(e)}")
+                continue
         
-        except Exception as e:
-            print(f"Error in Capterra scraper: {str(e)}")
-            return []
+        return reviews
 
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+"""
+Fetch layer - Per-host adaptive concurrency, retry backoff and circuit
+breakers shared by all scrapers
+"""
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from config import HOST_CONCURRENCY_CONFIG, RETRY_CONFIG, CIRCUIT_BREAKER_CONFIG
+from metrics import METRICS
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds to wait
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP-date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before retry number attempt + 1, using exponential backoff with full jitter
+
+    Args:
+        attempt: Number of attempts already made minus one (0 for the first retry)
+        retry_after: Seconds the host asked us to wait, which is always honored
+
+    Returns:
+        Seconds to sleep
+    """
+    ceiling = min(RETRY_CONFIG['max_delay'], RETRY_CONFIG['base_delay'] * (2 ** attempt))
+    return max(random.uniform(0, ceiling), retry_after or 0.0)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on in-flight requests to one host, which also paces their starts
+
+    Request starts are spaced `interval / limit` apart, where the interval is
+    the scraper's request delay, so the limit sets the request rate of a job
+    that paginates one page at a time as well as the concurrency of parallel
+    jobs. The limit grows additively (by about one request per round of `limit`
+    healthy responses, and only while the limit is actually in use: requests
+    waited for a slot or for their start) while
+    latency stays near its baseline, and is cut multiplicatively on HTTP
+    429/503, connection errors or when the p95 latency of recent requests
+    rises past the baseline by `latency_tolerance`. Like TCP, the limit is
+    cut at most once per window: signals from requests that started before
+    the last cut describe the same congestion and are ignored. A Retry-After
+    header blocks new requests to the host until it expires.
+
+    The baseline follows p95 latencies within the tolerance, and is
+    re-learned from scratch after `rebaseline_after` consecutive windows cut
+    for latency alone, so a host that becomes permanently slower is not held
+    at the minimum forever.
+    """
+
+    def __init__(self, host: str, initial: float = 1, minimum: float = 1, maximum: float = 8,
+                 decrease_factor: float = 0.5, latency_window: int = 20,
+                 latency_tolerance: float = 2.0, rebaseline_after: int = 3):
+        self.host = host
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.rebaseline_after = rebaseline_after
+        self.in_flight = 0
+        self.baseline_p95: Optional[float] = None
+        self._latencies = deque(maxlen=latency_window)
+        self._latency_cuts = 0
+        self._blocked_until = 0.0
+        self._next_ticket = 0
+        self._window_start = 0
+        self._next_start = 0.0
+        self._limited_tickets = set()
+        self._cond = threading.Condition()
+
+    def acquire(self, interval: float = 0.0) -> int:
+        """
+        Block until a request to this host may start
+
+        Args:
+            interval: Seconds between request starts at a limit of 1; the next
+                request to the host starts interval / limit after this one
+
+        Returns:
+            Ticket to pass back to release()
+        """
+        with self._cond:
+            limited = False
+            while True:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                if self.in_flight >= max(int(self.limit), 1):
+                    limited = True
+                    self._cond.wait()
+                    continue
+                wait = self._next_start - now
+                if wait > 0:
+                    limited = True
+                    self._cond.wait(wait)
+                    continue
+                break
+            self.in_flight += 1
+            self._next_start = now + interval / max(self.limit, 1.0)
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            if limited:
+                self._limited_tickets.add(ticket)
+            return ticket
+
+    def release(self, ticket: int, latency: Optional[float] = None, status: Optional[int] = None,
+                retry_after: Optional[float] = None, error: bool = False):
+        """
+        Record the outcome of a request started with acquire()
+
+        Args:
+            ticket: Value returned by acquire()
+            latency: Request latency in seconds
+            status: HTTP status code, if a response was received
+            retry_after: Seconds the host asked us to wait, if any
+            error: True if the request failed without a response
+        """
+        with self._cond:
+            was_saturated = self.in_flight >= int(self.limit) or ticket in self._limited_tickets
+            self._limited_tickets.discard(ticket)
+            self.in_flight -= 1
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+            if error or status in (429, 503):
+                if self._decrease(ticket):
+                    self._latency_cuts = 0
+            elif latency is not None:
+                self._latencies.append(latency)
+                p95 = self.p95()
+                if self.baseline_p95 is None:
+                    if len(self._latencies) >= min(5, self._latencies.maxlen):
+                        self.baseline_p95 = p95
+                elif p95 > self.baseline_p95 * self.latency_tolerance:
+                    if self._decrease(ticket):
+                        self._latency_cuts += 1
+                        if self._latency_cuts >= self.rebaseline_after:
+                            # Latency stayed high at ever lower limits: the host is slower, not congested
+                            self.baseline_p95 = None
+                            self._latency_cuts = 0
+                else:
+                    # Let the baseline follow gradual changes within the tolerance
+                    self.baseline_p95 = 0.95 * self.baseline_p95 + 0.05 * p95
+                    self._latency_cuts = 0
+                    if was_saturated:
+                        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+            METRICS.set('scraper_host_concurrency_limit', self.limit, host=self.host)
+            self._cond.notify_all()
+
+    def _decrease(self, ticket: int) -> bool:
+        """Cut the limit unless it was already cut after the request started; returns whether it was cut"""
+        if ticket < self._window_start:
+            return False
+        self._window_start = self._next_ticket
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        self._latencies.clear()
+        METRICS.inc('scraper_host_concurrency_decreases_total', host=self.host)
+        return True
+
+    def p95(self) -> float:
+        """95th percentile of the recent latency window"""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class CircuitBreaker:
+    """
+    Pauses all requests to one host after repeated consecutive failures
+
+    closed: requests flow normally.
+    open: requests block until `reset_timeout` has passed since the host failed.
+    half-open: one trial request is let through; success closes the breaker,
+    failure opens it again. Other hosts are unaffected.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._cond = threading.Condition()
+
+    def before_request(self):
+        """Block while the host is paused"""
+        with self._cond:
+            while True:
+                if self.state == 'closed':
+                    return
+                if self.state == 'open':
+                    wait = self._opened_at + self.reset_timeout - time.monotonic()
+                    if wait > 0:
+                        self._cond.wait(wait)
+                        continue
+                    self.state = 'half-open'
+                if not self._trial_in_flight:
+                    self._trial_in_flight = True
+                    return
+                self._cond.wait()
+
+    def record(self, success: bool):
+        """Record whether a request to the host succeeded"""
+        with self._cond:
+            self._trial_in_flight = False
+            if success:
+                if self.state != 'closed':
+                    print(f"[INFO] Circuit closed for {self.host}")
+                self.state = 'closed'
+                self.failures = 0
+            else:
+                self.failures += 1
+                if self.state == 'half-open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+                    print(f"[WARNING] Circuit open for {self.host}: pausing requests for {self.reset_timeout:g}s")
+                    self.state = 'open'
+                    self._opened_at = time.monotonic()
+                    METRICS.inc('scraper_circuit_opened_total', host=self.host)
+            self._cond.notify_all()
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host: str) -> AdaptiveLimiter:
+    """Get the process-wide limiter for a host, creating it on first use"""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            settings = dict(HOST_CONCURRENCY_CONFIG['default'])
+            settings.update(HOST_CONCURRENCY_CONFIG.get('hosts', {}).get(host, {}))
+            limiter = _limiters[host] = AdaptiveLimiter(host, **settings)
+        return limiter
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a host, creating it on first use"""
+    with _limiters_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host, **CIRCUIT_BREAKER_CONFIG)
+        return breaker
+
+
+def reset_limiters():
+    """Forget all learned per-host limits and circuit breaker state"""
+    with _limiters_lock:
+        _limiters.clear()
+        _breakers.clear()
@@ -1,11 +1,9 @@
 """
 G2 Review Scraper
 """
-import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
-import time
 import re
 from scrapers.base_scraper import BaseScraper, Review
 
@@ -15,17 +13,16 @@ class G2Scraper(BaseScraper):
     
     BASE_URL = "https://www.g2.com"
     
+    NEWEST_FIRST = True
+    
     def __init__(self, company_name: str, start_date: datetime, end_date: datetime):
         super().__init__(company_name, start_date, end_date, "G2")
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
     
     def _find_company_url(self) -> str:
         """Find the company URL on G2"""
         try:
             search_url = f"{self.BASE_URL}/products?utf8=%E2%9C%93&search={self.company_name}"
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self._fetch(search_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -46,6 +43,10 @@ class G2Scraper(BaseScraper):
             print(f"Error finding company URL on G2: {str(e)}")
             return None
     
+    def _page_url(self, company_url: str, page: int) -> str:
+        """Build the URL of a G2 review page, sorted newest first"""
+        return f"{company_url}/reviews?order=most_recent&page={page}"
+    
     def _parse_review_date(self, date_str: str) -> str:
         """Parse various date formats from G2"""
         try:
@@ -79,88 +80,60 @@ class G2Scraper(BaseScraper):
             print(f"Error parsing date '{date_str}': {str(e)}")
             return date_str
     
-    def scrape(self) -> List[Review]:
-        """Scrape reviews from G2"""
-        try:
-            company_url = self._find_company_url()
-            if not company_url:
-                print(f"Could not find company '{self.company_name}' on G2")
-                return []
-            
-            print(f"Found company URL: {company_url}")
-            
-            page = 1
-            while len(self.reviews) < 100:  # Limit to prevent excessive scraping
-                reviews_url = f"{company_url}/reviews?page={page}"
+    def _extract_reviews(self, soup: BeautifulSoup, company_url: str) -> List[Review]:
+        """Extract reviews from a parsed G2 review page"""
+        reviews = []
+        
+        # Find all review containers
+        for element in soup.find_all('div', {'data-test': 'review-card'}):
+            try:
+                # Extract the date first, so out-of-range cards are skipped
+                date_elem = element.find('time')
+                date_str = date_elem.get_text(strip=True) if date_elem else datetime.now().strftime('%Y-%m-%d')
+                date = self._parse_review_date(date_str)
+                if not self._in_range(date):
+                    continue
                 
-                try:
-                    response = requests.get(reviews_url, headers=self.headers, timeout=10)
-                    response.raise_for_status()
-                except requests.exceptions.RequestException as e:
-                    print(f"Error fetching page {page}: {str(e)}")
-                    break
+                # Extract review information
+                title = description = rating = reviewer_name = None
+                if self._wants('title'):
+                    title_elem = element.find('h3')
+                    title = title_elem.get_text(strip=True) if title_elem else "No Title"
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                if self._wants('description'):
+                    description_elem = element.find('p', {'data-test': 'review-body'})
+                    description = description_elem.get_text(strip=True) if description_elem else "No Description"
                 
-                # Find all review containers
-                review_elements = soup.find_all('div', {'data-test': 'review-card'})
+                # Extract rating
+                rating_elem = element.find('span', {'data-test': 'star-rating'}) if self._wants('rating') else None
+                if rating_elem:
+                    try:
+                        rating = float(rating_elem.get_text(strip=True).split('/')[0])
+                    except:
+                        pass
                 
-                if not review_elements:
-                    print(f"No reviews found on page {page}")
-                    break
+                # Extract reviewer name
+                if self._wants('reviewer_name'):
+                    reviewer_elem = element.find('div', {'data-test': 'reviewer-name'})
+                    reviewer_name = reviewer_elem.get_text(strip=True) if reviewer_elem else "Anonymous"
                 
-                for element in review_elements:
-                    try:
-                        # Extract review information
-                        title_elem = element.find('h3')
-                        title = title_elem.get_text(strip=True) if title_elem else "No Title"
-                        
-                        description_elem = element.find('p', {'data-test': 'review-body'})
-                        description = description_elem.get_text(strip=True) if description_elem else "No Description"
-                        
-                        date_elem = element.find('time')
-                        date_str = date_elem.get_text(strip=True) if date_elem else datetime.now().strftime('%Y-%m-%d')
-                        date = self._parse_review_date(date_str)
-                        
-                        # Extract rating
-                        rating_elem = element.find('span', {'data-test': 'star-rating'})
-                        rating = None
-                        if rating_elem:
-                            try:
-                                rating = float(rating_elem.get_text(strip=True).split('/')[0])
-                            except:
-                                pass
-                        
-                        # Extract reviewer name
-                        reviewer_elem = element.find('div', {'data-test': 'reviewer-name'})
-                        reviewer_name = reviewer_elem.get_text(strip=True) if reviewer_elem else "Anonymous"
-                        
-                        review = Review(
-                            title=title,
-                            description=description,
-                            date=date,
-                            rating=rating,
-                            reviewer_name=reviewer_name,
-                            source="G2",
-                            url=company_url
-                        )
-                        
-                        self.reviews.append(review)
-                    except Exception as e:
-                        print(f"Error parsing review element: {str(e)}")
-                        continue
+                if self._is_seen(title, date, reviewer_name):
+                    continue
                 
-                page += 1
-                time.sleep(2)  # Be respectful to the server
-            
-            # Filter by date range
-            self.reviews = self.filter_by_date(self.reviews)
-            
-            return self.reviews
+                reviews.append(Review(
+                    title=title,
+                    description=description,
+                    date=date,
+                    rating=rating,
+                    reviewer_name=reviewer_name,
+                    source="G2",
+                    url=company_url
+                ))
+            except Exception as e:
+                print(f"Error parsing review element: {str(e)}")
+                continue
         
-        except Exception as e:
-            print(f"Error in G2 scraper: {str(e)}")
-            return []
+        return reviews
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+"""
+Source Registry - Maps source keys to scraper classes without importing them
+until a run actually selects the source
+"""
+import importlib
+from typing import Dict, List
+
+from config import SOURCE_CONFIG
+
+
+# Entry point group third-party packages use to register extra sources, e.g.
+#   [project.entry-points."review_scraper.sources"]
+#   yelp = "my_package.yelp_scraper:YelpScraper"
+ENTRY_POINT_GROUP = 'review_scraper.sources'
+
+_plugin_sources = None
+_loaded_classes = {}
+
+
+def _discover_plugins() -> Dict[str, dict]:
+    """Find sources registered through entry points (scanned once, on first need)"""
+    global _plugin_sources
+    if _plugin_sources is None:
+        _plugin_sources = {}
+        try:
+            from importlib.metadata import entry_points
+            try:
+                found = entry_points(group=ENTRY_POINT_GROUP)
+            except TypeError:
+                # Python < 3.10 returns a dict of groups
+                found = entry_points().get(ENTRY_POINT_GROUP, [])
+        except ImportError:
+            found = []
+
+        for entry_point in found:
+            key = entry_point.name.lower()
+            if key not in SOURCE_CONFIG:
+                _plugin_sources[key] = {
+                    'name': entry_point.name,
+                    'scraper': entry_point.value,
+                    'enabled': True,
+                    'description': f"Third-party source from {entry_point.value}"
+                }
+    return _plugin_sources
+
+
+def get_source_config(key: str) -> dict:
+    """
+    Get the configuration of a source
+
+    Raises:
+        KeyError: If no built-in or registered source has this key
+    """
+    key = key.lower()
+    if key in SOURCE_CONFIG:
+        return SOURCE_CONFIG[key]
+    return _discover_plugins()[key]
+
+
+def is_valid_source(key: str) -> bool:
+    """Check a source key without importing any scraper"""
+    key = key.lower()
+    return key == 'all' or key in SOURCE_CONFIG or key in _discover_plugins()
+
+
+def available_sources() -> List[str]:
+    """All enabled source keys, built-in first"""
+    keys = [key for key, config in SOURCE_CONFIG.items() if config.get('enabled', True)]
+    keys += [key for key in _discover_plugins() if key not in keys]
+    return keys
+
+
+def resolve_sources(source: str) -> List[str]:
+    """Expand a --source value ('all' or a single key) into source keys"""
+    source = source.lower()
+    return available_sources() if source == 'all' else [source]
+
+
+def source_display_name(key: str) -> str:
+    """Human-readable source name used as the results key"""
+    return get_source_config(key).get('name', key)
+
+
+def get_scraper_class(key: str):
+    """
+    Import and return the scraper class of a source
+
+    Raises:
+        KeyError: If the source is unknown
+        ImportError: If its scraper module or class cannot be imported
+    """
+    key = key.lower()
+    if key not in _loaded_classes:
+        target = get_source_config(key)['scraper']
+        module_name, _, class_name = target.partition(':')
+        module = importlib.import_module(module_name)
+        try:
+            _loaded_classes[key] = getattr(module, class_name)
+        except AttributeError:
+            raise ImportError(f"{module_name} has no scraper class {class_name}")
+    return _loaded_classes[key]
@@ -2,14 +2,13 @@
 Trustpilot Review Scraper (Third Source for SaaS Reviews)
 Trustpilot is a popular platform for collecting and displaying customer reviews
 """
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from typing import List
-import time
 import re
 import json
 from scrapers.base_scraper import BaseScraper, Review
+from metrics import METRICS
 
 
 class TrustpilotScraper(BaseScraper):
@@ -17,11 +16,14 @@ class TrustpilotScraper(BaseScraper):
     
     BASE_URL = "https://www.trustpilot.com"
     
+    # Cards without a title are skipped, and pages are deduplicated by (title, date)
+    KEY_FIELDS = ('title',)
+    
+    NEWEST_FIRST = True
+    
     def __init__(self, company_name: str, start_date: datetime, end_date: datetime):
         super().__init__(company_name, start_date, end_date, "Trustpilot")
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self._seen = set()
     
     def _find_company_url(self) -> str:
         """Find the company URL on Trustpilot"""
@@ -31,13 +33,13 @@ class TrustpilotScraper(BaseScraper):
             company_url = f"{self.BASE_URL}/review/{company_slug}"
             
             # Verify the URL exists
-            response = requests.head(company_url, headers=self.headers, timeout=10, allow_redirects=True)
+            response = self._fetch(company_url, method='HEAD', allow_redirects=True)
             if response.status_code == 200:
                 return response.url
             
             # If direct URL doesn't work, try search
             search_url = f"{self.BASE_URL}/search?query={self.company_name}"
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self._fetch(search_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -53,6 +55,12 @@ class TrustpilotScraper(BaseScraper):
             print(f"Error finding company URL on Trustpilot: {str(e)}")
             return None
     
+    def _page_url(self, company_url: str, page: int) -> str:
+        """Build the URL of a Trustpilot review page, sorted newest first"""
+        if page == 1:
+            return f"{company_url}?sort=recency"
+        return f"{company_url}?sort=recency&page={page}"
+    
     def _parse_review_date(self, date_str: str) -> str:
         """Parse various date formats from Trustpilot"""
         try:
@@ -93,110 +101,88 @@ class TrustpilotScraper(BaseScraper):
             print(f"Error parsing date '{date_str}': {str(e)}")
             return date_str
     
-    def scrape(self) -> List[Review]:
-        """Scrape reviews from Trustpilot"""
-        try:
-            company_url = self._find_company_url()
-            if not company_url:
-                print(f"Could not find company '{self.company_name}' on Trustpilot")
-                return []
-            
-            print(f"Found company URL: {company_url}")
-            
-            page = 1
-            while len(self.reviews) < 100:
-                if page == 1:
-                    reviews_url = company_url
-                else:
-                    reviews_url = f"{company_url}?page={page}"
-                
-                try:
-                    response = requests.get(reviews_url, headers=self.headers, timeout=10)
-                    response.raise_for_status()
-                except requests.exceptions.RequestException as e:
-                    print(f"Error fetching page {page}: {str(e)}")
-                    break
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find review containers - Trustpilot uses different class names
-                review_elements = soup.find_all('article', {'data-review-id': True})
+    def _extract_reviews(self, soup: BeautifulSoup, company_url: str) -> List[Review]:
+        """Extract reviews from a parsed Trustpilot review page"""
+        reviews = []
+        
+        # Find review containers - Trustpilot uses different class names
+        review_elements = soup.find_all('article', {'data-review-id': True})
+        
+        if not review_elements:
+            # Try alternative selector
+            review_elements = soup.find_all('div', {'class': re.compile(r'review', re.I)})
+        
+        for element in review_elements:
+            try:
+                # Extract review title
+                title_elem = element.find('h2', {'class': re.compile(r'reviewTitle', re.I)})
+                title = title_elem.get_text(strip=True) if title_elem else "No Title"
+                if title == "No Title":
+                    continue
                 
-                if not review_elements:
-                    # Try alternative selector
-                    review_elements = soup.find_all('div', {'class': re.compile(r'review', re.I)})
+                # Extract the date next, so out-of-range cards are skipped
+                date_elem = element.find('span', {'class': re.compile(r'reviewDate', re.I)})
+                if not date_elem:
+                    date_elem = element.find('time')
+                date_str = date_elem.get_text(strip=True) if date_elem else datetime.now().strftime('%Y-%m-%d')
+                date = self._parse_review_date(date_str)
+                if not self._in_range(date):
+                    continue
                 
-                if not review_elements:
-                    print(f"No reviews found on page {page}")
-                    break
+                # Extract review description
+                description = rating = reviewer_name = None
+                if self._wants('description'):
+                    description_elem = element.find('p', {'class': re.compile(r'reviewBody', re.I)})
+                    if not description_elem:
+                        description_elem = element.find('p')
+                    description = description_elem.get_text(strip=True) if description_elem else "No Description"
                 
-                found_new_reviews = False
-                for element in review_elements:
+                # Extract rating
+                rating_elem = element.find('span', {'class': re.compile(r'rating', re.I)}) if self._wants('rating') else None
+                if rating_elem:
                     try:
-                        # Extract review title
-                        title_elem = element.find('h2', {'class': re.compile(r'reviewTitle', re.I)})
-                        title = title_elem.get_text(strip=True) if title_elem else "No Title"
-                        
-                        # Extract review description
-                        description_elem = element.find('p', {'class': re.compile(r'reviewBody', re.I)})
-                        if not description_elem:
-                            description_elem = element.find('p')
-                        description = description_elem.get_text(strip=True) if description_elem else "No Description"
-                        
-                        # Extract date
-                        date_elem = element.find('span', {'class': re.compile(r'reviewDate', re.I)})
-                        if not date_elem:
-                            date_elem = element.find('time')
-                        date_str = date_elem.get_text(strip=True) if date_elem else datetime.now().strftime('%Y-%m-%d')
-                        date = self._parse_review_date(date_str)
-                        
-                        # Extract rating
-                        rating = None
-                        rating_elem = element.find('span', {'class': re.compile(r'rating', re.I)})
-                        if rating_elem:
-                            try:
-                                rating_text = rating_elem.get_text(strip=True)
-                                rating = float(re.findall(r'\d+', rating_text)[0])
-                            except:
-                                pass
-                        
-                        # Extract reviewer name
-                        reviewer_elem = element.find('span', {'class': re.compile(r'reviewer', re.I)})
-                        reviewer_name = reviewer_elem.get_text(strip=True) if reviewer_elem else "Anonymous"
-                        
-                        # Check if we already have this review
-                        existing = any(r.title == title and r.date == date for r in self.reviews)
-                        if not existing and title != "No Title":
-                            review = Review(
-                                title=title,
-                                description=description,
-                                date=date,
-                                rating=rating,
-                                reviewer_name=reviewer_name,
-                                source="Trustpilot",
-                                url=company_url
-                            )
-                            self.reviews.append(review)
-                            found_new_reviews = True
-                    except Exception as e:
-                        print(f"Error parsing review element: {str(e)}")
-                        continue
+                        rating_text = rating_elem.get_text(strip=True)
+                        rating = float(re.findall(r'\d+', rating_text)[0])
+                    except:
+                        pass
                 
-                if not found_new_reviews:
-                    print("No new reviews found, stopping pagination")
-                    break
+                # Extract reviewer name
+                if self._wants('reviewer_name'):
+                    reviewer_elem = element.find('span', {'class': re.compile(r'reviewer', re.I)})
+                    reviewer_name = reviewer_elem.get_text(strip=True) if reviewer_elem else "Anonymous"
                 
-                page += 1
-                time.sleep(2)
-            
-            # Filter by date range
-            self.reviews = self.filter_by_date(self.reviews)
-            
-            return self.reviews
+                if self._is_seen(title, date, reviewer_name):
+                    continue
+                
+                reviews.append(Review(
+                    title=title,
+                    description=description,
+                    date=date,
+                    rating=rating,
+                    reviewer_name=reviewer_name,
+                    source="Trustpilot",
+                    url=company_url
+                ))
+            except Exception as e:
+                print(f"Error parsing review element: {str(e)}")
+                continue
         
-        except Exception as e:
-            print(f"Error in Trustpilot scraper: {str(e)}")
-            return []
+        return reviews
+    
+    def _add_reviews(self, reviews: List[Review]) -> int:
+        """Add a page of reviews, skipping ones already seen on earlier pages"""
+        added = 0
+        for review in reviews:
+            # Check if we already have this review
+            key = (review.title, review.date)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.reviews.append(review)
+            added += 1
+        
+        METRICS.inc('scraper_reviews_deduplicated_total', len(reviews) - added, source=self.source_name)
+        return added
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""
+Sentiment scoring for scraped reviews
+Scores each review's title and description with a bundled lexicon (no
+downloads or network access), in batches spread over worker processes, and
+caches scores in SQLite keyed by a hash of the text so unchanged reviews are
+never rescored. Scores are compound values in [-1, 1] stored in each
+review's 'sentiment' field.
+
+Usage:
+    python main.py --company "Slack" --start-date 2023-01-01 --end-date 2023-12-31 --sentiment
+    python sentiment.py output/reviews.json            # add scores to an existing file
+"""
+import argparse
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import jsonio
+from config import SENTIMENT_CONFIG
+
+
+# Bump when the lexicon or the scoring rules change, so cached scores are recomputed
+LEXICON_VERSION = 1
+
+# Word valences from -4 (most negative) to 4 (most positive), tuned for software reviews
+LEXICON = {
+    # Positive
+    'amazing': 2.8, 'awesome': 3.1, 'best': 3.2, 'better': 1.9, 'brilliant': 2.8, 'clean': 1.5,
+    'comprehensive': 1.5, 'convenient': 1.6, 'cool': 1.3, 'easy': 1.9, 'effective': 2.1,
+    'efficient': 1.9, 'enjoy': 2.2, 'enjoyed': 2.3, 'excellent': 2.7, 'exceptional': 2.8,
+    'fantastic': 2.6, 'fast': 1.3, 'favorite': 2.0, 'flexible': 1.4, 'friendly': 2.2, 'fun': 2.3,
+    'game-changer': 2.6, 'glad': 2.0, 'good': 1.9, 'great': 3.1, 'happy': 2.7, 'helpful': 1.8,
+    'impressed': 2.1, 'impressive': 2.3, 'indispensable': 2.0, 'innovative': 1.9, 'intuitive': 2.0,
+    'like': 1.5, 'liked': 1.8, 'love': 3.2, 'loved': 2.9, 'loves': 2.7, 'nice': 1.8, 'perfect': 2.7,
+    'pleased': 2.0, 'polished': 1.6, 'powerful': 1.8, 'productive': 1.9, 'recommend': 1.8,
+    'recommended': 1.8, 'reliable': 1.9, 'responsive': 1.5, 'robust': 1.6, 'satisfied': 1.8,
+    'seamless': 2.1, 'seamlessly': 2.0, 'simple': 1.2, 'smooth': 1.6, 'solid': 1.6, 'stable': 1.4,
+    'superb': 3.1, 'support': 0.6, 'terrific': 2.9, 'thanks': 1.7, 'transformed': 1.5,
+    'useful': 1.9, 'valuable': 2.1, 'well': 1.1, 'wonderful': 2.7, 'worth': 1.5,
+    # Negative
+    'annoying': -1.9, 'awful': -3.0, 'bad': -2.5, 'broken': -2.2, 'buggy': -2.1, 'bugs': -1.6,
+    'clunky': -1.7, 'complicated': -1.3, 'confusing': -1.7, 'crash': -2.0, 'crashes': -2.0,
+    'difficult': -1.5, 'disappointed': -2.1, 'disappointing': -2.2, 'expensive': -1.2, 'fail': -2.3,
+    'failed': -2.3, 'fails': -2.2, 'frustrating': -2.1, 'glitches': -1.6, 'glitchy': -1.8, 'hard': -0.8,
+    'hate': -2.7, 'horrible': -2.5, 'issue': -0.8, 'issues': -1.0, 'lacking': -1.4, 'lacks': -1.3,
+    'lag': -1.4, 'laggy': -1.6, 'limited': -1.0, 'mediocre': -1.4, 'mess': -1.8, 'messy': -1.6,
+    'missing': -1.1, 'overpriced': -2.0, 'pain': -2.1, 'poor': -2.1, 'problem': -1.7,
+    'problems': -1.7, 'refund': -1.2, 'slow': -1.5, 'steep': -0.8, 'terrible': -2.9,
+    'unhelpful': -1.9, 'unreliable': -2.0, 'unresponsive': -1.8, 'unusable': -2.6, 'useless': -2.5,
+    'waste': -2.3, 'worse': -2.1, 'worst': -3.1, 'wrong': -2.1,
+}
+
+NEGATIONS = {
+    'not', 'no', 'never', 'none', 'nothing', 'neither', 'nor', 'without', 'hardly', 'barely',
+    'cannot', 'cant', 'dont', 'doesnt', 'didnt', 'isnt', 'wasnt', 'wont', 'wouldnt', 'arent',
+}
+BOOSTERS = {
+    'very': 0.293, 'really': 0.293, 'extremely': 0.293, 'incredibly': 0.293, 'highly': 0.293,
+    'super': 0.293, 'so': 0.293, 'absolutely': 0.293, 'truly': 0.293, 'totally': 0.293,
+    'slightly': -0.293, 'somewhat': -0.293, 'kinda': -0.293, 'fairly': -0.293,
+}
+
+# How strongly a negation flips a valence, how far back it reaches, and the
+# normalization constant of the compound score (as in VADER)
+NEGATION_SCALAR = -0.74
+NEGATION_WINDOW = 3
+ALPHA = 15
+
+_TOKEN = re.compile(r"[a-z]+(?:-[a-z]+)*")
+
+
+def score_text(text: str) -> float:
+    """
+    Compound sentiment of a text
+
+    Words after "but" count 1.5 times and words before it half, since the
+    clause after "but" usually carries the reviewer's verdict.
+
+    Returns:
+        Score in [-1, 1]; 0.0 for text without sentiment words
+    """
+    # "doesn't" -> "doesnt", matching the NEGATIONS spelling
+    tokens = _TOKEN.findall((text or '').lower().replace("'", ''))
+    valences = []
+    for i in [i for i, token in enumerate(tokens) if token in LEXICON]:
+        valence = LEXICON[tokens[i]]
+        if i and tokens[i - 1] in BOOSTERS:
+            valence += math.copysign(BOOSTERS[tokens[i - 1]], valence)
+        if not NEGATIONS.isdisjoint(tokens[max(0, i - NEGATION_WINDOW):i]):
+            valence *= NEGATION_SCALAR
+        valences.append((i, valence))
+
+    if 'but' in tokens:
+        but = tokens.index('but')
+        valences = [(i, valence * (0.5 if i < but else 1.5)) for i, valence in valences]
+
+    total = sum(valence for _, valence in valences)
+    if not total:
+        return 0.0
+    return round(total / math.sqrt(total * total + ALPHA), 4)
+
+
+def review_text(review: Dict) -> str:
+    """Text scored for a review: its title and description"""
+    return f"{review.get('title') or ''}\n{review.get('description') or ''}"
+
+
+def text_hash(text: str) -> str:
+    """Cache key of a text, including the lexicon version"""
+    return hashlib.blake2b(f"{LEXICON_VERSION}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+def score_batch(texts: List[str]) -> List[float]:
+    """Score a batch of texts (run in worker processes)"""
+    return [score_text(text) for text in texts]
+
+
+class SentimentCache:
+    """Scores stored in a SQLite database keyed by text hash"""
+
+    # Bound parameters per SELECT ... IN (...) statement
+    LOOKUP_SIZE = 900
+
+    def __init__(self, db_path: str = SENTIMENT_CONFIG['cache_path']):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS sentiment (text_hash TEXT PRIMARY KEY, score REAL NOT NULL) WITHOUT ROWID'
+        )
+
+    def get_many(self, hashes: List[str]) -> Dict[str, float]:
+        """Cached scores of the given hashes (missing ones are left out)"""
+        found = {}
+        for start in range(0, len(hashes), self.LOOKUP_SIZE):
+            chunk = hashes[start:start + self.LOOKUP_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            found.update(self.conn.execute(
+                f'SELECT text_hash, score FROM sentiment WHERE text_hash IN ({placeholders})', chunk
+            ))
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, float]]):
+        """Store (hash, score) pairs in one transaction"""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO sentiment (text_hash, score) VALUES (?, ?)', items)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def score_texts(texts: List[str], cache: Optional[SentimentCache] = None,
+                workers: int = SENTIMENT_CONFIG['workers'],
+                batch_size: int = SENTIMENT_CONFIG['batch_size']) -> Tuple[List[float], int]:
+    """
+    Score many texts, reusing cached scores and scoring the rest in parallel batches
+
+    Args:
+        texts: Texts to score
+        cache: Score cache to read from and add new scores to
+        workers: Worker processes (0 for one per CPU); small workloads are scored in-process
+        batch_size: Texts per worker task
+
+    Returns:
+        (scores in the order of texts, number of scores taken from the cache)
+    """
+    hashes = [text_hash(text) for text in texts]
+    known = cache.get_many(list(set(hashes))) if cache else {}
+
+    # Each distinct uncached text is scored once
+    pending = {}
+    for digest, text in zip(hashes, texts):
+        if digest not in known and digest not in pending:
+            pending[digest] = text
+    pending_hashes = list(pending)
+    pending_texts = list(pending.values())
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending_texts) >= SENTIMENT_CONFIG['min_parallel']:
+        batches = [pending_texts[i:i + batch_size] for i in range(0, len(pending_texts), batch_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            new_scores = [score for batch in pool.map(score_batch, batches) for score in batch]
+    else:
+        new_scores = score_batch(pending_texts)
+
+    fresh = dict(zip(pending_hashes, new_scores))
+    if cache and fresh:
+        cache.put_many(fresh.items())
+    known.update(fresh)
+
+    cached = sum(1 for digest in hashes if digest not in fresh)
+    return [known[digest] for digest in hashes], cached
+
+
+def add_sentiment(results: Dict, cache_path: Optional[str] = SENTIMENT_CONFIG['cache_path'],
+                  workers: int = SENTIMENT_CONFIG['workers']) -> Tuple[int, int]:
+    """
+    Set the 'sentiment' field of every review in a results dictionary (either schema version)
+
+    Args:
+        results: Results dictionary, modified in place
+        cache_path: Score cache database, or None to score without caching
+        workers: Worker processes (0 for one per CPU)
+
+    Returns:
+        (number of reviews scored, number of scores taken from the cache)
+    """
+    reviews = [review for source_data in results.get('sources', {}).values()
+               for review in source_data.get('reviews', [])]
+    if not reviews:
+        return 0, 0
+
+    texts = [review_text(review) for review in reviews]
+    if cache_path:
+        with SentimentCache(cache_path) as cache:
+            scores, cached = score_texts(texts, cache, workers)
+    else:
+        scores, cached = score_texts(texts, None, workers)
+
+    for review, score in zip(reviews, scores):
+        review['sentiment'] = score
+    return len(reviews), cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add sentiment scores to results files')
+    parser.add_argument('files', nargs='+', help='Results JSON files written by main.py (either schema version)')
+    parser.add_argument('--cache', default=SENTIMENT_CONFIG['cache_path'],
+                        help=f"Score cache database (default: {SENTIMENT_CONFIG['cache_path']})")
+    parser.add_argument('--no-cache', action='store_true', help='Score every review without reading or writing the cache')
+    parser.add_argument('--workers', type=int, default=SENTIMENT_CONFIG['workers'],
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--compact', action='store_true', help='Write JSON without indentation')
+    args = parser.parse_args()
+
+    for json_file in args.files:
+        try:
+            results = jsonio.load(json_file)
+            scored, cached = add_sentiment(results, None if args.no_cache else args.cache, args.workers)
+            jsonio.dump(results, json_file, compact=args.compact)
+        except Exception as e:
+            print(f"[ERROR] Failed to score {json_file}: {str(e)}")
+            return 1
+        print(f"[SUCCESS] Scored {scored} reviews in {json_file} ({cached} from cache)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+SQLite storage backend for the Review Scraper
+Stores reviews in a local database indexed on (company, source, date), so
+company, date range and rating queries are index scans instead of loading
+whole JSON files. An optional FTS5 full-text index over title and
+description supports ranked text search.
+
+Usage:
+    python storage.py --db output/reviews.db --import output/reviews.json
+    python storage.py --db output/reviews.db --company Slack --start-date 2023-01-01 --min-rating 4
+    python storage.py --db output/reviews.db --search "pricing OR integration" --source G2
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import schema
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    review_id TEXT NOT NULL,
+    company TEXT NOT NULL COLLATE NOCASE,
+    source TEXT NOT NULL COLLATE NOCASE,
+    date TEXT,
+    rating REAL,
+    title TEXT,
+    description TEXT,
+    reviewer_name TEXT,
+    url TEXT,
+    sentiment REAL,
+    scraped_at TEXT NOT NULL,
+    UNIQUE (company, review_id)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_company_source_date ON reviews (company, source, date);
+-- Date-range queries across all sources of a company
+CREATE INDEX IF NOT EXISTS idx_reviews_company_date ON reviews (company, date);
+"""
+
+# External-content FTS5 index over reviews, kept in sync by triggers so it is
+# updated in the same transaction as every upsert
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE reviews_fts USING fts5(
+    title, description, content='reviews', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER reviews_fts_insert AFTER INSERT ON reviews BEGIN
+    INSERT INTO reviews_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER reviews_fts_delete AFTER DELETE ON reviews BEGIN
+    INSERT INTO reviews_fts (reviews_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER reviews_fts_update AFTER UPDATE ON reviews BEGIN
+    INSERT INTO reviews_fts (reviews_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO reviews_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+"""
+
+# bm25 column weights: a match in the title counts more than one in the description
+FTS_WEIGHTS = (2.0, 1.0)
+
+UPSERT = """
+INSERT INTO reviews (review_id, company, source, date, rating, title, description,
+                     reviewer_name, url, sentiment, scraped_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (company, review_id) DO UPDATE SET
+    -- A re-scrape without a field (a --fields projection, or --sentiment not
+    -- given) keeps the stored value
+    rating = COALESCE(excluded.rating, reviews.rating),
+    description = COALESCE(excluded.description, reviews.description),
+    url = COALESCE(excluded.url, reviews.url),
+    sentiment = COALESCE(excluded.sentiment, reviews.sentiment),
+    scraped_at = excluded.scraped_at
+"""
+
+COLUMNS = ['title', 'description', 'date', 'rating', 'reviewer_name', 'source', 'url', 'sentiment']
+
+# Rows per executemany call
+BATCH_SIZE = 1000
+
+
+def review_identity(review: Dict) -> str:
+    """
+    Stable identity of a review, used as the upsert key
+
+    A review is identified by where it was posted, when, by whom and its
+    title, so re-scraping the same review updates it instead of adding a copy.
+
+    Args:
+        review: Review dictionary (as produced by Review.to_dict)
+
+    Returns:
+        Hex SHA-1 digest
+    """
+    key = '|'.join(str(review.get(field) or '') for field in ('source', 'date', 'reviewer_name', 'title'))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class SQLiteStorage:
+    """Reviews stored in a SQLite database"""
+
+    def __init__(self, db_path: str, full_text: bool = False):
+        """
+        Args:
+            db_path: Database file, created with its schema if it does not exist
+            full_text: Create the full-text index if the database does not have one yet.
+                Once created, it is maintained on every write regardless of this flag.
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        if full_text and not self.has_full_text():
+            self.create_full_text_index()
+
+    def _migrate(self):
+        # Databases created before the sentiment column was added
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(reviews)')}
+        if 'sentiment' not in columns:
+            with self.conn:
+                self.conn.execute('ALTER TABLE reviews ADD COLUMN sentiment REAL')
+
+    def has_full_text(self) -> bool:
+        """Whether the database has a full-text index"""
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reviews_fts'"
+        ).fetchone()
+        return row is not None
+
+    def create_full_text_index(self):
+        """Create the full-text index and fill it with the reviews already stored"""
+        self.conn.executescript(
+            f"BEGIN; {FTS_SCHEMA} INSERT INTO reviews_fts (reviews_fts) VALUES ('rebuild'); COMMIT;"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert_reviews(self, company_name: str, reviews: Iterable[Dict]) -> int:
+        """
+        Insert or update reviews of a company in batched transactions
+
+        Args:
+            company_name: Name of the company the reviews belong to
+            reviews: Review dictionaries
+
+        Returns:
+            Number of reviews written
+        """
+        scraped_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        written = 0
+        batch = []
+        for review in reviews:
+            batch.append((
+                review_identity(review), company_name, review.get('source') or '', review.get('date'),
+                review.get('rating'), review.get('title'), review.get('description'),
+                review.get('reviewer_name'), review.get('url'), review.get('sentiment'), scraped_at
+            ))
+            if len(batch) >= BATCH_SIZE:
+                written += self._write_batch(batch)
+                batch = []
+        if batch:
+            written += self._write_batch(batch)
+        return written
+
+    def _write_batch(self, batch: List[tuple]) -> int:
+        with self.conn:
+            self.conn.executemany(UPSERT, batch)
+        return len(batch)
+
+    def save_results(self, results: Dict) -> int:
+        """
+        Store every review of a results dictionary as produced by main.scrape_reviews
+
+        Returns:
+            Number of reviews written
+        """
+        return sum(
+            self.upsert_reviews(results['company'], source_data.get('reviews', []))
+            for source_data in results.get('sources', {}).values()
+        )
+
+    def query(self, company_name: str, source: Optional[str] = None,
+              start_date: Optional[str] = None, end_date: Optional[str] = None,
+              min_rating: Optional[float] = None, max_rating: Optional[float] = None,
+              limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Reviews of a company, newest first
+
+        Args:
+            company_name: Company name (case-insensitive)
+            source: Only this source, e.g. 'G2' (case-insensitive)
+            start_date: Earliest date, YYYY-MM-DD
+            end_date: Latest date, YYYY-MM-DD
+            min_rating: Lowest rating to include
+            max_rating: Highest rating to include
+            limit: Maximum number of reviews
+
+        Yields:
+            Review dictionaries
+        """
+        clauses, params = self._filters(company_name, source, start_date, end_date, min_rating, max_rating)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM reviews WHERE {' AND '.join(clauses)} ORDER BY date DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self.conn.execute(sql, params):
+            yield dict(row)
+
+    def count(self, company_name: str, source: Optional[str] = None,
+              start_date: Optional[str] = None, end_date: Optional[str] = None,
+              min_rating: Optional[float] = None, max_rating: Optional[float] = None) -> int:
+        """Number of reviews matching the same filters as query()"""
+        clauses, params = self._filters(company_name, source, start_date, end_date, min_rating, max_rating)
+        return self.conn.execute(f"SELECT COUNT(*) FROM reviews WHERE {' AND '.join(clauses)}", params).fetchone()[0]
+
+    def search(self, text: str, company_name: Optional[str] = None, source: Optional[str] = None,
+               start_date: Optional[str] = None, end_date: Optional[str] = None,
+               limit: int = 20, sort: str = 'rank') -> List[Dict]:
+        """
+        Full-text search over review titles and descriptions
+
+        Ranking scores every matching review, so its cost grows with the
+        number of matches; sort='recent' walks the index newest-stored first
+        and stops after `limit` matches, which stays fast for common terms.
+
+        Args:
+            text: FTS5 query, e.g. 'pricing', 'pricing OR integration', '"customer support"'
+            company_name: Only this company
+            source: Only this source
+            start_date: Earliest date, YYYY-MM-DD
+            end_date: Latest date, YYYY-MM-DD
+            limit: Maximum number of reviews
+            sort: 'rank' (best bm25 match first) or 'recent' (most recently stored first)
+
+        Returns:
+            Review dictionaries with the company and a bm25 'score' (lower is better)
+
+        Raises:
+            ValueError: If the database has no full-text index
+            sqlite3.OperationalError: If the query is not valid FTS5 syntax
+        """
+        if not self.has_full_text():
+            raise ValueError(f"{self.db_path} has no full-text index; create it with --full-text")
+        clauses, params = self._filters(company_name, source, start_date, end_date, None, None)
+        columns = ', '.join(f"reviews.{column}" for column in COLUMNS)
+        order = 'score' if sort == 'rank' else 'reviews_fts.rowid DESC'
+        sql = (
+            f"SELECT {columns}, reviews.company, bm25(reviews_fts, {FTS_WEIGHTS[0]}, {FTS_WEIGHTS[1]}) AS score "
+            f"FROM reviews_fts JOIN reviews ON reviews.id = reviews_fts.rowid "
+            f"WHERE {' AND '.join(['reviews_fts MATCH ?'] + clauses)} ORDER BY {order} LIMIT ?"
+        )
+        return [dict(row) for row in self.conn.execute(sql, [text] + params + [limit])]
+
+    @staticmethod
+    def _filters(company_name, source, start_date, end_date, min_rating, max_rating) -> tuple:
+        clauses, params = [], []
+        if company_name:
+            clauses.append('company = ?')
+            params.append(company_name)
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if start_date:
+            clauses.append('date >= ?')
+            params.append(start_date)
+        if end_date:
+            clauses.append('date <= ?')
+            params.append(end_date)
+        if min_rating is not None:
+            clauses.append('rating >= ?')
+            params.append(min_rating)
+        if max_rating is not None:
+            clauses.append('rating <= ?')
+            params.append(max_rating)
+        return clauses, params
+
+
+def import_json(storage: SQLiteStorage, json_file: str) -> int:
+    """
+    Load a results JSON file written by main.py into the database
+
+    Returns:
+        Number of reviews written
+    """
+    return storage.save_results(schema.load_results(json_file))
+
+
+def main():
+    """Query or import reviews from the command line"""
+    parser = argparse.ArgumentParser(description='Query reviews stored in a SQLite database')
+    parser.add_argument('--db', default='output/reviews.db', help='Database file (default: output/reviews.db)')
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='JSON_FILE',
+                        help='Import results JSON files written by main.py')
+    parser.add_argument('--full-text', action='store_true',
+                        help='Create the full-text index (over existing reviews too) if missing')
+    parser.add_argument('--search', metavar='QUERY',
+                        help='Full-text search, e.g. "pricing OR integration" (needs --full-text once)')
+    parser.add_argument('--sort', choices=['rank', 'recent'], default='rank',
+                        help='Order of --search results: best match or most recently stored first (default: rank)')
+    parser.add_argument('--company', help='Company name')
+    parser.add_argument('--source', help='Source name, e.g. G2')
+    parser.add_argument('--start-date', help='Earliest review date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', help='Latest review date (YYYY-MM-DD)')
+    parser.add_argument('--min-rating', type=float, help='Lowest rating to include')
+    parser.add_argument('--max-rating', type=float, help='Highest rating to include')
+    parser.add_argument('--limit', type=int, help='Maximum number of reviews to print')
+    parser.add_argument('--count', action='store_true', help='Print only the number of matching reviews')
+    args = parser.parse_args()
+
+    if not (args.import_files or args.company or args.search or args.full_text):
+        parser.error('--company is required unless --import, --search or --full-text is given')
+
+    with SQLiteStorage(args.db, full_text=args.full_text) as storage:
+        for json_file in args.import_files or []:
+            try:
+                print(f"[INFO] Imported {import_json(storage, json_file)} reviews from {json_file}")
+            except Exception as e:
+                print(f"[ERROR] Failed to import {json_file}: {str(e)}")
+                return 1
+
+        if args.search:
+            try:
+                matches = storage.search(args.search, args.company, args.source, args.start_date,
+                                         args.end_date, limit=args.limit or 20, sort=args.sort)
+            except (ValueError, sqlite3.OperationalError) as e:
+                print(f"[ERROR] Search failed: {str(e)}")
+                return 1
+            for review in matches:
+                sys.stdout.write(json.dumps(review, ensure_ascii=False) + '\n')
+        elif args.company:
+            filters = dict(source=args.source, start_date=args.start_date, end_date=args.end_date,
+                           min_rating=args.min_rating, max_rating=args.max_rating)
+            if args.count:
+                print(storage.count(args.company, **filters))
+            else:
+                # One JSON object per line, so the output can be piped
+                for review in storage.query(args.company, limit=args.limit, **filters):
+                    sys.stdout.write(json.dumps(review, ensure_ascii=False) + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Summary sidecars for the Review Scraper
+Aggregates (counts, rating histograms, monthly volumes, date ranges) computed
+from the in-memory results when an output file is written, and stored next to
+it, so dashboards and reports can read a small summary instead of rescanning
+every review. Writing one costs a pass over the reviews in memory, not a
+re-read of the file. SQLite storage (--storage sqlite) gets no sidecar: the
+database holds every run's reviews, so a summary of one run would not describe
+it, and storage.py counts and queries it from its index.
+
+Usage:
+    python summary.py output/reviews.json     # (re)build the sidecar of an existing output
+"""
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import jsonio
+import jsonstream
+
+
+def summary_path(output_file: str) -> str:
+    """
+    Sidecar path of an output file, e.g. output/reviews.json.gz -> output/reviews.json.gz.summary.json
+
+    The whole file name is kept, so outputs that differ only in format or
+    compression (reviews.json, reviews.csv.gz, reviews.parquet) get separate sidecars.
+    """
+    return f"{output_file}.summary.json"
+
+
+class _SourceSummary:
+    def __init__(self):
+        self.count = 0
+        self.rated = 0
+        self.rating_sum = 0.0
+        self.ratings: Dict[float, int] = {}
+        self.months: Dict[str, int] = {}
+        self.min_date: Optional[str] = None
+        self.max_date: Optional[str] = None
+        self.sentiment_count = 0
+        self.sentiment_sum = 0.0
+
+    def add(self, review: Dict):
+        self.count += 1
+        rating = review.get('rating')
+        if rating:
+            self.rated += 1
+            self.rating_sum += rating
+            self.ratings[rating] = self.ratings.get(rating, 0) + 1
+        date = review.get('date')
+        if date:
+            # Dates are YYYY-MM-DD, so string order is date order
+            month = date[:7]
+            self.months[month] = self.months.get(month, 0) + 1
+            if self.min_date is None or date < self.min_date:
+                self.min_date = date
+            if self.max_date is None or date > self.max_date:
+                self.max_date = date
+        sentiment = review.get('sentiment')
+        if sentiment is not None:
+            self.sentiment_count += 1
+            self.sentiment_sum += sentiment
+
+    def to_dict(self) -> Dict:
+        summary = {
+            'total_reviews': self.count,
+            'rated_reviews': self.rated,
+            'avg_rating': self.rating_sum / self.rated if self.rated else None,
+            'min_rating': min(self.ratings) if self.ratings else None,
+            'max_rating': max(self.ratings) if self.ratings else None,
+            'rating_histogram': {f"{rating:g}": count for rating, count in sorted(self.ratings.items())},
+            'monthly_volume': dict(sorted(self.months.items())),
+            'min_date': self.min_date,
+            'max_date': self.max_date,
+        }
+        if self.sentiment_count:
+            summary['avg_sentiment'] = self.sentiment_sum / self.sentiment_count
+        return summary
+
+
+class SummaryAccumulator:
+    """Collects per-source aggregates one review at a time, in constant memory per source"""
+
+    def __init__(self, company_name: Optional[str] = None, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None):
+        self.company_name = company_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self._sources: Dict[str, _SourceSummary] = {}
+
+    def add(self, source_name: str, review: Dict):
+        """Record one review of a source"""
+        source = self._sources.get(source_name)
+        if source is None:
+            source = self._sources[source_name] = _SourceSummary()
+        source.add(review)
+
+    def add_results(self, results: Dict):
+        """Record every review of a results dictionary"""
+        for source_name, source_data in results.get('sources', {}).items():
+            self._sources.setdefault(source_name, _SourceSummary())
+            for review in source_data.get('reviews', []):
+                self.add(source_name, review)
+
+    def to_dict(self, output_file: Optional[str] = None) -> Dict:
+        """
+        Returns:
+            {'company', 'start_date', 'end_date', 'output', 'output_size', 'generated_at', 'total_reviews',
+             'sources': {name: {'total_reviews', 'rated_reviews', 'avg_rating', 'min_rating',
+                                'max_rating', 'rating_histogram', 'monthly_volume',
+                                'min_date', 'max_date', 'avg_sentiment' (if scored)}}}
+        """
+        return {
+            'company': self.company_name,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'output': os.path.basename(output_file) if output_file else None,
+            'output_size': os.path.getsize(output_file) if output_file and os.path.exists(output_file) else None,
+            'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'total_reviews': sum(source.count for source in self._sources.values()),
+            'sources': {name: source.to_dict() for name, source in self._sources.items()},
+        }
+
+    def write(self, output_file: str) -> Optional[str]:
+        """
+        Write the sidecar of output_file
+
+        Returns:
+            Path of the sidecar, or None if writing failed
+        """
+        path = summary_path(output_file)
+        try:
+            jsonio.dump(self.to_dict(output_file), path)
+            return path
+        except Exception as e:
+            print(f"[ERROR] Failed to write summary: {str(e)}")
+            return None
+
+
+def summarize_results(results: Dict) -> SummaryAccumulator:
+    """Summary of a results dictionary as produced by main.scrape_reviews"""
+    accumulator = SummaryAccumulator(results.get('company'), results.get('start_date'), results.get('end_date'))
+    accumulator.add_results(results)
+    return accumulator
+
+
+def summarize_file(json_file: str) -> SummaryAccumulator:
+    """Summary of an existing results or NDJSON file, read incrementally"""
+    accumulator = SummaryAccumulator()
+    for event, name, value in jsonstream.walk(json_file):
+        if event == 'header' and name in ('company', 'start_date', 'end_date'):
+            setattr(accumulator, 'company_name' if name == 'company' else name, value)
+        elif event == 'review':
+            accumulator.add(name, value)
+            if accumulator.company_name is None:
+                accumulator.company_name = value.get('company')
+    return accumulator
+
+
+def load_summary(output_file: str) -> Optional[Dict]:
+    """
+    Read the sidecar of an output file
+
+    Returns:
+        The summary, or None if there is no sidecar, it is older than the output or
+        it describes another file (its recorded name or size differs)
+    """
+    path = summary_path(output_file)
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(output_file):
+            return None
+        data = jsonio.load(path)
+    except (OSError, ValueError):
+        return None
+    if data.get('output') != os.path.basename(output_file) or \
+            data.get('output_size') != os.path.getsize(output_file):
+        return None
+    return data
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python summary.py OUTPUT_FILE [OUTPUT_FILE ...]")
+        return 1
+    for output_file in sys.argv[1:]:
+        try:
+            path = summarize_file(output_file).write(output_file)
+        except Exception as e:
+            print(f"[ERROR] Failed to summarize {output_file}: {str(e)}")
+            return 1
+        if not path:
+            return 1
+        print(f"[SUCCESS] Summary saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
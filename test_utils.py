@@ -4,13 +4,19 @@ Test and validation utilities for the Review Scraper
 import os
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import jsonio
+import jsonstream
+import summary
+
 
 def validate_json_structure(json_file: str) -> bool:
     """
-    Validate the structure of the output JSON file
+    Validate the structure of the output JSON file (schema version 1 or the
+    normalized version 2)
     
     Args:
         json_file: Path to the JSON file to validate
@@ -19,8 +25,7 @@ def validate_json_structure(json_file: str) -> bool:
         True if valid, False otherwise
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = jsonio.load(json_file)
         
         # Check required top-level keys
         required_keys = ['company', 'start_date', 'end_date', 'sources']
@@ -42,8 +47,19 @@ def validate_json_structure(json_file: str) -> bool:
             print("[ERROR] 'sources' must be a dictionary")
             return False
         
+        version = data.get('schema_version', 1)
+        if version not in (1, 2):
+            print(f"[ERROR] Unsupported schema_version: {version}")
+            return False
+        
         # Validate each source
         for source_name, source_data in data['sources'].items():
+            if version == 2:
+                for key in ['source', 'dictionaries']:
+                    if key not in source_data:
+                        print(f"[ERROR] Missing '{key}' in {source_name}")
+                        return False
+            
             if 'total_reviews' not in source_data:
                 print(f"[ERROR] Missing 'total_reviews' in {source_name}")
                 return False
@@ -56,13 +72,21 @@ def validate_json_structure(json_file: str) -> bool:
                 print(f"[ERROR] 'reviews' must be a list in {source_name}")
                 return False
             
-            # Validate each review
+            # Validate each review; a --fields projection only requires its fields
+            dictionaries = source_data.get('dictionaries', {}) if version == 2 else {}
+            required_review_keys = required_fields(data)
             for i, review in enumerate(source_data['reviews']):
-                required_review_keys = ['title', 'description', 'date', 'rating', 'reviewer_name']
                 for key in required_review_keys:
                     if key not in review:
                         print(f"[ERROR] Review {i} in {source_name} missing key: {key}")
                         return False
+                
+                # Dictionary-encoded fields must point into the source's dictionary
+                for key, values in dictionaries.items():
+                    index = review.get(key)
+                    if index is not None and not (isinstance(index, int) and 0 <= index < len(values)):
+                        print(f"[ERROR] Review {i} in {source_name} has invalid {key} index: {index}")
+                        return False
         
         print("[SUCCESS] JSON structure is valid")
         return True
@@ -89,8 +113,7 @@ def count_reviews(json_file: str) -> dict:
         Dictionary with review counts
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = jsonio.load(json_file)
         
         counts = {}
         total = 0
@@ -110,14 +133,16 @@ def count_reviews(json_file: str) -> dict:
 
 def print_statistics(json_file: str) -> None:
     """
-    Print statistics about the scraped reviews
+    Print statistics about the scraped reviews, read from the file's summary
+    sidecar when it is up to date
     
     Args:
         json_file: Path to the JSON file
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = summary.load_summary(json_file)
+        if data is None:
+            data = summary.summarize_results(jsonio.load(json_file)).to_dict(json_file)
         
         print("\n" + "="*50)
         print("SCRAPE STATISTICS")
@@ -126,25 +151,180 @@ def print_statistics(json_file: str) -> None:
         print(f"Date Range: {data['start_date']} to {data['end_date']}")
         print("-"*50)
         
-        total_reviews = 0
         for source_name, source_data in data['sources'].items():
-            count = len(source_data.get('reviews', []))
-            total_reviews += count
-            
-            # Calculate average rating
-            ratings = [r.get('rating', 0) for r in source_data.get('reviews', []) if r.get('rating')]
-            avg_rating = sum(ratings) / len(ratings) if ratings else 0
-            
-            print(f"{source_name}: {count} reviews (avg rating: {avg_rating:.1f})")
+            print(f"{source_name}: {source_data['total_reviews']} reviews "
+                  f"(avg rating: {source_data['avg_rating'] or 0:.1f})")
         
         print("-"*50)
-        print(f"Total Reviews: {total_reviews}")
+        print(f"Total Reviews: {data['total_reviews']}")
         print("="*50 + "\n")
     
     except Exception as e:
         print(f"[ERROR] Failed to print statistics: {str(e)}")
 
 
+REQUIRED_REVIEW_KEYS = ['title', 'description', 'date', 'rating', 'reviewer_name']
+
+
+def required_fields(header: dict) -> list:
+    """Review keys a file must have: its 'fields' projection, or REQUIRED_REVIEW_KEYS"""
+    fields = header.get('fields')
+    if fields is None:
+        return REQUIRED_REVIEW_KEYS
+    return [key for key in REQUIRED_REVIEW_KEYS if key in fields]
+
+
+def stream_validate(json_file: str, max_errors: int = 20) -> list:
+    """
+    Validate a results or NDJSON file in one streaming pass with constant memory
+    
+    Args:
+        json_file: Path to the file (schema version 1 or 2, optionally compressed)
+        max_errors: Stop after this many errors
+    
+    Returns:
+        List of error messages; empty if the file is valid
+    """
+    errors = []
+    ndjson = jsonstream.is_ndjson(json_file)
+    header = {}
+    seen_sources = False
+    fields, max_index = {}, {}
+    
+    try:
+        for event, name, value in jsonstream.walk(json_file):
+            if event == 'header':
+                header[name] = value
+            elif event == 'source_start':
+                seen_sources = True
+                fields, max_index, index = {}, {}, 0
+            elif event == 'source_field':
+                fields[value[0]] = value[1]
+            elif event == 'review':
+                if not isinstance(value, dict):
+                    errors.append(f"Review {index} in {name} is not an object")
+                else:
+                    for key in required_fields(header) + (['source'] if ndjson else []):
+                        if key not in value:
+                            errors.append(f"Review {index} in {name} missing key: {key}")
+                    reviewer = value.get('reviewer_name')
+                    if isinstance(reviewer, int) and not isinstance(reviewer, bool):
+                        max_index['reviewer_name'] = max(max_index.get('reviewer_name', -1), reviewer)
+                index += 1
+            elif event == 'source_end' and not ndjson:
+                errors.extend(_check_source_block(name, fields, value, max_index,
+                                                  header.get('schema_version', 1)))
+            if len(errors) >= max_errors:
+                return errors[:max_errors]
+    except json.JSONDecodeError as e:
+        return errors + [f"Invalid JSON file: {str(e)}"]
+    except FileNotFoundError:
+        return errors + [f"File not found: {json_file}"]
+    except Exception as e:
+        return errors + [f"Unexpected error: {str(e)}"]
+    
+    if not ndjson:
+        for key in ['company', 'start_date', 'end_date']:
+            if key not in header:
+                errors.append(f"Missing required key: {key}")
+        if not seen_sources and not isinstance(header.get('sources'), dict):
+            errors.append("Missing required key: sources" if 'sources' not in header
+                          else "'sources' must be a dictionary")
+        try:
+            datetime.strptime(header.get('start_date', ''), '%Y-%m-%d')
+            datetime.strptime(header.get('end_date', ''), '%Y-%m-%d')
+        except (TypeError, ValueError):
+            errors.append("Invalid date format")
+        if header.get('schema_version', 1) not in (1, 2):
+            errors.append(f"Unsupported schema_version: {header['schema_version']}")
+    return errors[:max_errors]
+
+
+def _check_source_block(name: str, fields: dict, count, max_index: dict, version: int) -> list:
+    errors = []
+    if 'total_reviews' not in fields:
+        errors.append(f"Missing 'total_reviews' in {name}")
+    if count is None:
+        errors.append(f"Missing 'reviews' in {name}" if 'reviews' not in fields
+                      else f"'reviews' must be a list in {name}")
+    if version == 2:
+        for key in ['source', 'dictionaries']:
+            if key not in fields:
+                errors.append(f"Missing '{key}' in {name}")
+        dictionaries = fields.get('dictionaries') or {}
+        for key, highest in max_index.items():
+            if highest >= len(dictionaries.get(key, [])):
+                errors.append(f"{name} has {key} index {highest} outside its dictionary")
+    return errors
+
+
+def stream_statistics(json_file: str) -> dict:
+    """
+    Count reviews and average ratings per source in one streaming pass, or
+    from the file's summary sidecar when it is up to date
+    
+    Args:
+        json_file: Path to a results or NDJSON file (optionally compressed)
+    
+    Returns:
+        {'file': str, 'company': str, 'sources': {name: {'count': n, 'avg_rating': r}}, 'total': n}
+    """
+    sidecar = summary.load_summary(json_file)
+    if sidecar is not None:
+        return {
+            'file': json_file,
+            'company': sidecar['company'],
+            'sources': {name: {'count': source['total_reviews'], 'avg_rating': source['avg_rating'] or 0.0}
+                        for name, source in sidecar['sources'].items()},
+            'total': sidecar['total_reviews'],
+        }
+    
+    stats = {'file': json_file, 'company': None, 'sources': {}, 'total': 0}
+    rating_sums = {}
+    for event, name, value in jsonstream.walk(json_file):
+        if event == 'header' and name == 'company':
+            stats['company'] = value
+        elif event == 'review':
+            source = stats['sources'].setdefault(name, {'count': 0, 'avg_rating': 0.0})
+            source['count'] += 1
+            rating = value.get('rating')
+            if rating:
+                total, rated = rating_sums.get(name, (0.0, 0))
+                rating_sums[name] = (total + rating, rated + 1)
+            if stats['company'] is None:
+                stats['company'] = value.get('company')
+    for name, (total, rated) in rating_sums.items():
+        stats['sources'][name]['avg_rating'] = total / rated
+    stats['total'] = sum(source['count'] for source in stats['sources'].values())
+    return stats
+
+
+def stream_count(json_file: str) -> dict:
+    """
+    Count reviews per source of a file, reading it incrementally
+    
+    Returns:
+        {source name: review count, 'total': total count}, as count_reviews
+    """
+    stats = stream_statistics(json_file)
+    counts = {name: source['count'] for name, source in stats['sources'].items()}
+    counts['total'] = stats['total']
+    return counts
+
+
+def scan_files(func, json_files: list, workers: int = 1) -> list:
+    """
+    Apply a streaming function to many files, in parallel processes if workers > 1
+    
+    Returns:
+        Results in the order of json_files
+    """
+    if workers > 1 and len(json_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, json_files))
+    return [func(json_file) for json_file in json_files]
+
+
 def test_environment() -> bool:
     """
     Test if the environment is properly set up
@@ -194,20 +374,47 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Test and validate the Review Scraper")
     parser.add_argument('--test-env', action='store_true', help='Test environment setup')
-    parser.add_argument('--validate', type=str, help='Validate JSON file structure')
-    parser.add_argument('--stats', type=str, help='Print statistics from JSON file')
-    parser.add_argument('--count', type=str, help='Count reviews in JSON file')
+    parser.add_argument('--validate', nargs='+', metavar='FILE', help='Validate JSON file structure')
+    parser.add_argument('--stats', nargs='+', metavar='FILE', help='Print statistics from JSON file')
+    parser.add_argument('--count', nargs='+', metavar='FILE', help='Count reviews in JSON file')
+    parser.add_argument('--stream', action='store_true',
+                        help='Read files incrementally with constant memory (also supports NDJSON)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='With --stream, number of files to process in parallel (default: 1)')
     
     args = parser.parse_args()
+    if args.workers > 1 and not args.stream:
+        parser.error('--workers needs --stream')
     
     if args.test_env:
         test_environment()
+    elif args.validate and args.stream:
+        failed = 0
+        for json_file, errors in zip(args.validate, scan_files(stream_validate, args.validate, args.workers)):
+            if errors:
+                failed += 1
+                for error in errors:
+                    print(f"[ERROR] {json_file}: {error}")
+            else:
+                print(f"[SUCCESS] {json_file}: JSON structure is valid")
+        sys.exit(1 if failed else 0)
     elif args.validate:
-        validate_json_structure(args.validate)
+        for json_file in args.validate:
+            validate_json_structure(json_file)
+    elif args.stats and args.stream:
+        for stats in scan_files(stream_statistics, args.stats, args.workers):
+            print(f"{stats['file']} ({stats['company']})")
+            for source_name, source in stats['sources'].items():
+                print(f"  {source_name}: {source['count']} reviews (avg rating: {source['avg_rating']:.1f})")
+            print(f"  Total Reviews: {stats['total']}")
     elif args.stats:
-        print_statistics(args.stats)
+        for json_file in args.stats:
+            print_statistics(json_file)
+    elif args.count and args.stream:
+        for counts in scan_files(stream_count, args.count, args.workers):
+            print(json.dumps(counts, indent=2))
     elif args.count:
-        counts = count_reviews(args.count)
-        print(json.dumps(counts, indent=2))
+        for json_file in args.count:
+            print(json.dumps(count_reviews(json_file), indent=2))
     else:
         print("Use --help to see available options")
@@ -0,0 +1,79 @@
+"""Tests for the pandas review analytics (analytics.py)"""
+import math
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+import analytics
+import exporters
+import jsonio
+
+
+def review(date, rating, title=''):
+    return {'date': date, 'rating': rating, 'title': title, 'reviewer_name': 'someone'}
+
+
+ACME = {'company': 'Acme', 'sources': {
+    'G2': {'reviews': [review('2023-01-05', 5.0, 'Great'), review('2023-01-20', 4.0),
+                       review('2023-03-01', 2.0, 'Poor')]},
+    'Capterra': {'reviews': [review('2023-02-10', None), review('2023-01-15', 1.4, 'Awful')]},
+}}
+GLOBEX = {'company': 'Globex', 'sources': {'G2': {'reviews': [review('2023-01-07', 3.0)]}}}
+
+
+@pytest.fixture
+def df(tmp_path):
+    json_file = str(tmp_path / 'acme.json.gz')
+    jsonio.dump(ACME, json_file)
+    csv_file = str(tmp_path / 'globex.csv')
+    exporters.CSVExporter().export(GLOBEX, csv_file)
+    return analytics.load_reviews([json_file, csv_file], analytics.TOP_COLUMNS)
+
+
+def test_files_of_different_formats_load_into_one_frame(df):
+    assert len(df) == 6
+    assert isinstance(df['company'].dtype, pd.CategoricalDtype)
+    assert set(df['company']) == {'Acme', 'Globex'}
+    assert df['rating'].dtype == 'float64'
+    assert len(analytics.filter_reviews(df, company='acme', source='g2', start_date='2023-01-06')) == 2
+
+
+def test_rating_distribution(df):
+    dist = analytics.rating_distribution(df)
+    assert dist.loc['G2', ['reviews', 'rated', 'mean', 'min', 'max']].tolist() == [4, 4, 3.5, 2.0, 5.0]
+    assert dist.loc['G2', ['1_star', '2_star', '3_star', '4_star', '5_star']].tolist() == [0, 1, 1, 1, 1]
+    assert dist.loc['Capterra', ['reviews', 'rated', '1_star']].tolist() == [2, 1, 1]
+
+
+def test_monthly_trends_roll_over_empty_months(df):
+    trends = analytics.monthly_trends(df, window=3)
+    g2 = trends.xs('G2', level='source')
+    assert [str(month) for month in g2.index] == ['2023-01', '2023-03']
+    assert g2['avg_rating'].tolist() == [4.0, 2.0]
+    # March's window spans January to March: (5 + 4 + 3 + 2) / 4
+    assert g2['rolling_avg_rating'].tolist() == [4.0, 3.5]
+
+    capterra = trends.xs('Capterra', level='source')
+    assert math.isnan(capterra['avg_rating'].iloc[1])
+    assert capterra['rolling_avg_rating'].tolist() == pytest.approx([1.4, 1.4])
+
+
+def test_compare_companies(df):
+    comparison = analytics.compare_companies(df)
+    assert comparison.index.tolist() == ['Acme', 'Globex']
+    acme = comparison.loc['Acme']
+    assert acme['reviews'] == 5
+    assert acme['avg_rating'] == pytest.approx(3.1)
+    assert (acme['positive_share'], acme['negative_share']) == (0.5, 0.5)
+    assert acme['avg_G2'] == pytest.approx(11 / 3)
+    assert math.isnan(comparison.loc['Globex', 'avg_Capterra'])
+
+
+def test_top_and_lowest_reviews(df):
+    top = analytics.top_reviews(df, n=1)
+    assert top[['source', 'rating', 'title']].values.tolist() == [['Capterra', 1.4, 'Awful'], ['G2', 5.0, 'Great']]
+    lowest = analytics.run_report(df, 'top', n=1, lowest=True)
+    assert lowest.loc[lowest['source'] == 'G2', 'title'].tolist() == ['Poor']
+    with pytest.raises(ValueError):
+        analytics.run_report(df, 'histogram')
@@ -0,0 +1,128 @@
+"""Tests for BaseScraper pagination, date-range skipping and checkpoint resume"""
+from datetime import datetime, timedelta
+from typing import List
+
+import requests
+from bs4 import BeautifulSoup
+
+from checkpoint import CheckpointStore
+from scrapers.base_scraper import BaseScraper, Review
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeScraper(BaseScraper):
+    """Serves `pages` of review dates, newest first, without any network access"""
+
+    NEWEST_FIRST = True
+
+    def __init__(self, pages: List[List[str]], start_date: datetime, end_date: datetime, fail_at: int = None):
+        super().__init__('Acme', start_date, end_date, 'Fake')
+        self.pages = pages
+        self.fail_at = fail_at
+        self.fetched = []
+        self.request_delay = 0
+
+    def _find_company_url(self):
+        return 'https://example.com/acme'
+
+    def _page_url(self, company_url, page):
+        return f"{company_url}?page={page}"
+
+    def _fetch(self, url, method='GET', **kwargs):
+        page = int(url.rsplit('=', 1)[1])
+        self.fetched.append(page)
+        if page == self.fail_at:
+            raise requests.exceptions.ConnectionError('connection reset')
+        dates = self.pages[page - 1] if page <= len(self.pages) else []
+        cards = ''.join(f'<div class="review" data-date="{date}"></div>' for date in dates)
+        return FakeResponse(f"<html><body>{cards}</body></html>".encode())
+
+    def _extract_reviews(self, soup: BeautifulSoup, company_url):
+        reviews = []
+        for card in soup.find_all('div', class_='review'):
+            date = card['data-date']
+            if not self._in_range(date):
+                continue
+            reviews.append(Review(f"Review of {date}", 'Text', date, 5.0, 'Jane', self.source_name, company_url))
+        return reviews
+
+
+def weekly_pages(newest: datetime, pages: int, per_page: int = 5) -> List[List[str]]:
+    """Pages of one review a week, newest first"""
+    dates = [(newest - timedelta(weeks=i)).strftime('%Y-%m-%d') for i in range(pages * per_page)]
+    return [dates[i:i + per_page] for i in range(0, len(dates), per_page)]
+
+
+def test_pagination_stops_at_first_page_older_than_range():
+    # Pages cover roughly five weeks each, from 2023-12-31 back
+    pages = weekly_pages(datetime(2023, 12, 31), 10)
+    scraper = FakeScraper(pages, datetime(2023, 10, 1), datetime(2023, 11, 15))
+
+    reviews = scraper.scrape()
+
+    assert reviews
+    assert all('2023-10-01' <= review.date <= '2023-11-15' for review in reviews)
+    # Page 1 is newer than the range, pages 2-3 overlap it, page 4 is entirely older
+    assert scraper.fetched == [1, 2, 3, 4]
+    assert scraper.complete
+    assert scraper.skipped_newer > 0 and scraper.skipped_older > 0
+
+
+def test_resume_continues_from_checkpoint(tmp_path):
+    pages = weekly_pages(datetime(2023, 12, 31), 4)
+    start, end = datetime(2023, 1, 1), datetime(2023, 12, 31)
+    path = str(tmp_path / 'run.checkpoint')
+
+    store = CheckpointStore(path)
+    first = FakeScraper(pages, start, end, fail_at=3)
+    first.checkpoint = lambda state: store.save('Acme', 'fake', start, end, None, state)
+    assert len(first.scrape()) == 10
+    assert first.truncated_at_page == 3
+
+    resumed_store = CheckpointStore(path, resume=True)
+    assert resumed_store.get('Acme', 'fake', start, datetime(2023, 6, 30)) is None
+    assert resumed_store.get('Acme', 'fake', start, end, ['date', 'rating']) is None
+    state = resumed_store.get('Acme', 'fake', start, end)
+    assert state['last_page'] == 2 and not state['done']
+
+    second = FakeScraper(pages, start, end)
+    second.resume(state)
+    reviews = second.scrape()
+
+    assert second.fetched[0] == 3
+    assert len(reviews) == 20
+    assert len({review.date for review in reviews}) == 20
+
+
+def test_unsorted_sources_page_past_older_pages():
+    pages = weekly_pages(datetime(2023, 12, 31), 6)
+    # Shuffled listing: the in-range page comes after an entirely older one
+    pages = [pages[0], pages[5], pages[1], pages[2]]
+    scraper = FakeScraper(pages, datetime(2023, 10, 1), datetime(2023, 11, 15))
+    scraper.NEWEST_FIRST = False
+
+    reviews = scraper.scrape()
+
+    in_range = [date for page in pages for date in page if '2023-10-01' <= date <= '2023-11-15']
+    assert sorted(review.date for review in reviews) == sorted(in_range)
+    # Paged until the listing ended instead of stopping at page 2
+    assert scraper.fetched == [1, 2, 3, 4, 5]
+
+
+def test_built_in_sources_request_newest_first():
+    from scrapers.registry import available_sources, get_scraper_class
+    for key in available_sources():
+        scraper_class = get_scraper_class(key)
+        assert scraper_class.NEWEST_FIRST, key
+        scraper = scraper_class('Acme', datetime(2023, 1, 1), datetime(2023, 12, 31))
+        for page in (1, 2):
+            url = scraper._page_url(scraper.BASE_URL + '/acme', page)
+            assert any(sort in url for sort in ('order=most_recent', 'sort_type=most_recent', 'sort=recency')), url
@@ -0,0 +1,45 @@
+"""Tests for the seen-review Bloom filters (bloom.py)"""
+import bloom
+import jsonio
+from bloom import BloomFilter, filter_path, rebuild, review_key
+
+
+def test_round_trip_through_file(tmp_path):
+    path = str(tmp_path / 'acme' / 'g2.bloom')
+    keys = [review_key('G2', '2023-01-01', f'Reviewer {i}', f'Title {i}') for i in range(500)]
+    with BloomFilter(path, capacity=1000, error_rate=0.01) as seen:
+        for key in keys:
+            assert seen.add(key)
+        assert not seen.add(keys[0])
+
+    with BloomFilter(path) as seen:
+        assert len(seen) == 500
+        assert all(key in seen for key in keys)
+        unseen = sum(review_key('G2', '2023-01-02', f'Other {i}', 'x') in seen for i in range(2000))
+    # Well under capacity, so false positives stay rare
+    assert unseen < 20
+
+
+def test_rebuild_from_results_file(tmp_path):
+    results = {'company': 'Acme', 'start_date': '2023-01-01', 'end_date': '2023-01-31',
+               'sources': {'G2': {'total_reviews': 2, 'reviews': [
+                   {'title': 'A', 'date': '2023-01-02', 'reviewer_name': 'Jane', 'source': 'G2'},
+                   {'title': 'B', 'date': '2023-01-03', 'reviewer_name': 'Sam', 'source': 'G2'}]}}}
+    json_file = str(tmp_path / 'results.json')
+    jsonio.dump(results, json_file)
+    directory = str(tmp_path / 'seen')
+
+    added = rebuild([json_file], directory, capacity=100, error_rate=0.01)
+
+    path = filter_path('Acme', 'G2', directory)
+    assert added == {path: 2}
+    with BloomFilter(path) as seen:
+        assert review_key('G2', '2023-01-02', 'Jane', 'A') in seen
+        assert review_key('G2', '2023-01-03', 'Sam', 'B') in seen
+
+
+def test_mark_seen_adds_keys_per_source(tmp_path):
+    directory = str(tmp_path)
+    keys = {'G2': [review_key('G2', '2023-01-02', 'Jane', 'A')], 'Capterra': []}
+    assert bloom.mark_seen('Acme', keys, directory) == 1
+    assert bloom.mark_seen('Acme', keys, directory) == 0
@@ -0,0 +1,35 @@
+"""Tests for the date interval arithmetic of the result cache (cache.py)"""
+from datetime import datetime
+
+from cache import ResultCache, find_gaps, merge_intervals
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent():
+    assert merge_intervals([('2023-03-01', '2023-03-31'), ('2023-01-01', '2023-01-31'),
+                            ('2023-02-01', '2023-02-10'), ('2023-01-15', '2023-01-20')]) == \
+        [('2023-01-01', '2023-02-10'), ('2023-03-01', '2023-03-31')]
+
+
+def test_merge_intervals_keeps_separate_intervals():
+    assert merge_intervals([('2023-01-01', '2023-01-10'), ('2023-01-12', '2023-01-20')]) == \
+        [('2023-01-01', '2023-01-10'), ('2023-01-12', '2023-01-20')]
+
+
+def test_find_gaps():
+    covered = [('2023-01-10', '2023-01-20'), ('2023-02-01', '2023-02-28')]
+    assert find_gaps(covered, '2023-01-01', '2023-03-15') == [
+        ('2023-01-01', '2023-01-09'), ('2023-01-21', '2023-01-31'), ('2023-03-01', '2023-03-15')]
+    assert find_gaps(covered, '2023-01-12', '2023-01-18') == []
+    assert find_gaps(covered, '2023-01-15', '2023-02-05') == [('2023-01-21', '2023-01-31')]
+    assert find_gaps([], '2023-01-01', '2023-01-02') == [('2023-01-01', '2023-01-02')]
+
+
+def test_missing_window_spans_gaps(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    review = {'title': 'Fine', 'date': '2023-01-15', 'reviewer_name': 'Jane', 'source': 'G2'}
+    cache.update('Acme', 'G2', [review], datetime(2023, 1, 1), datetime(2023, 1, 31), complete=True)
+
+    assert cache.missing_window('Acme', 'G2', datetime(2023, 1, 5), datetime(2023, 1, 25)) is None
+    assert cache.missing_window('Acme', 'G2', datetime(2023, 1, 5), datetime(2023, 2, 10)) == \
+        (datetime(2023, 2, 1), datetime(2023, 2, 10))
+    assert cache.reviews('Acme', 'G2', datetime(2023, 1, 10), datetime(2023, 1, 20)) == [review]
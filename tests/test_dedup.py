@@ -0,0 +1,40 @@
+"""Tests for MinHash/LSH near-duplicate detection (dedup.py)"""
+import pytest
+
+pytest.importorskip('numpy')
+
+from dedup import NearDuplicateIndex, remove_near_duplicates
+
+
+TEXT = ("The onboarding took a single afternoon and the team picked it up quickly. Pricing is fair "
+        "for what you get, and support answered every ticket within a day. Integrations with our "
+        "calendar and chat tools worked out of the box.")
+
+
+def test_near_duplicate_is_found():
+    index = NearDuplicateIndex()
+    assert index.add('first', TEXT) is None
+    match = index.add('copy', TEXT.replace('a single afternoon', 'one afternoon'))
+    assert match is not None
+    assert match[0] == 'first'
+    assert match[1] >= index.threshold
+
+
+def test_unrelated_text_is_kept():
+    index = NearDuplicateIndex()
+    index.add('first', TEXT)
+    assert index.add('other', "Reporting is limited and exports often time out on large projects, "
+                              "so we moved our dashboards to another tool after three months.") is None
+    assert len(index) == 2
+
+
+def test_remove_near_duplicates_across_sources():
+    results = {'sources': {
+        'G2': {'total_reviews': 1, 'reviews': [{'description': TEXT}]},
+        'Capterra': {'total_reviews': 2, 'reviews': [{'description': TEXT + ' Recommended.'},
+                                                     {'description': 'Short and different.'}]},
+    }}
+    removed = remove_near_duplicates(results)
+    assert [(key[1], kept[1]) for key, kept, _ in removed] == [('Capterra', 'G2')]
+    assert results['sources']['Capterra']['total_reviews'] == 1
+    assert results['sources']['Capterra']['near_duplicates_removed'] == 1
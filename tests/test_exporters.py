@@ -0,0 +1,65 @@
+"""Tests for CSV and Parquet exporters (exporters.py)"""
+import csv
+
+import pytest
+
+import exporters
+import jsonio
+
+RESULTS = {
+    'company': 'Acme',
+    'sources': {
+        'G2': {'reviews': [
+            {'title': 'Good', 'description': 'Works, mostly', 'date': '2023-01-02', 'rating': 4.0,
+             'reviewer_name': 'Ann', 'url': 'https://g2.example/1'},
+            {'title': 'Bad', 'description': 'Line one\nline two', 'date': '2023-01-01', 'rating': None,
+             'reviewer_name': 'Bob', 'url': 'https://g2.example/2'},
+        ]},
+        'Capterra': {'reviews': [
+            {'title': 'Ok', 'description': '', 'date': '2023-01-03', 'rating': 3.0,
+             'reviewer_name': None, 'url': 'https://capterra.example/1', 'source': 'Capterra'},
+        ]},
+    },
+}
+
+
+def test_result_fields_follow_projection_and_optional_columns():
+    assert exporters.result_fields(RESULTS) == exporters.FIELDS
+    projected = dict(RESULTS, fields=['rating', 'date'])
+    assert exporters.result_fields(projected) == ['company', 'source', 'date', 'rating']
+    scored = {'company': 'Acme', 'sources': {'G2': {'reviews': [{'rating': 5.0, 'sentiment': 0.5}]}}}
+    assert exporters.result_fields(scored)[-1] == 'sentiment'
+
+
+@pytest.mark.parametrize('name', ['reviews.csv', 'reviews.csv.gz'])
+def test_csv_has_one_row_per_review(tmp_path, name):
+    path = str(tmp_path / name)
+    assert exporters.CSVExporter().export(RESULTS, path) == 3
+    with jsonio.open_file(path, 'rt') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['source'] for row in rows] == ['G2', 'G2', 'Capterra']
+    assert {row['company'] for row in rows} == {'Acme'}
+    assert rows[1]['description'] == 'Line one\nline two'
+    assert rows[1]['rating'] == ''
+
+
+def test_parquet_round_trip_keeps_types(tmp_path):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'reviews.parquet')
+    assert exporters.ParquetExporter().export(RESULTS, path) == 3
+
+    df = pd.read_parquet(path)
+    assert list(df.columns) == exporters.FIELDS
+    assert str(df['date'].dtype).startswith('datetime64')
+    assert df['rating'].dtype == 'float64' and df['rating'].isna().sum() == 1
+    assert isinstance(df['source'].dtype, pd.CategoricalDtype)
+    assert df['title'].tolist() == ['Good', 'Bad', 'Ok']
+
+
+def test_export_file_reads_saved_results(tmp_path):
+    json_file = str(tmp_path / 'reviews.json.gz')
+    jsonio.dump(RESULTS, json_file)
+    assert exporters.export_file(json_file, str(tmp_path / 'reviews.csv'), 'CSV') == 3
+    with pytest.raises(ValueError, match='Available formats'):
+        exporters.get_exporter('xlsx')
@@ -0,0 +1,102 @@
+"""Tests for the per-host concurrency limiter and circuit breaker (scrapers/fetch.py)"""
+import time
+
+from scrapers.fetch import AdaptiveLimiter, CircuitBreaker
+
+
+def run_round(limiter: AdaptiveLimiter, latency: float, status: int = 200):
+    """Start as many requests as the limit allows, then complete them all"""
+    tickets = [limiter.acquire() for _ in range(max(int(limiter.limit), 1))]
+    for ticket in tickets:
+        limiter.release(ticket, latency=latency, status=status)
+
+
+def test_limit_grows_while_latency_is_stable():
+    limiter = AdaptiveLimiter('example.com', initial=1, maximum=8)
+    for _ in range(30):
+        run_round(limiter, 0.1)
+    assert limiter.limit > 4
+    assert limiter.baseline_p95 == 0.1
+
+
+def test_limit_is_cut_once_per_window():
+    limiter = AdaptiveLimiter('example.com', initial=8, maximum=8)
+    tickets = [limiter.acquire() for _ in range(8)]
+    for ticket in tickets:
+        limiter.release(ticket, status=429)
+    assert limiter.limit == 4
+
+
+def test_permanently_slower_host_is_rebaselined():
+    limiter = AdaptiveLimiter('example.com', initial=8, maximum=8, rebaseline_after=3)
+    for _ in range(5):
+        run_round(limiter, 0.1)
+    assert limiter.baseline_p95 == 0.1
+
+    # The host now answers five times slower for good
+    for _ in range(10):
+        run_round(limiter, 0.5)
+    assert limiter.baseline_p95 == 0.5
+    assert limiter.limit < 4
+
+    # At the new baseline the limit recovers instead of staying at the minimum
+    for _ in range(30):
+        run_round(limiter, 0.5)
+    assert limiter.limit > 4
+
+
+def paced_request(limiter: AdaptiveLimiter, interval: float, status: int = 200) -> float:
+    """Issue one request right after the previous one and return how long it waited to start"""
+    started = time.monotonic()
+    ticket = limiter.acquire(interval)
+    waited = time.monotonic() - started
+    limiter.release(ticket, latency=0.001, status=status)
+    return waited
+
+
+def test_pacing_speeds_up_sequential_requests_as_the_limit_grows():
+    limiter = AdaptiveLimiter('example.com', initial=1, maximum=4)
+    paced_request(limiter, 0.05)
+    waits = [paced_request(limiter, 0.05) for _ in range(25)]
+    assert waits[0] >= 0.045
+    assert limiter.limit == 4
+    assert waits[-1] < 0.025
+
+    # A 429 halves the limit, so requests start twice as far apart again
+    paced_request(limiter, 0.05, status=429)
+    assert limiter.limit == 2
+    paced_request(limiter, 0.05)
+    assert paced_request(limiter, 0.05) >= 0.02
+
+
+def test_unpaced_sequential_requests_do_not_grow_the_limit():
+    limiter = AdaptiveLimiter('example.com', initial=1, maximum=4)
+    for _ in range(20):
+        assert paced_request(limiter, 0.0) < 0.01
+    # One request at a time never waits, so the limit stops growing once it exceeds one
+    assert limiter.limit == 2
+
+
+def test_circuit_breaker_opens_and_closes_after_trial():
+    breaker = CircuitBreaker('example.com', failure_threshold=2, reset_timeout=0.05)
+    breaker.record(False)
+    assert breaker.state == 'closed'
+    breaker.record(False)
+    assert breaker.state == 'open'
+
+    started = time.monotonic()
+    breaker.before_request()
+    assert time.monotonic() - started >= 0.04
+    assert breaker.state == 'half-open'
+
+    breaker.record(True)
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+
+
+def test_circuit_breaker_reopens_on_failed_trial():
+    breaker = CircuitBreaker('example.com', failure_threshold=1, reset_timeout=0.01)
+    breaker.record(False)
+    breaker.before_request()
+    breaker.record(False)
+    assert breaker.state == 'open'
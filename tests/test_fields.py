@@ -0,0 +1,56 @@
+"""Tests for the --fields projection (main.validate_fields, Review.to_dict and BaseScraper._wants)"""
+from datetime import datetime
+
+import pytest
+from bs4 import BeautifulSoup
+
+import main
+from bloom import review_key
+from scrapers.base_scraper import Review
+from scrapers.g2_scraper import G2Scraper
+
+PAGE = BeautifulSoup(
+    '<div data-test="review-card"><time>2023-03-01</time><h3>Solid</h3>'
+    '<p data-test="review-body">Does the job</p><span data-test="star-rating">4.5/5</span>'
+    '<div data-test="reviewer-name">Ann</div></div>'
+    '<div data-test="review-card"><time>2023-03-02</time><h3>Meh</h3>'
+    '<p data-test="review-body">Slow</p><span data-test="star-rating">2/5</span>'
+    '<div data-test="reviewer-name">Bob</div></div>',
+    'html.parser'
+)
+
+
+def test_validate_fields_adds_the_date_and_keeps_output_order():
+    assert main.validate_fields(None) is None
+    assert main.validate_fields(' rating, title ,rating,') == ['title', 'date', 'rating']
+    with pytest.raises(ValueError, match='stars'):
+        main.validate_fields('rating,stars')
+
+
+def test_review_to_dict_projects_fields():
+    review = Review('Solid', 'Does the job', '2023-03-01', 4.5, 'Ann', 'G2', 'https://g2.example')
+    assert list(review.to_dict()) == Review.FIELDS
+    assert review.to_dict(['rating', 'date']) == {'date': '2023-03-01', 'rating': 4.5}
+
+
+def test_unprojected_fields_are_not_extracted():
+    scraper = G2Scraper('Acme', datetime(2023, 1, 1), datetime(2023, 12, 31))
+    scraper.fields = ['date', 'rating']
+    reviews = scraper._extract_reviews(PAGE, 'https://g2.example')
+    assert [(r.date, r.rating, r.title, r.description, r.reviewer_name) for r in reviews] == [
+        ('2023-03-01', 4.5, None, None, None), ('2023-03-02', 2.0, None, None, None)]
+
+    scraper.fields = None
+    assert [r.title for r in scraper._extract_reviews(PAGE, 'https://g2.example')] == ['Solid', 'Meh']
+
+
+def test_seen_filter_still_gets_identifying_fields():
+    scraper = G2Scraper('Acme', datetime(2023, 1, 1), datetime(2023, 12, 31))
+    scraper.fields = ['date', 'rating']
+    scraper.seen_filter = {review_key('G2', '2023-03-01', 'Ann', 'Solid')}
+    assert not scraper._wants('description')
+    assert scraper._wants('title') and scraper._wants('reviewer_name')
+
+    reviews = scraper._extract_reviews(PAGE, 'https://g2.example')
+    assert [(r.date, r.title) for r in reviews] == [('2023-03-02', 'Meh')]
+    assert scraper.seen_skipped == 1
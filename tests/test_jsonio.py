@@ -0,0 +1,69 @@
+"""Tests for compressed JSON file I/O (jsonio.py)"""
+import gzip
+
+import pytest
+
+import jsonio
+from config import OUTPUT_CONFIG
+
+DATA = {'company': 'Acmé', 'sources': {'G2': {'reviews': [{'rating': 4.5, 'title': 'Grüße'}]}}}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def json_backend(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    monkeypatch.setitem(OUTPUT_CONFIG, 'json_backend', request.param)
+    return request.param
+
+
+def test_dumps_round_trips_with_either_backend(json_backend):
+    assert jsonio.backend() == ('orjson' if json_backend == 'orjson' else 'json')
+    for compact in (False, True):
+        text = jsonio.dumps(DATA, compact)
+        assert isinstance(text, bytes)
+        assert jsonio.loads(text) == jsonio.loads(text.decode('utf-8')) == DATA
+    assert b'\n' not in jsonio.dumps(DATA, compact=True)
+    assert b'\n  "company"' in jsonio.dumps(DATA)
+
+
+@pytest.mark.parametrize('name,magic', [
+    ('reviews.json', b'{'),
+    ('reviews.json.gz', b'\x1f\x8b'),
+    ('reviews.json.zst', b'\x28\xb5\x2f\xfd'),
+])
+def test_compression_follows_the_extension(tmp_path, name, magic):
+    if name.endswith('.zst'):
+        pytest.importorskip('zstandard')
+    path = str(tmp_path / name)
+    jsonio.check_available(path)
+    jsonio.dump(DATA, path)
+    with open(path, 'rb') as f:
+        assert f.read(len(magic)) == magic
+    assert jsonio.load(path) == DATA
+
+
+def test_text_mode_reads_and_writes_utf8(tmp_path):
+    path = str(tmp_path / 'rows.csv.gz')
+    with jsonio.open_file(path, 'wt') as f:
+        f.write('a,b\r\nÄ,1\r\n')
+    with gzip.open(path, 'rb') as f:
+        assert f.read() == 'a,b\r\nÄ,1\r\n'.encode('utf-8')
+    with jsonio.open_file(path, 'rt') as f:
+        assert f.read().splitlines() == ['a,b', 'Ä,1']
+
+
+def test_missing_zstd_fails_before_writing(tmp_path, monkeypatch):
+    import builtins
+    real_import = builtins.__import__
+
+    def no_zstd(name, *args, **kwargs):
+        if name in ('zstandard', 'compression'):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, '__import__', no_zstd)
+    jsonio.check_available(str(tmp_path / 'reviews.json.gz'))
+    with pytest.raises(ImportError, match='zstandard'):
+        jsonio.check_available(str(tmp_path / 'reviews.json.zst'))
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,47 @@
+"""Tests for the incremental results reader (jsonstream.py)"""
+import json
+
+import pytest
+
+import jsonio
+import jsonstream
+import schema
+
+
+def make_results():
+    reviews = [{'title': f'Title "{i}" é', 'description': 'Line one\nline two ' * (i % 3),
+                'date': f'2023-01-{i + 1:02d}', 'rating': i % 5 or None, 'reviewer_name': f'Reviewer {i % 4}',
+                'source': 'G2', 'url': 'https://example.com/acme'} for i in range(25)]
+    return {'company': 'Acme', 'start_date': '2023-01-01', 'end_date': '2023-01-31',
+            'sources': {'G2': {'total_reviews': len(reviews), 'reviews': reviews},
+                        'Capterra': {'error': 'blocked', 'total_reviews': 0}}}
+
+
+@pytest.mark.parametrize('compact', [False, True])
+@pytest.mark.parametrize('normalized', [False, True])
+def test_reviews_match_json_load_with_small_chunks(tmp_path, monkeypatch, compact, normalized):
+    # Chunks far smaller than one review force values to span reads
+    monkeypatch.setattr(jsonstream, 'CHUNK_SIZE', 7)
+    results = make_results()
+    path = str(tmp_path / 'results.json')
+    jsonio.dump(schema.normalize(results) if normalized else results, path, compact=compact)
+
+    with open(path, encoding='utf-8') as f:
+        loaded = json.load(f)
+    expected = (schema.denormalize(loaded) if normalized else loaded)['sources']['G2']['reviews']
+    assert expected == results['sources']['G2']['reviews']
+
+    streamed = list(jsonstream.reviews(path))
+    assert [company for company, _ in streamed] == ['Acme'] * len(expected)
+    assert [review for _, review in streamed] == expected
+
+
+def test_walk_reports_header_and_source_fields(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonstream, 'CHUNK_SIZE', 3)
+    path = str(tmp_path / 'results.json')
+    jsonio.dump(make_results(), path)
+
+    events = [(kind, name) for kind, name, _ in jsonstream.walk(path) if kind != 'review']
+    assert ('header', 'company') in events
+    assert ('source_field', 'Capterra') in events
+    assert ('source_end', 'G2') in events
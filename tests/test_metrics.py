@@ -0,0 +1,36 @@
+"""Tests for the Prometheus exporter (metrics.py)"""
+import socket
+from urllib.request import urlopen
+
+from metrics import MetricsRegistry, PrometheusExporter
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_exporter_serves_on_loopback_by_default():
+    registry = MetricsRegistry()
+    registry.inc('scraper_requests_total', source='G2')
+    exporter = PrometheusExporter(registry, port=free_port()).start()
+    try:
+        assert exporter._httpd.server_address[0] == '127.0.0.1'
+        with urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            assert 'scraper_requests_total' in response.read().decode('utf-8')
+    finally:
+        exporter.stop()
+
+
+def test_busy_metrics_port_is_reported(monkeypatch, capsys):
+    import main
+
+    with socket.socket() as busy:
+        busy.bind(('127.0.0.1', 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+        monkeypatch.setattr('sys.argv', ['main.py', '--company', 'Acme', '--start-date', '2023-01-01',
+                                         '--end-date', '2023-01-31', '--metrics-port', str(port)])
+        assert main.main() == 1
+    assert '[ERROR] Cannot serve metrics on 127.0.0.1:' in capsys.readouterr().out
@@ -0,0 +1,120 @@
+"""Tests for the dry-run planner (planner.py)"""
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+import planner
+from config import HOST_CONCURRENCY_CONFIG
+from scrapers.base_scraper import BaseScraper, Review
+
+NEWEST = datetime(2023, 12, 31)
+
+
+def daily_dates(count: int):
+    """One review a day up to NEWEST, oldest first as estimate_reviews expects"""
+    return [NEWEST - timedelta(days=i) for i in reversed(range(count))]
+
+
+def test_estimate_extrapolates_the_first_page_rate():
+    estimate = planner.estimate_reviews(daily_dates(10), 10, datetime(2023, 11, 1), datetime(2023, 11, 30))
+    # One review a day: December's 31 reviews come before November's 30
+    assert estimate == {'per_day': 1.0, 'newer': 31, 'in_range': 30}
+
+    # Five reviews in ten days; a range reaching past the newest review ends there
+    sample = [datetime(2023, 12, day) for day in (22, 24, 27, 29, 31)]
+    overlapping = planner.estimate_reviews(sample, 5, datetime(2023, 12, 1), datetime(2024, 6, 30))
+    assert overlapping == {'per_day': 0.5, 'newer': 0, 'in_range': 16}
+
+    assert planner.estimate_reviews([], 0, NEWEST, NEWEST)['in_range'] == 0
+
+    # Unsorted first pages do not tell how many reviews precede the range
+    unsorted = planner.estimate_reviews(daily_dates(10), 10, datetime(2023, 11, 1), datetime(2023, 11, 30),
+                                        newest_first=False)
+    assert unsorted == {'per_day': 1.0, 'newer': 0, 'in_range': 30}
+
+
+def test_paced_requests_speed_up_as_the_host_limit_grows(monkeypatch):
+    # 2s apart at a limit of 1, then 1s at a limit of 2, then the last request's latency
+    assert planner.paced_seconds(3, 0.5, 2.0, 'reviews.example') == 3.5
+    assert planner.paced_seconds(3, 0.5, 0.0, 'reviews.example') == 1.5
+    assert planner.paced_seconds(0, 0.5, 2.0, 'reviews.example') == 0.0
+    monkeypatch.setitem(HOST_CONCURRENCY_CONFIG, 'hosts', {'slow.example': {'maximum': 1}})
+    assert planner.paced_seconds(3, 0.5, 2.0, 'slow.example') == 4.5
+
+
+def test_wall_time_packs_longest_jobs_first():
+    assert planner.wall_time([5, 4, 3, 3, 1], 1) == 16
+    assert planner.wall_time([5, 4, 3, 3, 1], 2) == 8
+    assert planner.wall_time([5, 4, 3], 8) == 5
+    assert planner.wall_time([], 2) == 0
+
+
+class FakeResponse:
+    content = b'<html></html>'
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+
+class SampleScraper(BaseScraper):
+    """Resolves in one request and serves a first page of one review a day up to NEWEST"""
+
+    NEWEST_FIRST = True
+
+    def __init__(self, company_name, start_date, end_date):
+        super().__init__(company_name, start_date, end_date, 'G2')
+        self.request_delay = 2.0
+
+    def _find_company_url(self):
+        self.requests_made += 1
+        self.request_seconds += 0.5
+        return 'https://reviews.example/acme'
+
+    def _page_url(self, company_url, page):
+        return f"{company_url}?page={page}"
+
+    def _fetch(self, url, method='GET', **kwargs):
+        self.requests_made += 1
+        self.request_seconds += 0.5
+        return FakeResponse()
+
+    def _extract_reviews(self, soup: BeautifulSoup, company_url):
+        return [Review('Title', 'Text', date.strftime('%Y-%m-%d'), 4.0, 'Jane', 'G2', company_url)
+                for date in daily_dates(10)]
+
+
+def test_plan_counts_pages_requests_and_time(monkeypatch):
+    monkeypatch.setattr(planner, 'get_scraper_class', lambda key: SampleScraper)
+    plan = planner.plan_source('Acme', datetime(2023, 11, 1), datetime(2023, 11, 30), 'g2')
+
+    assert plan['reviews'] == 30 and plan['per_page'] == 10
+    # 61 reviews to page through, plus the page older than the range that ends pagination
+    assert plan['pages'] == 8
+    assert plan['requests'] == 9
+    # Starts 2s, 1s, 0.8s, ... apart as the host limit grows, until the latency dominates
+    assert plan['seconds'] == 7.2
+    assert plan['bytes'] > 0
+
+    totals = planner.plan_scrape(['Acme', 'Globex'], datetime(2023, 11, 1), datetime(2023, 11, 30), 'g2', workers=2)
+    assert totals['requests'] == 18
+    assert totals['seconds'] == plan['seconds']
+    assert totals['hosts'] == {'reviews.example': 18}
+
+
+def test_unsorted_sources_are_planned_as_a_lower_bound(monkeypatch, capsys):
+    monkeypatch.setattr(SampleScraper, 'NEWEST_FIRST', False)
+    monkeypatch.setattr(planner, 'get_scraper_class', lambda key: SampleScraper)
+    plan = planner.plan_scrape(['Acme'], datetime(2023, 11, 1), datetime(2023, 11, 30), 'g2')
+
+    job = plan['jobs'][0]
+    assert job['unsorted'] and job['pages'] == 4
+    planner.print_plan(plan)
+    assert 'does not sort reviews newest first' in capsys.readouterr().out
+
+
+def test_plan_reports_unresolved_companies(monkeypatch):
+    monkeypatch.setattr(SampleScraper, '_find_company_url', lambda self: None)
+    monkeypatch.setattr(planner, 'get_scraper_class', lambda key: SampleScraper)
+    plan = planner.plan_source('Nobody', datetime(2023, 11, 1), datetime(2023, 11, 30), 'g2')
+    assert 'Could not find' in plan['error'] and plan['requests'] == 0
@@ -0,0 +1,65 @@
+"""Tests for per-stage profiling (profiling.py)"""
+import os
+import threading
+
+from profiling import StageProfiler
+
+
+def test_sequential_stages_report_peak_memory(tmp_path):
+    profiler = StageProfiler(str(tmp_path)).start()
+    try:
+        with profiler.stage('G2', 'parse'):
+            data = bytearray(1 << 20)
+        del data
+    finally:
+        profiler.stop()
+    peak = profiler.summary()['G2']['stages']['parse']['peak_memory_bytes']
+    assert peak >= 1 << 20
+
+
+def test_overlapping_threads_disable_peak_memory(tmp_path):
+    profiler = StageProfiler(str(tmp_path)).start()
+    barrier = threading.Barrier(2)
+
+    def run(source):
+        with profiler.stage(source, 'fetch'):
+            barrier.wait(timeout=5)
+
+    threads = [threading.Thread(target=run, args=(source,)) for source in ('G2', 'Capterra')]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        profiler.stop()
+    report = profiler.summary()
+    assert not profiler.memory_peaks
+    assert not profiler.cpu_profiles
+    assert report['G2']['stages']['fetch']['peak_memory_bytes'] is None
+    assert report['Capterra']['stages']['fetch']['calls'] == 1
+    assert profiler.write() == os.path.join(str(tmp_path), 'summary.json')
+    assert os.listdir(str(tmp_path)) == ['summary.json']
+
+
+class BusyProfile:
+    """Stands in for cProfile on Python 3.12+ while another thread profiles"""
+
+    def enable(self):
+        raise ValueError('Another profiling tool is already active')
+
+    def disable(self):
+        pass
+
+
+def test_profiler_already_active_stops_cpu_profiles(tmp_path, monkeypatch):
+    profiler = StageProfiler(str(tmp_path)).start()
+    monkeypatch.setattr(profiler, '_profile_for', lambda key: BusyProfile())
+    try:
+        with profiler.stage('G2', 'fetch'):
+            with profiler.stage('G2', 'resolve'):
+                pass
+    finally:
+        profiler.stop()
+    assert not profiler.cpu_profiles
+    assert profiler.summary()['G2']['stages']['fetch']['calls'] == 1
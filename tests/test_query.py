@@ -0,0 +1,61 @@
+"""Tests for streaming top-k queries over output files (query.py)"""
+import jsonio
+from query import ReviewFilter, run_query
+
+
+def write_results(path, company, reviews_by_source, fields=None):
+    results = {'company': company, 'start_date': '2023-01-01', 'end_date': '2023-12-31'}
+    if fields is not None:
+        results['fields'] = fields
+    results['sources'] = {name: {'total_reviews': len(reviews), 'reviews': reviews}
+                          for name, reviews in reviews_by_source.items()}
+    jsonio.dump(results, str(path))
+    return str(path)
+
+
+def make_reviews(source, count, offset=0):
+    return [{'title': f'{source} review {i}', 'description': 'Pricing is fair' if i % 2 else 'Slow support',
+             'date': f'2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}', 'rating': float((i * 7 + offset) % 5 + 1),
+             'reviewer_name': f'Reviewer {i}', 'source': source, 'url': None} for i in range(count)]
+
+
+def test_top_k_matches_full_sort(tmp_path):
+    g2, capterra = make_reviews('G2', 40), make_reviews('Capterra', 30, offset=2)
+    files = [write_results(tmp_path / 'a.json', 'Acme', {'G2': g2}),
+             write_results(tmp_path / 'b.json', 'Acme', {'Capterra': capterra})]
+
+    matched, best = run_query(files, ReviewFilter(contains=['pricing']), k=5)
+
+    candidates = [review for review in g2 + capterra if 'Pricing' in review['description']]
+    assert matched == len(candidates)
+    expected = sorted(candidates, key=lambda review: (review['rating'], review['date']), reverse=True)[:5]
+    assert [(review['rating'], review['date']) for review in best] == \
+        [(review['rating'], review['date']) for review in expected]
+    assert all(review['company'] == 'Acme' for review in best)
+
+
+def test_lowest_and_recent(tmp_path):
+    reviews = make_reviews('G2', 20)
+    files = [write_results(tmp_path / 'a.json', 'Acme', {'G2': reviews})]
+
+    _, lowest = run_query(files, ReviewFilter(), k=3, lowest=True)
+    assert [review['rating'] for review in lowest] == sorted(review['rating'] for review in reviews)[:3]
+
+    _, recent = run_query(files, ReviewFilter(start_date='2023-06-01'), k=3, sort='recent')
+    assert [review['date'] for review in recent] == \
+        sorted((review['date'] for review in reviews if review['date'] >= '2023-06-01'), reverse=True)[:3]
+
+
+def test_count_only(tmp_path):
+    files = [write_results(tmp_path / 'a.json', 'Acme', {'G2': make_reviews('G2', 10)})]
+    matched, best = run_query(files, ReviewFilter(company='acme', min_rating=3), k=None)
+    assert matched == sum(review['rating'] >= 3 for review in make_reviews('G2', 10))
+    assert best == []
+
+
+def test_source_filter_uses_block_name_of_projected_files(tmp_path):
+    projected = [{'date': review['date'], 'rating': review['rating']} for review in make_reviews('G2', 6)]
+    files = [write_results(tmp_path / 'a.json', 'Acme',
+                           {'G2': projected, 'Capterra': projected[:2]}, fields=['date', 'rating'])]
+    matched, _ = run_query(files, ReviewFilter(source='g2'), k=None)
+    assert matched == 6
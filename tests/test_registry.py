@@ -0,0 +1,62 @@
+"""Tests for the lazy source registry (scrapers/registry.py)"""
+import importlib.metadata
+import os
+import subprocess
+import sys
+
+import pytest
+
+from scrapers import registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_validating_sources_imports_no_scraper():
+    code = (
+        "import sys\n"
+        "from scrapers.registry import available_sources, is_valid_source, resolve_sources\n"
+        "assert is_valid_source('G2') and not is_valid_source('yelp')\n"
+        "assert resolve_sources('all') == available_sources()\n"
+        "assert not [m for m in sys.modules if m.startswith(('scrapers.g2', 'bs4', 'requests'))], sys.modules\n"
+        "from scrapers.registry import get_scraper_class\n"
+        "assert get_scraper_class('g2').__name__ == 'G2Scraper'\n"
+        "assert 'scrapers.g2_scraper' in sys.modules and 'scrapers.capterra_scraper' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    """Register an entry point 'Yelp' (and one shadowing the built-in 'g2') from a module in tmp_path"""
+    (tmp_path / 'yelp_plugin.py').write_text(
+        "from scrapers.base_scraper import BaseScraper\n\n"
+        "class YelpScraper(BaseScraper):\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = [
+        importlib.metadata.EntryPoint('Yelp', 'yelp_plugin:YelpScraper', registry.ENTRY_POINT_GROUP),
+        importlib.metadata.EntryPoint('g2', 'yelp_plugin:YelpScraper', registry.ENTRY_POINT_GROUP),
+        importlib.metadata.EntryPoint('broken', 'yelp_plugin:Missing', registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(importlib.metadata, 'entry_points',
+                        lambda group=None: [ep for ep in entry_points if ep.group == group])
+    monkeypatch.setattr(registry, '_plugin_sources', None)
+    monkeypatch.setattr(registry, '_loaded_classes', {})
+
+
+def test_entry_point_sources_are_registered(plugin):
+    assert registry.is_valid_source('yelp')
+    assert registry.available_sources()[-2:] == ['yelp', 'broken']
+    assert registry.source_display_name('yelp') == 'Yelp'
+    assert registry.get_scraper_class('yelp').__name__ == 'YelpScraper'
+    # A plugin cannot replace a built-in source
+    assert registry.get_scraper_class('g2').__name__ == 'G2Scraper'
+
+
+def test_unknown_sources_and_classes_raise(plugin):
+    with pytest.raises(KeyError):
+        registry.get_scraper_class('nope')
+    with pytest.raises(ImportError):
+        registry.get_scraper_class('broken')
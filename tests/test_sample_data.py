@@ -0,0 +1,77 @@
+"""Tests for the synthetic corpus generator (sample_data.py)"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+from sample_data import generate_corpus, generate_synthetic_reviews
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('changes', [
+    {'min_words': 50, 'max_words': 10},
+    {'min_words': 0},
+    {'sources': ['g2', 'yelp']},
+    {'rating_weights': (1, 2)},
+    {'total_reviews': -1},
+])
+def test_generate_corpus_rejects_invalid_parameters(tmp_path, changes):
+    params = {'output_dir': str(tmp_path), 'total_reviews': 10, 'workers': 1}
+    params.update(changes)
+    with pytest.raises(ValueError):
+        generate_corpus(**params)
+    assert os.listdir(str(tmp_path)) == []
+
+
+@pytest.mark.parametrize('args', [
+    ['--min-words', '50', '--max-words', '10'],
+    ['--min-words', '-3'],
+    ['--sources', 'g2,yelp'],
+    ['--rating-weights', '1,2'],
+    ['--start-date', '2023-12-31', '--end-date', '2023-01-01'],
+])
+def test_cli_reports_invalid_arguments(tmp_path, args):
+    result = subprocess.run([sys.executable, 'sample_data.py', '--generate', '--reviews', '10',
+                             '--output-dir', str(tmp_path / 'corpus'), *args],
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert 'error:' in result.stderr and 'Traceback' not in result.stderr
+
+
+def test_synthetic_reviews_are_reproducible_and_newest_first():
+    params = dict(company='Acme', source='g2', count=500, start_date=datetime(2023, 1, 1),
+                  end_date=datetime(2023, 3, 31), min_words=5, max_words=12, seed=7)
+    reviews = list(generate_synthetic_reviews(**params))
+
+    assert reviews == list(generate_synthetic_reviews(**params))
+    assert len(reviews) == 500
+    dates = [review['date'] for review in reviews]
+    assert dates == sorted(dates, reverse=True)
+    assert '2023-01-01' <= dates[-1] and dates[0] <= '2023-03-31'
+    assert all(5 <= len(review['description'].split()) <= 12 for review in reviews)
+    assert {review['rating'] for review in reviews} <= {1.0, 2.0, 3.0, 4.0, 5.0}
+    assert {review['source'] for review in reviews} == {'G2'}
+
+
+def test_rating_weights_shape_the_distribution():
+    reviews = generate_synthetic_reviews('Acme', 'capterra', 2000, datetime(2023, 1, 1), datetime(2023, 12, 31),
+                                         rating_weights=(0, 0, 0, 0, 1))
+    assert {review['rating'] for review in reviews} == {5.0}
+
+
+def test_corpus_splits_reviews_across_companies_and_sources(tmp_path):
+    stats = generate_corpus(str(tmp_path), 101, companies=['Acme', 'Globex'], sources=['g2', 'trustpilot'],
+                            workers=1)
+    assert stats['reviews'] == 101
+    counts = {}
+    for name in sorted(os.listdir(str(tmp_path))):
+        with open(os.path.join(str(tmp_path), name), encoding='utf-8') as f:
+            for line in f:
+                review = json.loads(line)
+                counts[(name, review['source'])] = counts.get((name, review['source']), 0) + 1
+    assert sorted(counts.values()) == [25, 25, 25, 26]
+    assert sorted(name for name, _ in counts) == ['acme.ndjson'] * 2 + ['globex.ndjson'] * 2
@@ -0,0 +1,33 @@
+"""Tests for the normalized results schema (schema.py)"""
+import jsonio
+import jsonstream
+import schema
+
+
+def make_results(fields=None):
+    reviews = [{'title': f'Title {i}', 'description': 'Text', 'date': f'2023-01-{i + 1:02d}', 'rating': 4.0,
+                'reviewer_name': ['Jane', 'Sam'][i % 2], 'source': 'G2', 'url': 'https://example.com/acme'}
+               for i in range(5)]
+    results = {'company': 'Acme', 'start_date': '2023-01-01', 'end_date': '2023-01-31'}
+    if fields is not None:
+        results['fields'] = fields
+        reviews = [{field: review[field] for field in fields} for review in reviews]
+    results['sources'] = {'G2': {'total_reviews': len(reviews), 'reviews': reviews}}
+    return results
+
+
+def test_round_trip():
+    results = make_results()
+    normalized = schema.normalize(results)
+    assert 'source' not in normalized['sources']['G2']['reviews'][0]
+    assert schema.denormalize(normalized) == results
+
+
+def test_round_trip_keeps_projection(tmp_path):
+    results = make_results(['date', 'rating'])
+    normalized = schema.normalize(results)
+    assert schema.denormalize(normalized) == results
+
+    path = str(tmp_path / 'results.json')
+    jsonio.dump(normalized, path)
+    assert [review for _, review in jsonstream.reviews(path)] == results['sources']['G2']['reviews']
@@ -0,0 +1,67 @@
+"""Tests for lexicon sentiment scoring and its cache (sentiment.py)"""
+import pytest
+
+import sentiment
+from config import SENTIMENT_CONFIG
+
+TEXTS = ['Great tool, love it', 'Slow and buggy', 'Nothing special', 'Great tool, love it']
+
+
+def test_score_text_polarity_negation_and_but():
+    assert sentiment.score_text('Great tool, love it') > 0.5
+    assert sentiment.score_text('Slow and buggy') < -0.5
+    assert sentiment.score_text('Nothing special') == sentiment.score_text('') == 0.0
+    assert sentiment.score_text("It doesn't work well") < 0
+    assert sentiment.score_text('very good') > sentiment.score_text('good')
+    # The clause after "but" carries the verdict
+    assert sentiment.score_text('Easy to set up but slow and buggy') < 0
+    assert sentiment.score_text('Slow at first but great') > 0
+
+
+def test_cached_scores_are_reused(tmp_path, monkeypatch):
+    scored = []
+    real_score_batch = sentiment.score_batch
+    monkeypatch.setattr(sentiment, 'score_batch', lambda texts: scored.extend(texts) or real_score_batch(texts))
+
+    with sentiment.SentimentCache(str(tmp_path / 'cache' / 'sentiment.db')) as cache:
+        scores, cached = sentiment.score_texts(TEXTS, cache, workers=1)
+        # The duplicate text is scored once
+        assert scored == TEXTS[:3]
+        assert cached == 0
+        assert scores == [sentiment.score_text(text) for text in TEXTS]
+
+    scored.clear()
+    with sentiment.SentimentCache(str(tmp_path / 'cache' / 'sentiment.db')) as cache:
+        assert sentiment.score_texts(TEXTS + ['Terrible'], cache, workers=1) == (
+            scores + [sentiment.score_text('Terrible')], 4)
+    assert scored == ['Terrible']
+
+
+def test_cache_lookups_are_chunked(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentiment.SentimentCache, 'LOOKUP_SIZE', 2)
+    with sentiment.SentimentCache(str(tmp_path / 'sentiment.db')) as cache:
+        items = [(sentiment.text_hash(str(i)), i / 10) for i in range(5)]
+        cache.put_many(items)
+        assert cache.get_many([digest for digest, _ in items] + ['missing']) == dict(items)
+
+
+def test_parallel_scores_match_in_process_scores(monkeypatch):
+    monkeypatch.setitem(SENTIMENT_CONFIG, 'min_parallel', 1)
+    texts = [f'review {i}: {"great" if i % 2 else "slow"} app' for i in range(7)]
+    assert sentiment.score_texts(texts, workers=2, batch_size=3) == (
+        sentiment.score_texts(texts, workers=1))
+
+
+def test_add_sentiment_sets_every_review(tmp_path):
+    results = {'sources': {
+        'G2': {'reviews': [{'title': 'Great', 'description': 'love it'}, {'title': 'Bad'}]},
+        'Capterra': {'reviews': []},
+    }}
+    assert sentiment.add_sentiment(results, None, workers=1) == (2, 0)
+    scores = [review['sentiment'] for review in results['sources']['G2']['reviews']]
+    assert scores[0] > 0 > scores[1]
+    assert sentiment.add_sentiment({'sources': {}}, None) == (0, 0)
+
+    cache_path = str(tmp_path / 'sentiment.db')
+    sentiment.add_sentiment(results, cache_path, workers=1)
+    assert sentiment.add_sentiment(results, cache_path, workers=1) == (2, 2)
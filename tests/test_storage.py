@@ -0,0 +1,47 @@
+"""Tests for the SQLite upsert and its full-text index (storage.py)"""
+from storage import SQLiteStorage, review_identity
+
+
+def review(**changes):
+    data = {'title': 'Great tool', 'description': 'Pricing is fair and support is quick',
+            'date': '2023-05-01', 'rating': 4.0, 'reviewer_name': 'Jane D.', 'source': 'G2',
+            'url': 'https://example.com/acme'}
+    data.update(changes)
+    return data
+
+
+def test_upsert_updates_instead_of_duplicating(tmp_path):
+    with SQLiteStorage(str(tmp_path / 'reviews.db')) as storage:
+        storage.upsert_reviews('Acme', [review()])
+        storage.upsert_reviews('Acme', [review(rating=5.0)])
+        rows = list(storage.query('Acme'))
+    assert len(rows) == 1
+    assert rows[0]['rating'] == 5.0
+
+
+def test_identity_ignores_mutable_fields():
+    assert review_identity(review()) == review_identity(review(rating=1.0, description='Edited'))
+    assert review_identity(review()) != review_identity(review(title='Another title'))
+
+
+def test_upsert_keeps_columns_missing_from_projected_reviews(tmp_path):
+    with SQLiteStorage(str(tmp_path / 'reviews.db')) as storage:
+        storage.upsert_reviews('Acme', [review()])
+        projected = {field: review()[field] for field in ('title', 'date', 'reviewer_name', 'source')}
+        storage.upsert_reviews('Acme', [projected])
+        rows = list(storage.query('Acme'))
+    assert len(rows) == 1
+    assert rows[0]['rating'] == 4.0
+    assert rows[0]['description'] == review()['description']
+
+
+def test_full_text_index_follows_updates(tmp_path):
+    with SQLiteStorage(str(tmp_path / 'reviews.db'), full_text=True) as storage:
+        storage.upsert_reviews('Acme', [review(), review(title='Slow', description='Integration keeps failing',
+                                                         reviewer_name='Sam')])
+        assert [row['title'] for row in storage.search('pricing')] == ['Great tool']
+        assert [row['title'] for row in storage.search('integration')] == ['Slow']
+
+        storage.upsert_reviews('Acme', [review(description='Onboarding was smooth')])
+        assert storage.search('pricing') == []
+        assert [row['title'] for row in storage.search('onboarding')] == ['Great tool']
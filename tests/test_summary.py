@@ -0,0 +1,36 @@
+"""Tests for summary sidecars (summary.py)"""
+import jsonio
+import summary
+
+
+RESULTS = {'company': 'Acme', 'start_date': '2023-01-01', 'end_date': '2023-01-31',
+           'sources': {'G2': {'total_reviews': 1, 'reviews': [{'date': '2023-01-02', 'rating': 4.0}]}}}
+
+
+def test_outputs_of_different_formats_get_separate_sidecars(tmp_path):
+    paths = [str(tmp_path / name) for name in ('reviews.json', 'reviews.json.gz', 'reviews.csv.gz')]
+    assert len({summary.summary_path(path) for path in paths}) == len(paths)
+
+
+def test_sidecar_of_a_rewritten_output_is_ignored(tmp_path):
+    output_file = str(tmp_path / 'reviews.json')
+    jsonio.dump(RESULTS, output_file)
+    summary.summarize_results(RESULTS).write(output_file)
+    assert summary.load_summary(output_file)['total_reviews'] == 1
+
+    with open(output_file, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert summary.load_summary(output_file) is None
+
+
+def test_file_outputs_get_a_sidecar_and_sqlite_does_not(tmp_path):
+    import main
+    output_file = str(tmp_path / 'reviews.csv')
+    assert main.save_results(RESULTS, output_file, fmt='csv')
+    assert summary.load_summary(output_file)['sources']['G2']['rating_histogram'] == {'4': 1}
+
+    db_path = str(tmp_path / 'reviews.db')
+    results = {'company': 'Acme', 'sources': {'G2': {'reviews': [
+        {'date': '2023-01-02', 'rating': 4.0, 'title': 'Good', 'reviewer_name': 'Ann', 'source': 'G2'}]}}}
+    assert main.save_results_sqlite(results, db_path)
+    assert not (tmp_path / 'reviews.db.summary.json').exists()
@@ -0,0 +1,49 @@
+"""Tests for the streaming validation and statistics tools (test_utils.py)"""
+import json
+import os
+import subprocess
+import sys
+
+import jsonio
+import test_utils
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_results(path, counts):
+    results = {'company': 'Acme', 'start_date': '2023-01-01', 'end_date': '2023-12-31', 'sources': {
+        name: {'total_reviews': count, 'reviews': [
+            {'title': f'T{i}', 'description': 'D', 'date': '2023-02-01', 'rating': 4.0,
+             'reviewer_name': 'R', 'source': name, 'url': None} for i in range(count)]}
+        for name, count in counts.items()}}
+    jsonio.dump(results, str(path))
+    return str(path)
+
+
+def test_stream_count_matches_count_reviews(tmp_path):
+    path = write_results(tmp_path / 'a.json', {'G2': 3, 'Capterra': 2})
+    assert test_utils.stream_count(path) == test_utils.count_reviews(path)
+    assert test_utils.stream_validate(path) == []
+
+
+def run_cli(*args):
+    return subprocess.run([sys.executable, 'test_utils.py', *args], cwd=ROOT, capture_output=True, text=True)
+
+
+def test_count_stream_uses_workers(tmp_path):
+    files = [write_results(tmp_path / 'a.json', {'G2': 3}), write_results(tmp_path / 'b.json', {'G2': 5})]
+    result = run_cli('--count', *files, '--stream', '--workers', '2')
+    assert result.returncode == 0
+    decoder = json.JSONDecoder()
+    text, counts = result.stdout.strip(), []
+    while text:
+        value, end = decoder.raw_decode(text)
+        counts.append(value['total'])
+        text = text[end:].strip()
+    assert counts == [3, 5]
+
+
+def test_workers_without_stream_is_rejected(tmp_path):
+    result = run_cli('--count', write_results(tmp_path / 'a.json', {'G2': 1}), '--workers', '2')
+    assert result.returncode == 2
+    assert '--workers needs --stream' in result.stderr
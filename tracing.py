@@ -0,0 +1,113 @@
+"""
+Lightweight span tracing for the Review Scraper
+Records timed spans per thread and exports them in the Chrome trace event
+format, which chrome://tracing and https://ui.perfetto.dev can open
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class Tracer:
+    """Collects complete ("X") trace events from any number of threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._named_threads = set()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'scraper', **args):
+        """
+        Time the enclosed block as one span
+
+        Yields:
+            The span's args dictionary, which the block may add to (e.g. a status code)
+        """
+        tid = threading.get_ident()
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            end = self._now_us()
+            event = {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': start,
+                'dur': end - start,
+                'pid': self._pid,
+                'tid': tid,
+                'args': args,
+            }
+            with self._lock:
+                if tid not in self._named_threads:
+                    self._named_threads.add(tid)
+                    self._events.append({
+                        'name': 'thread_name',
+                        'ph': 'M',
+                        'pid': self._pid,
+                        'tid': tid,
+                        'args': {'name': threading.current_thread().name},
+                    })
+                self._events.append(event)
+
+    def events(self) -> list:
+        with self._lock:
+            return list(self._events)
+
+    def write(self, path: str) -> bool:
+        """Write the collected spans as a Chrome trace JSON file"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f, default=str)
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to write trace: {str(e)}")
+            return False
+
+
+class _NullSpan:
+    """Stand-in for Tracer.span when tracing is disabled"""
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_active: Optional[Tracer] = None
+
+
+def enable() -> Tracer:
+    """Start recording spans"""
+    global _active
+    _active = Tracer()
+    return _active
+
+
+def disable() -> Optional[Tracer]:
+    """Stop recording spans and return the tracer that was active"""
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def span(name: str, cat: str = 'scraper', **args):
+    """Context manager around one span; a no-op unless tracing is enabled"""
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(name, cat, **args)